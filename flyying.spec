@@ -8,7 +8,8 @@ a = Analysis(
     binaries=[],
     datas=[
         # 打包所有需要的数据文件
-        ('playwright-browsers', 'browser_data')  # 包含Playwright浏览器
+        ('playwright-browsers', 'browser_data'),  # 包含Playwright浏览器
+        ('src/resources/game_titles.json', 'resources')  # 离线游戏名词典
     ],
     hiddenimports=[
         'PyQt6',
@@ -18,7 +19,9 @@ a = Analysis(
         'requests',
         'bs4',
         'urllib3',
-        'playwright.sync_api'
+        'playwright.sync_api',
+        'playwright.async_api',
+        'rarfile'  # 可选，用于解压RAR格式的修改器
     ],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,8 @@
+# 本地修改器目录（爬虫 + SQLite全文索引）和关注列表
+from .store import TrainerCatalog, get_trainer_catalog
+from .crawler import CatalogCrawler
+from .sync import CatalogSync, CatalogSyncScheduler
+from .watchlist import WatchList, WatchScheduler, get_watch_list
+
+__all__ = ['TrainerCatalog', 'get_trainer_catalog', 'CatalogCrawler', 'CatalogSync', 'CatalogSyncScheduler',
+           'WatchList', 'WatchScheduler', 'get_watch_list']
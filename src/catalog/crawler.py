@@ -0,0 +1,64 @@
+import time
+
+from catalog.store import get_trainer_catalog
+from utils.config import Config
+
+META_LAST_CRAWL = "last_full_crawl"
+
+
+class CatalogCrawler:
+    """
+    遍历网站的文章列表页，把所有修改器文章写入本地目录
+
+    列表页按并发上限并行获取（与分页搜索共用 WebScraper.fetch_listing_pages），
+    每解析完一页立即写入数据库，中途取消时已经获取的页面不会丢失
+    """
+
+    def __init__(self, scraper=None, catalog=None):
+        if scraper is None:
+            # web_scraper 会查询本地目录，这里延迟导入避免循环导入
+            from network.web_scraper import WebScraper
+            scraper = WebScraper()
+        self.scraper = scraper
+        self.catalog = catalog or get_trainer_catalog()
+
+    def crawl(self, max_pages=None, concurrency=None, progress_callback=None, cancel_event=None):
+        """
+        完整爬取文章列表
+
+        Args:
+            max_pages: 最多爬取的列表页数，不指定时使用配置
+            concurrency: 同时获取的页面数，不指定时使用配置
+            progress_callback: 每写入一页调用 callback(已完成页数, 已收集文章数)
+
+        Returns:
+            统计信息：pages/found/inserted/updated/elapsed/cancelled
+        """
+        config = Config()
+        stats = {"pages": 0, "found": 0, "inserted": 0, "updated": 0}
+        started = time.time()
+
+        def on_page(page, results):
+            inserted, updated = self.catalog.upsert(results)
+            stats["pages"] += 1
+            stats["found"] += len(results)
+            stats["inserted"] += inserted
+            stats["updated"] += updated
+            if progress_callback:
+                progress_callback(stats["pages"], stats["found"])
+
+        # 列表页内容变化频繁，不使用磁盘缓存
+        self.scraper.fetch_listing_pages(
+            f"{self.scraper.base_url}/", on_page=on_page,
+            max_pages=max_pages or config.get_crawl_max_pages(),
+            concurrency=concurrency or config.get_crawl_concurrency(),
+            should_stop=lambda: bool(cancel_event and cancel_event.is_set()),
+            use_cache=False)
+
+        stats["elapsed"] = time.time() - started
+        stats["cancelled"] = bool(cancel_event and cancel_event.is_set())
+        if not stats["cancelled"]:
+            self.catalog.set_meta(META_LAST_CRAWL, time.time())
+        print(f"本地目录爬取完成: {stats['pages']} 页, {stats['found']} 篇文章, "
+              f"新增 {stats['inserted']}, 更新 {stats['updated']}, 耗时 {stats['elapsed']:.1f} 秒")
+        return stats
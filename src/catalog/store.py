@@ -0,0 +1,208 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from utils.config import get_data_dir
+from utils.dates import parse_date
+
+
+def parse_post_date(text):
+    """把列表页中的日期（如 “12 Mar 2024”）转换为 ISO 格式（2024-03-12），无法识别时返回 None"""
+    published = parse_date(text)
+    return published.date().isoformat() if published else None
+
+
+def build_match_query(text):
+    """把用户输入转换为 FTS5 查询：每个词按前缀匹配，所有词都必须出现"""
+    words = re.findall(r'\w+', text.lower())
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class TrainerCatalog:
+    """
+    本地修改器目录（SQLite + FTS5 全文索引）
+
+    保存爬虫从网站列表页收集的修改器文章（标题、链接、发布日期），
+    搜索时直接查询本地索引，不需要访问网站。SQLite 不支持 FTS5 时退化为 LIKE 查询
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS trainers (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL UNIQUE,
+                title TEXT NOT NULL,
+                date TEXT NOT NULL DEFAULT '',
+                published TEXT,
+                updated_at REAL NOT NULL
+            )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS trainers_published ON trainers (published)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS catalog_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )""")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sync_log (
+                id INTEGER PRIMARY KEY,
+                mode TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                elapsed REAL NOT NULL,
+                pages INTEGER NOT NULL,
+                found INTEGER NOT NULL,
+                inserted INTEGER NOT NULL,
+                updated INTEGER NOT NULL,
+                error TEXT
+            )""")
+        self.fts = self._create_fts()
+        self._conn.commit()
+
+    def _create_fts(self):
+        # 外部内容表：索引只保存分词结果，由触发器与 trainers 表保持同步
+        try:
+            self._conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS trainers_fts USING fts5(
+                    title, content='trainers', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+                )""")
+        except sqlite3.OperationalError as e:
+            print(f"SQLite 不支持 FTS5，本地目录使用普通查询: {e}")
+            return False
+        self._conn.executescript("""
+            CREATE TRIGGER IF NOT EXISTS trainers_ai AFTER INSERT ON trainers BEGIN
+                INSERT INTO trainers_fts (rowid, title) VALUES (new.id, new.title);
+            END;
+            CREATE TRIGGER IF NOT EXISTS trainers_ad AFTER DELETE ON trainers BEGIN
+                INSERT INTO trainers_fts (trainers_fts, rowid, title) VALUES ('delete', old.id, old.title);
+            END;
+            CREATE TRIGGER IF NOT EXISTS trainers_au AFTER UPDATE OF title ON trainers BEGIN
+                INSERT INTO trainers_fts (trainers_fts, rowid, title) VALUES ('delete', old.id, old.title);
+                INSERT INTO trainers_fts (rowid, title) VALUES (new.id, new.title);
+            END;
+        """)
+        return True
+
+    def upsert(self, results):
+        """
+        保存列表页解析出的文章（parse_search_results 的结果）
+
+        Returns:
+            (新增数, 标题或日期有变化的数量)
+        """
+        inserted = updated = 0
+        now = time.time()
+        with self._lock:
+            for result in results:
+                url = result.get("url")
+                title = (result.get("title") or "").strip()
+                if not url or not title:
+                    continue
+                date = (result.get("date") or "").strip()
+                published = parse_post_date(date)
+                row = self._conn.execute("SELECT title, date, published FROM trainers WHERE url = ?", (url,)).fetchone()
+                if row is None:
+                    self._conn.execute(
+                        "INSERT INTO trainers (url, title, date, published, updated_at) VALUES (?, ?, ?, ?, ?)",
+                        (url, title, date, published, now))
+                    inserted += 1
+                    continue
+                # 列表页和RSS中日期的写法可能不同，按解析后的日期比较
+                if not published:
+                    date, published = row[1], row[2]
+                if (title, published) != (row[0], row[2]):
+                    self._conn.execute(
+                        "UPDATE trainers SET title = ?, date = ?, published = ?, updated_at = ? WHERE url = ?",
+                        (title, date, published, now, url))
+                    updated += 1
+            self._conn.commit()
+        return inserted, updated
+
+    def search(self, text, limit=100):
+        """在本地目录中搜索，按相关度（FTS5 的 bm25）排序，返回与 parse_search_results 相同格式的结果"""
+        query = build_match_query(text)
+        if not query:
+            return []
+        with self._lock:
+            if self.fts:
+                rows = self._conn.execute(
+                    "SELECT t.title, t.url, t.date FROM trainers_fts f JOIN trainers t ON t.id = f.rowid "
+                    "WHERE trainers_fts MATCH ? ORDER BY bm25(trainers_fts), t.published DESC LIMIT ?",
+                    (query, limit)).fetchall()
+            else:
+                words = re.findall(r'\w+', text.lower())
+                rows = self._conn.execute(
+                    "SELECT title, url, date FROM trainers WHERE "
+                    + " AND ".join("lower(title) LIKE ?" for _ in words)
+                    + " ORDER BY published DESC LIMIT ?",
+                    [f"%{word}%" for word in words] + [limit]).fetchall()
+        return [{"title": title, "url": url, "date": date} for title, url, date in rows]
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM trainers").fetchone()[0]
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM catalog_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO catalog_meta (key, value) VALUES (?, ?)", (key, str(value)))
+            self._conn.commit()
+
+    def contains(self, url):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM trainers WHERE url = ?", (url,)).fetchone() is not None
+
+    def newest(self):
+        """发布日期最新的文章 (published, url)，目录为空时返回 None"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT published, url FROM trainers WHERE published IS NOT NULL "
+                "ORDER BY published DESC, id DESC LIMIT 1").fetchone()
+
+    def log_sync(self, stats):
+        """记录一次同步（mode/started_at/elapsed/pages/found/inserted/updated/error）"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sync_log (mode, started_at, elapsed, pages, found, inserted, updated, error) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (stats["mode"], stats["started_at"], stats["elapsed"], stats["pages"], stats["found"],
+                 stats["inserted"], stats["updated"], stats.get("error")))
+            # 只保留最近的记录
+            self._conn.execute("DELETE FROM sync_log WHERE id NOT IN (SELECT id FROM sync_log ORDER BY id DESC LIMIT 200)")
+            self._conn.commit()
+
+    def sync_history(self, limit=20):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT mode, started_at, elapsed, pages, found, inserted, updated, error FROM sync_log "
+                "ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        keys = ("mode", "started_at", "elapsed", "pages", "found", "inserted", "updated", "error")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def rebuild_index(self):
+        """重建全文索引（索引与数据表不一致时使用）"""
+        if not self.fts:
+            return
+        with self._lock:
+            self._conn.execute("INSERT INTO trainers_fts (trainers_fts) VALUES ('rebuild')")
+            self._conn.commit()
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_trainer_catalog():
+    """获取进程级共享的本地修改器目录，数据库保存在用户数据目录中"""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = TrainerCatalog(os.path.join(get_data_dir(), 'catalog.db'))
+        return _catalog
@@ -0,0 +1,246 @@
+import json
+import threading
+import time
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+
+from catalog.store import get_trainer_catalog, parse_post_date
+from utils.config import Config
+
+META_WATERMARK = "sync_watermark"
+# 上次同步中途停止时记录的补齐点，水位线在补齐之前不会前移
+META_RESUME = "sync_resume"
+
+MODE_FEED = "feed"        # 通过RSS获取新文章
+MODE_LISTING = "listing"  # RSS不可用或没有覆盖到上次同步的位置时，逐页读取最新的列表页
+
+# 手动同步和定时同步不同时进行
+_sync_lock = threading.Lock()
+
+
+def parse_feed(xml_text):
+    """
+    解析 WordPress 的RSS（/feed/），返回与 parse_search_results 相同格式的结果（从新到旧）
+    """
+    root = ET.fromstring(xml_text.encode('utf-8') if isinstance(xml_text, str) else xml_text)
+    results = []
+    for item in root.iter('item'):
+        title = (item.findtext('title') or '').strip()
+        url = (item.findtext('link') or '').strip()
+        if not title or not url:
+            continue
+        date = ""
+        pub_date = item.findtext('pubDate')
+        if pub_date:
+            try:
+                published = parsedate_to_datetime(pub_date)
+                date = f"{published.day} {published:%b} {published.year}"
+            except (TypeError, ValueError):
+                pass
+        results.append({"title": title, "url": url, "date": date})
+    return results
+
+
+class CatalogSync:
+    """
+    增量同步本地目录
+
+    记录上次同步时最新文章的日期和链接作为水位线，同步时先读取RSS，
+    RSS 不可用或没有覆盖到水位线（期间新文章太多）时逐页读取最新的列表页，
+    遇到水位线就停止，只写入新增或有变化的文章。每次同步的耗时和结果记录在同步日志中
+    """
+
+    def __init__(self, scraper=None, catalog=None):
+        if scraper is None:
+            # web_scraper 会查询本地目录，这里延迟导入避免循环导入
+            from network.web_scraper import WebScraper
+            scraper = WebScraper()
+        self.scraper = scraper
+        self.catalog = catalog or get_trainer_catalog()
+
+    def sync(self, max_pages=None, cancel_event=None):
+        """
+        执行一次增量同步；已经有同步在进行时直接返回 None
+
+        Returns:
+            统计信息：mode/started_at/elapsed/pages/found/inserted/updated/error
+        """
+        if not _sync_lock.acquire(blocking=False):
+            return None
+        try:
+            return self._sync(max_pages or Config().get_sync_max_pages(), cancel_event)
+        finally:
+            _sync_lock.release()
+
+    def _sync(self, max_pages, cancel_event):
+        stats = {"mode": MODE_FEED, "started_at": time.time(), "pages": 0, "found": 0,
+                 "inserted": 0, "updated": 0, "error": None}
+        watermark = self.load_watermark()
+        resume = self.load_resume() if watermark else None
+        started = time.perf_counter()
+        collected = []
+        seen = set()
+        budget = {"pages": max_pages}
+
+        def walk(first_page, mark):
+            """从 first_page 开始逐页读取列表页直到遇到 mark，返回 (是否遇到, 下一页的页码)"""
+            page = first_page
+            while budget["pages"] > 0:
+                if cancel_event and cancel_event.is_set():
+                    break
+                html = self.scraper.get_listing_page(page)
+                budget["pages"] -= 1
+                stats["pages"] += 1
+                page_results = self.scraper.parser.parse_search_results(html)
+                if not page_results:
+                    break
+                page += 1
+                taken, reached = self._take_until(page_results, mark)
+                collected.extend(r for r in taken if r["url"] not in seen)
+                seen.update(r["url"] for r in taken)
+                if reached:
+                    return True, page
+            return False, page
+
+        try:
+            # 第一步：取回上次同步到的位置之后的新文章（上次没有补完时先同步到补齐点的上端）
+            top_mark = resume["top"] if resume else watermark
+            reached = False
+            try:
+                feed = parse_feed(self.scraper.get_feed())
+                stats["pages"] = 1
+                collected, reached = self._take_until(feed, top_mark)
+                seen.update(r["url"] for r in collected)
+            except Exception as e:
+                print(f"读取RSS失败，改为读取列表页: {e}")
+            next_page = 1
+            if not reached:
+                # RSS 只包含最近的若干篇文章，没有覆盖到时从列表页补齐
+                stats["mode"] = MODE_LISTING
+                reached, next_page = walk(1, top_mark)
+
+            if resume and reached:
+                # 第二步：继续补齐上次中断的部分。新文章只会把旧文章往后推，从记录的页码继续不会漏掉文章
+                stats["mode"] = MODE_LISTING
+                newest = self._newest(collected) or resume["top"]
+                reached, next_page = walk(resume["page"], watermark)
+                resume = None
+            else:
+                newest = self._newest(collected)
+
+            stats["found"] = len(collected)
+            stats["inserted"], stats["updated"] = self.catalog.upsert(collected)
+            self._save_progress(watermark, resume, reached, newest, next_page)
+        except Exception as e:
+            stats["error"] = str(e)
+            print(f"同步本地目录失败: {e}")
+        stats["elapsed"] = time.perf_counter() - started
+        self.catalog.log_sync(stats)
+        print(f"本地目录同步({stats['mode']}): {stats['pages']} 页, 新文章 {stats['found']}, "
+              f"新增 {stats['inserted']}, 更新 {stats['updated']}, 耗时 {stats['elapsed']:.1f} 秒")
+        return stats
+
+    def _save_progress(self, watermark, resume, reached, newest, next_page):
+        """
+        遇到水位线（或目录原本为空）时才推进水位线；
+        中途停止（取消、页数用完、列表页为空）时水位线保持不变，另外记录补齐点，下次从那里继续
+        """
+        if resume is not None:
+            # 连补齐点上端之后的新文章都没有取完，补齐点保持不变，下次重新从第一页开始
+            return
+        if reached or not watermark:
+            if newest and not (watermark and watermark["published"] > newest["published"]):
+                self.catalog.set_meta(META_WATERMARK, json.dumps(newest))
+            self.catalog.set_meta(META_RESUME, "")
+        elif newest:
+            # 水位线可能是从目录中最新的文章推断的，先固定下来：刚写入的文章会改变目录中最新的文章
+            self.catalog.set_meta(META_WATERMARK, json.dumps(watermark))
+            self.catalog.set_meta(META_RESUME, json.dumps({"top": newest, "page": next_page}))
+
+    def _take_until(self, results, watermark):
+        """
+        按从新到旧的顺序取出水位线之前的文章
+
+        Returns:
+            (水位线之前的文章, 是否遇到了水位线)
+        """
+        if not watermark:
+            return list(results), False
+        taken = []
+        for result in results:
+            published = parse_post_date(result["date"])
+            if result["url"] == watermark["url"] or (published and published < watermark["published"]):
+                return taken, True
+            taken.append(result)
+        return taken, False
+
+    def load_watermark(self):
+        """上次同步到的位置 {"published": ISO日期, "url": 链接}，没有同步过时使用目录中最新的文章"""
+        value = self.catalog.get_meta(META_WATERMARK)
+        if value:
+            try:
+                return json.loads(value)
+            except ValueError:
+                pass
+        newest = self.catalog.newest()
+        return {"published": newest[0], "url": newest[1]} if newest else None
+
+    def load_resume(self):
+        """上次没有同步完的位置 {"top": 已同步的最新文章, "page": 继续读取的列表页}，没有时返回 None"""
+        value = self.catalog.get_meta(META_RESUME)
+        if value:
+            try:
+                return json.loads(value)
+            except ValueError:
+                pass
+        return None
+
+    def _newest(self, collected):
+        candidates = [(parse_post_date(r["date"]), r["url"]) for r in collected]
+        candidates = [c for c in candidates if c[0]]
+        if not candidates:
+            return None
+        # 同一天的文章按页面中的顺序（越靠前越新）
+        newest = max(candidates, key=lambda c: c[0])
+        return {"published": newest[0], "url": newest[1]}
+
+
+class CatalogSyncScheduler:
+    """
+    在后台线程中定期执行增量同步，不阻塞GUI
+
+    on_synced(stats) 在后台线程中调用，GUI需要通过信号转到主线程
+    """
+
+    def __init__(self, interval_minutes, on_synced=None, initial_delay=60, sync=None):
+        self.interval = interval_minutes * 60
+        self.on_synced = on_synced
+        self.initial_delay = initial_delay
+        self.sync = sync
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="catalog-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        # 启动后稍等片刻再同步，避免和启动时的搜索等请求争用网络
+        delay = self.initial_delay
+        while not self._stop.wait(delay):
+            delay = self.interval
+            try:
+                if self.sync is None:
+                    self.sync = CatalogSync()
+                stats = self.sync.sync(cancel_event=self._stop)
+            except Exception as e:
+                print(f"定时同步本地目录失败: {e}")
+                continue
+            if stats and self.on_synced:
+                self.on_synced(stats)
@@ -0,0 +1,269 @@
+import json
+import os
+import sqlite3
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.config import Config, get_data_dir
+from utils.dates import parse_date
+
+DAY = 24 * 3600
+
+
+def version_key(version):
+    """用日期和文件名标识一个版本"""
+    return f"{version.get('date', '')}|{version.get('filename', '')}"
+
+
+def diff_versions(old_versions, new_versions):
+    """返回新版本列表中之前没有出现过的版本（按日期和文件名比较）"""
+    known = {version_key(version) for version in old_versions or []}
+    return [version for version in new_versions if version_key(version) not in known]
+
+
+def adaptive_interval(versions, changed, min_interval, max_interval, default_interval, now=None):
+    """
+    根据游戏实际的更新频率计算下次检查的间隔（秒）
+
+    用页面中各版本日期的中位间隔估计更新周期，每个周期检查约4次；
+    最新版本距今已远超更新周期（游戏不再更新）时按比例放慢，刚发现新版本时加快
+    """
+    now = now or time.time()
+    dates = sorted({d.timestamp() for d in (parse_date(v.get('date')) for v in versions or []) if d})
+    if len(dates) >= 2:
+        period = max(DAY, statistics.median(b - a for a, b in zip(dates, dates[1:])))
+        interval = period / 4
+        idle = now - dates[-1]
+        if idle > 2 * period:
+            interval *= min(8, idle / period)
+    else:
+        interval = default_interval
+    if changed:
+        interval /= 2
+    return max(min_interval, min(max_interval, interval))
+
+
+class WatchList:
+    """
+    关注的修改器页面（SQLite）
+
+    每个页面记录上次检查到的版本列表、检查间隔和下次检查时间，
+    以及发现新版本时是否自动下载和使用的版本选择规则
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS watches (
+                url TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                versions TEXT NOT NULL DEFAULT '[]',
+                auto_download INTEGER NOT NULL DEFAULT 0,
+                rule TEXT NOT NULL,
+                interval REAL NOT NULL,
+                next_check REAL NOT NULL,
+                last_checked REAL,
+                last_change REAL,
+                checks INTEGER NOT NULL DEFAULT 0,
+                changes INTEGER NOT NULL DEFAULT 0,
+                added_at REAL NOT NULL
+            )""")
+        self._conn.commit()
+
+    def add(self, url, rule, title=None, versions=None, auto_download=False):
+        """
+        关注一个修改器页面
+
+        Args:
+            rule: 自动下载时的版本选择规则（见 network.batch_resolver 中的 RULE_*）
+            versions: 当前已知的版本（不会被当作新版本），为 None 时尽快检查一次作为基准
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO watches (url, title, versions, auto_download, rule, interval, next_check, added_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(url) DO UPDATE SET "
+                "title = excluded.title, auto_download = excluded.auto_download, rule = excluded.rule",
+                (url, title or url, json.dumps(versions or [], ensure_ascii=False), int(auto_download), rule,
+                 Config().get_watch_default_interval(), now if versions is None else now + 60, now))
+            self._conn.commit()
+
+    def remove(self, url):
+        with self._lock:
+            self._conn.execute("DELETE FROM watches WHERE url = ?", (url,))
+            self._conn.commit()
+
+    def contains(self, url):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM watches WHERE url = ?", (url,)).fetchone() is not None
+
+    def set_auto_download(self, url, enabled, rule=None):
+        with self._lock:
+            self._conn.execute("UPDATE watches SET auto_download = ?, rule = COALESCE(?, rule) WHERE url = ?",
+                               (int(enabled), rule, url))
+            self._conn.commit()
+
+    def entries(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, title, versions, auto_download, rule, interval, next_check, last_checked, "
+                "last_change, checks, changes FROM watches ORDER BY title").fetchall()
+        return [self._row(row) for row in rows]
+
+    def due(self, now=None):
+        """到了检查时间的页面"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, title, versions, auto_download, rule, interval, next_check, last_checked, "
+                "last_change, checks, changes FROM watches WHERE next_check <= ? ORDER BY next_check",
+                (now or time.time(),)).fetchall()
+        return [self._row(row) for row in rows]
+
+    def next_due(self):
+        """最早的下次检查时间，没有关注的页面时返回 None"""
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(next_check) FROM watches").fetchone()
+        return row[0] if row else None
+
+    def mark_all_due(self):
+        with self._lock:
+            self._conn.execute("UPDATE watches SET next_check = ?", (time.time(),))
+            self._conn.commit()
+
+    def record_check(self, url, versions, changed, interval):
+        now = time.time()
+        with self._lock:
+            if versions is None:
+                # 页面未变化（304），只更新检查时间
+                self._conn.execute(
+                    "UPDATE watches SET interval = ?, next_check = ?, last_checked = ?, checks = checks + 1 "
+                    "WHERE url = ?", (interval, now + interval, now, url))
+            else:
+                self._conn.execute(
+                    "UPDATE watches SET versions = ?, interval = ?, next_check = ?, last_checked = ?, "
+                    "checks = checks + 1, changes = changes + ?, last_change = CASE WHEN ? THEN ? ELSE last_change END "
+                    "WHERE url = ?",
+                    (json.dumps(versions, ensure_ascii=False), interval, now + interval, now,
+                     int(changed), int(changed), now, url))
+            self._conn.commit()
+
+    def _row(self, row):
+        keys = ("url", "title", "versions", "auto_download", "rule", "interval", "next_check",
+                "last_checked", "last_change", "checks", "changes")
+        entry = dict(zip(keys, row))
+        entry["versions"] = json.loads(entry["versions"])
+        entry["auto_download"] = bool(entry["auto_download"])
+        return entry
+
+
+class WatchScheduler:
+    """
+    在后台线程中按各页面自己的间隔检查关注的修改器
+
+    检查时先发送条件请求，页面有变化才重新解析版本并与上次的版本比较。
+    发现新版本时调用 on_new_versions(关注条目, 新版本列表, 完整版本列表)（在后台线程中调用，GUI需要通过信号转到主线程）
+    """
+
+    def __init__(self, watchlist=None, scraper=None, on_new_versions=None, max_workers=2, tick=60):
+        self.watchlist = watchlist or get_watch_list()
+        self._scraper = scraper
+        self.on_new_versions = on_new_versions
+        self.max_workers = max_workers
+        self.tick = tick
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def scraper(self):
+        if self._scraper is None:
+            from network.web_scraper import WebScraper
+            self._scraper = WebScraper()
+        return self._scraper
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="watch-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def check_now(self):
+        """立即检查所有关注的页面（例如用户手动点击“检查更新”）"""
+        self.watchlist.mark_all_due()
+        self._wake.set()
+
+    def _loop(self):
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="watch")
+        try:
+            while not self._stop.is_set():
+                due = self.watchlist.due()
+                if due:
+                    for future in [executor.submit(self.check, entry) for entry in due]:
+                        try:
+                            future.result()
+                        except Exception as e:
+                            print(f"检查关注的修改器失败: {e}")
+                    continue
+                next_due = self.watchlist.next_due()
+                wait = self.tick if next_due is None else max(1, min(self.tick, next_due - time.time()))
+                self._wake.wait(wait)
+                self._wake.clear()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def check(self, entry):
+        """
+        检查一个关注的页面
+
+        Returns:
+            新版本列表（没有新版本时为空）
+        """
+        config = Config()
+        limits = (config.get_watch_min_interval(), config.get_watch_max_interval(),
+                  config.get_watch_default_interval())
+        try:
+            html = self.scraper.poll_trainer_page(entry["url"])
+        except Exception as e:
+            # 请求失败时按当前间隔稍后重试
+            print(f"检查 {entry['title']} 失败: {e}")
+            self.watchlist.record_check(entry["url"], None, False, entry["interval"])
+            return []
+        if html is None:
+            interval = adaptive_interval(entry["versions"], False, *limits)
+            self.watchlist.record_check(entry["url"], None, False, interval)
+            return []
+
+        versions = self.scraper.parser.parse_trainer_versions(html)
+        if not versions:
+            # 页面结构异常时不覆盖已知的版本，避免下次把所有版本都当作新版本
+            self.watchlist.record_check(entry["url"], None, False, entry["interval"])
+            return []
+        new_versions = diff_versions(entry["versions"], versions) if entry["versions"] else []
+        interval = adaptive_interval(versions, bool(new_versions), *limits)
+        self.watchlist.record_check(entry["url"], versions, bool(new_versions), interval)
+        print(f"检查 {entry['title']}: {len(new_versions)} 个新版本，下次检查在 {interval / 3600:.1f} 小时后")
+        if new_versions and self.on_new_versions:
+            self.on_new_versions(entry, new_versions, versions)
+        return new_versions
+
+
+_watch_list = None
+_watch_list_lock = threading.Lock()
+
+
+def get_watch_list():
+    """获取进程级共享的关注列表，数据库保存在用户数据目录中"""
+    global _watch_list
+    with _watch_list_lock:
+        if _watch_list is None:
+            _watch_list = WatchList(os.path.join(get_data_dir(), 'watchlist.db'))
+        return _watch_list
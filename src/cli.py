@@ -0,0 +1,234 @@
+"""
+FLYYING 命令行工具（不需要图形界面，不导入 PyQt6）
+
+    python src/cli.py search "Elden Ring" "Resident Evil"
+    python src/cli.py versions "https://flingtrainer.com/trainer/elden-ring-trainer/"
+    python src/cli.py download "Elden Ring" 艾尔登法环 -o D:/Trainers --rule latest_standalone -j 4
+    python src/cli.py sync
+    python src/cli.py serve --host 0.0.0.0 --port 8780
+
+结果以JSON输出到标准输出，运行日志输出到标准错误（--quiet 时不输出）。
+网络相关的模块在执行命令时才导入，Playwright 只在需要在线翻译或渲染页面时才启动
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+# 直接运行本文件时，将src目录添加到Python路径
+_src_dir = os.path.dirname(os.path.abspath(__file__))
+if _src_dir not in sys.path:
+    sys.path.insert(0, _src_dir)
+
+
+class _ProgressPrinter:
+    """代替GUI的进度信号：download_file 调用 emit(进度, 速度)，每10%输出一行"""
+
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+        self._last = -10
+
+    def emit(self, progress, speed):
+        if progress < 0 or progress >= self._last + 10 or progress == 100:
+            if progress >= 0:
+                self._last = progress
+            self.log(f"[{self.name}] {progress if progress >= 0 else '?'}% {speed}")
+
+
+def _make_scraper(args):
+    from network.web_scraper import WebScraper
+    return WebScraper(base_url=args.base_url, max_workers=args.jobs)
+
+
+def cmd_search(args, log):
+    from concurrent.futures import ThreadPoolExecutor
+    from network.batch_resolver import english_search_name
+
+    scraper = _make_scraper(args)
+
+    def search(name):
+        started = time.perf_counter()
+        search_name = english_search_name(name, scraper)
+        if not search_name:
+            return {"query": name, "search_name": None, "results": [], "error": "无法翻译游戏名"}
+        results = scraper.search_game_pages(search_name, max_pages=args.max_pages,
+                                            use_catalog=False if args.live else None)
+        log(f"\"{name}\": {len(results)} 个结果 ({(time.perf_counter() - started) * 1000:.0f} 毫秒)")
+        return {"query": name, "search_name": search_name, "results": results, "error": None}
+
+    with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        return list(executor.map(search, args.names))
+
+
+def _resolve(args, scraper, rule, log):
+    from network.batch_resolver import BatchResolver, parse_batch_rows
+    from network.prefetcher import TrainerPrefetcher
+
+    entries = parse_batch_rows([[query] for query in args.queries])
+    resolver = BatchResolver(scraper=scraper, max_workers=args.jobs, prefetcher=TrainerPrefetcher(scraper=scraper))
+    return resolver.resolve(
+        entries, default_rule=rule,
+        progress_callback=lambda done, total, result: log(
+            f"解析 ({done}/{total}) {result['query']}: {result['error'] or result['title']}"))
+
+
+def cmd_versions(args, log):
+    return _resolve(args, _make_scraper(args), args.rule, log)
+
+
+def cmd_download(args, log):
+    from concurrent.futures import ThreadPoolExecutor
+    from network.batch_resolver import version_filename
+    from network.manifest import HashManifest
+
+    os.makedirs(args.output, exist_ok=True)
+    scraper = _make_scraper(args)
+    resolved = _resolve(args, scraper, args.rule, log)
+    cancel_event = threading.Event()
+    tasks = []
+    for entry in resolved:
+        for version in entry["versions"] or []:
+            tasks.append((entry, version, os.path.join(args.output, version_filename(version))))
+
+    def download(task):
+        entry, version, path = task
+        result = {"query": entry["query"], "title": entry["title"], "filename": os.path.basename(path),
+                  "path": path, "url": version["download_url"], "status": None, "sha256": None, "error": None}
+        if os.path.exists(path) and not args.force:
+            result["status"] = "exists"
+        else:
+            try:
+                ok = scraper.download_file(version["download_url"], path, _ProgressPrinter(result["filename"], log),
+                                           cancel_event=cancel_event,
+                                           rate_limit=args.limit * 1024 if args.limit else None)
+                result["status"] = "downloaded" if ok else "cancelled"
+            except Exception as e:
+                result["status"] = "failed"
+                result["error"] = str(e)
+        entry_info = HashManifest(args.output).get(path)
+        if entry_info:
+            result["sha256"] = entry_info.get("sha256")
+        return result
+
+    executor = ThreadPoolExecutor(max_workers=args.jobs)
+    try:
+        results = list(executor.map(download, tasks))
+    except KeyboardInterrupt:
+        # 保留 .part 文件，下次运行时续传
+        cancel_event.set()
+        raise
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    errors = [entry for entry in resolved if entry["error"]]
+    return {"downloads": results,
+            "unresolved": [{"query": entry["query"], "error": entry["error"]} for entry in errors]}
+
+
+def cmd_sync(args, log):
+    from catalog import CatalogCrawler, CatalogSync, get_trainer_catalog
+
+    scraper = _make_scraper(args)
+    if args.full or get_trainer_catalog().count() == 0:
+        stats = CatalogCrawler(scraper=scraper).crawl(
+            max_pages=args.max_pages, concurrency=args.jobs,
+            progress_callback=lambda pages, found: log(f"已获取 {pages} 页, {found} 篇文章"))
+        stats["mode"] = "full"
+    else:
+        stats = CatalogSync(scraper=scraper).sync(max_pages=args.max_pages)
+        if stats is None:
+            raise Exception("本地目录正在同步中")
+    stats["total"] = get_trainer_catalog().count()
+    return stats
+
+
+def cmd_serve(args, log):
+    from service import FlyyingService
+
+    service = FlyyingService(host=args.host, port=args.port, store_dir=args.store, workers=args.jobs,
+                             base_url=args.base_url)
+    service.run()
+    return service.stats
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="flyying", description="FLYYING 命令行工具：搜索、解析和下载风灵月影修改器")
+    parser.add_argument("--base-url", help="修改器网站地址（默认使用配置或环境变量 FLYYING_BASE_URL）")
+    parser.add_argument("-j", "--jobs", type=int, default=4, help="并行执行的任务数")
+    parser.add_argument("-q", "--quiet", action="store_true", help="不输出运行日志")
+    parser.add_argument("--indent", type=int, default=2, help="JSON缩进，0 表示单行输出")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="搜索游戏（本地目录优先）")
+    search.add_argument("names", nargs="+", help="游戏名（英文或中文）")
+    search.add_argument("--max-pages", type=int, default=None, help="在线搜索最多获取的结果页数")
+    search.add_argument("--live", action="store_true", help="跳过本地目录，直接在线搜索")
+    search.set_defaults(handler=cmd_search)
+
+    rules = ["latest_standalone", "auto_update", "latest", "all"]
+    versions = commands.add_parser("versions", help="列出修改器页面中的版本")
+    versions.add_argument("queries", nargs="+", help="游戏名或修改器页面URL")
+    versions.add_argument("--rule", choices=rules, default="all", help="版本选择规则")
+    versions.set_defaults(handler=cmd_versions)
+
+    download = commands.add_parser("download", help="解析并下载修改器")
+    download.add_argument("queries", nargs="+", help="游戏名或修改器页面URL")
+    download.add_argument("-o", "--output", default=".", help="保存目录")
+    download.add_argument("--rule", choices=rules, default="latest_standalone", help="版本选择规则")
+    download.add_argument("--limit", type=int, default=0, help="每个下载的限速（KB/s），0 表示使用配置")
+    download.add_argument("--force", action="store_true", help="文件已存在时重新下载")
+    download.set_defaults(handler=cmd_download)
+
+    sync = commands.add_parser("sync", help="同步本地修改器目录")
+    sync.add_argument("--full", action="store_true", help="完整爬取（目录为空时自动完整爬取）")
+    sync.add_argument("--max-pages", type=int, default=None, help="最多读取的列表页数")
+    sync.set_defaults(handler=cmd_sync)
+
+    serve = commands.add_parser("serve", help="以服务模式运行，为局域网中的其他机器提供HTTP/JSON接口和共享文件库")
+    serve.add_argument("--host", default="127.0.0.1", help="监听地址，局域网共享时使用 0.0.0.0")
+    serve.add_argument("--port", type=int, default=8780)
+    serve.add_argument("--store", default=None, help="共享文件库目录（默认在用户数据目录中）")
+    serve.set_defaults(handler=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    out = sys.stdout
+    # 各模块用 print 输出日志，执行命令期间转到标准错误，标准输出只保留JSON结果
+    log_stream = open(os.devnull, 'w') if args.quiet else sys.stderr
+
+    def log(message):
+        print(message, file=log_stream, flush=True)
+
+    if "PLAYWRIGHT_BROWSERS_PATH" not in os.environ:
+        browsers = os.path.join(os.path.dirname(_src_dir), "playwright-browsers")
+        if os.path.isdir(browsers):
+            os.environ["PLAYWRIGHT_BROWSERS_PATH"] = browsers
+
+    exit_code = 0
+    try:
+        with contextlib.redirect_stdout(log_stream):
+            result = args.handler(args, log)
+    except KeyboardInterrupt:
+        result = {"error": "已取消"}
+        exit_code = 130
+    except Exception as e:
+        result = {"error": str(e)}
+        exit_code = 1
+    finally:
+        # 只有用到浏览器时才会导入 playwright
+        browser_pool = sys.modules.get("network.browser_pool")
+        if browser_pool:
+            with contextlib.redirect_stdout(log_stream):
+                browser_pool.get_browser_pool().shutdown()
+    json.dump(result, out, ensure_ascii=False, indent=args.indent or None, default=str)
+    out.write("\n")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
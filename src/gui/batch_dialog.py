@@ -0,0 +1,212 @@
+import os
+import threading
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPlainTextEdit, QPushButton,
+                             QComboBox, QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView,
+                             QFileDialog, QMessageBox)
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from network.batch_resolver import (BatchResolver, RULE_NAMES, RULE_LATEST_STANDALONE,
+                                    read_batch_file, parse_batch_text, version_filename)
+
+
+class BatchResolveThread(QThread):
+    """在后台并行解析批量列表中的所有条目"""
+    progress_signal = pyqtSignal(int, int, dict)   # 已完成数, 总数, 该条目的结果
+    finished_signal = pyqtSignal(list)
+
+    def __init__(self, entries, default_rule):
+        super().__init__()
+        self.entries = entries
+        self.default_rule = default_rule
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def run(self):
+        resolver = BatchResolver()
+        results = resolver.resolve(self.entries, self.default_rule,
+                                   progress_callback=lambda done, total, result: self.progress_signal.emit(done, total, result),
+                                   cancel_event=self._cancel_event)
+        self.finished_signal.emit(results)
+
+
+class BatchDownloadDialog(QDialog):
+    """
+    批量下载：输入或导入游戏名/修改器页面URL列表，按版本选择规则解析出要下载的版本，
+    然后一次性加入下载队列并行下载
+    """
+    batch_queued = pyqtSignal(list)   # 加入下载队列的项目ID
+
+    COLUMNS = ["条目", "修改器", "结果"]
+
+    def __init__(self, download_manager, download_dir, initial_entries=None, parent=None):
+        super().__init__(parent)
+        self.download_manager = download_manager
+        self.download_dir = download_dir
+        self.resolve_thread = None
+        self._imported_rules = {}
+        self._row_of = {}
+
+        self.setWindowTitle("批量下载")
+        self.setMinimumSize(700, 500)
+        layout = QVBoxLayout(self)
+
+        layout.addWidget(QLabel("每行一个游戏名（中英文均可）或修改器页面URL，也可以从文本/CSV文件导入："))
+        self.entries_edit = QPlainTextEdit()
+        self.entries_edit.setPlaceholderText("Elden Ring\n艾尔登法环\nhttps://flingtrainer.com/trainer/...")
+        if initial_entries:
+            self.entries_edit.setPlainText("\n".join(initial_entries))
+        layout.addWidget(self.entries_edit)
+
+        options_layout = QHBoxLayout()
+        import_btn = QPushButton("从文件导入...")
+        import_btn.clicked.connect(self.import_file)
+        options_layout.addWidget(import_btn)
+        options_layout.addStretch()
+        options_layout.addWidget(QLabel("版本选择:"))
+        self.rule_combo = QComboBox()
+        for rule, name in RULE_NAMES.items():
+            self.rule_combo.addItem(name, rule)
+        self.rule_combo.setCurrentIndex(self.rule_combo.findData(RULE_LATEST_STANDALONE))
+        options_layout.addWidget(self.rule_combo)
+        layout.addLayout(options_layout)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+
+        self.results_table = QTableWidget(0, len(self.COLUMNS))
+        self.results_table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.results_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.results_table.verticalHeader().setVisible(False)
+        layout.addWidget(self.results_table)
+
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch()
+        self.start_btn = QPushButton("解析并下载")
+        self.start_btn.clicked.connect(self.start)
+        buttons_layout.addWidget(self.start_btn)
+        self.cancel_btn = QPushButton("取消解析")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel)
+        buttons_layout.addWidget(self.cancel_btn)
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.close)
+        buttons_layout.addWidget(close_btn)
+        layout.addLayout(buttons_layout)
+
+    def import_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "导入批量下载列表", "", "列表文件 (*.txt *.csv);;所有文件 (*)")
+        if not path:
+            return
+        try:
+            entries = read_batch_file(path)
+        except (OSError, UnicodeDecodeError) as e:
+            QMessageBox.critical(self, "错误", f"读取列表文件失败: {str(e)}")
+            return
+        for entry in entries:
+            if entry["rule"]:
+                self._imported_rules[entry["query"]] = entry["rule"]
+        existing = self.entries_edit.toPlainText().strip()
+        lines = [entry["query"] for entry in entries]
+        self.entries_edit.setPlainText("\n".join(([existing] if existing else []) + lines))
+
+    def start(self):
+        entries = []
+        for entry in parse_batch_text(self.entries_edit.toPlainText()):
+            if entry["query"] not in (e["query"] for e in entries):
+                entries.append(entry)
+        if not entries:
+            QMessageBox.warning(self, "警告", "请输入至少一个游戏名或修改器页面URL")
+            return
+        for entry in entries:
+            entry["rule"] = self._imported_rules.get(entry["query"])
+
+        self.results_table.setRowCount(0)
+        for row, entry in enumerate(entries):
+            self.results_table.insertRow(row)
+            self.results_table.setItem(row, 0, QTableWidgetItem(entry["query"]))
+            self.results_table.setItem(row, 1, QTableWidgetItem(""))
+            self.results_table.setItem(row, 2, QTableWidgetItem("等待解析"))
+        self._row_of = {entry["query"]: row for row, entry in enumerate(entries)}
+
+        self.progress_bar.setRange(0, len(entries))
+        self.progress_bar.setValue(0)
+        self.summary_label.setText(f"正在解析 {len(entries)} 个条目...")
+        self.start_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+
+        self.resolve_thread = BatchResolveThread(entries, self.rule_combo.currentData())
+        self.resolve_thread.progress_signal.connect(self.on_entry_resolved)
+        self.resolve_thread.finished_signal.connect(self.on_resolve_finished)
+        self.resolve_thread.start()
+
+    def cancel(self):
+        if self.resolve_thread and self.resolve_thread.isRunning():
+            self.resolve_thread.cancel()
+            self.summary_label.setText("正在取消...")
+
+    def on_entry_resolved(self, done, total, result):
+        self.progress_bar.setValue(done)
+        row = self._row_of.get(result["query"])
+        if row is None:
+            return
+        self.results_table.item(row, 1).setText(result["title"] if result["page_url"] else "")
+        if result["error"]:
+            self.results_table.item(row, 2).setText(f"失败: {result['error']}")
+        else:
+            self.results_table.item(row, 2).setText(", ".join(v["filename"] for v in result["versions"]))
+
+    def on_resolve_finished(self, results):
+        self.start_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        # 用户已取消时只显示解析到的结果，不加入下载队列
+        if self.resolve_thread is None or self.resolve_thread.is_cancelled():
+            self.summary_label.setText("已取消，未加入下载队列")
+            return
+
+        os.makedirs(self.download_dir, exist_ok=True)
+        item_ids = []
+        skipped = 0
+        for result in results:
+            for version in result["versions"]:
+                save_path = os.path.join(self.download_dir, version_filename(version))
+                # 已下载过的文件不再重复下载（例如定期更新镜像时重复运行同一列表）
+                if os.path.exists(save_path):
+                    skipped += 1
+                    continue
+                item_ids.append(self.download_manager.add(version["download_url"], save_path))
+
+        failed = sum(1 for result in results if result["error"])
+        self.summary_label.setText(f"解析完成: {len(results) - failed} 个成功, {failed} 个失败；"
+                                   f"已加入下载队列 {len(item_ids)} 个文件，跳过已存在的 {skipped} 个")
+        if item_ids:
+            self.batch_queued.emit(item_ids)
+
+    def _stop_resolving(self):
+        """取消解析并断开线程的信号，对话框关闭后线程的结果不再更新界面或加入下载队列"""
+        thread = self.resolve_thread
+        if thread is None:
+            return
+        thread.cancel()
+        for signal in (thread.progress_signal, thread.finished_signal):
+            try:
+                signal.disconnect()
+            except TypeError:
+                pass
+
+    def reject(self):
+        self._stop_resolving()
+        super().reject()
+
+    def closeEvent(self, event):
+        self._stop_resolving()
+        super().closeEvent(event)
@@ -0,0 +1,444 @@
+import os
+import json
+import time
+import uuid
+import threading
+from PyQt6.QtWidgets import (QTableWidget, QTableWidgetItem, QHeaderView, QWidget,
+                             QHBoxLayout, QPushButton, QSpinBox, QProgressBar)
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal
+
+from network.web_scraper import WebScraper
+from network.download_state import PartialDownload
+from utils.config import Config, get_data_dir
+
+
+class DownloadThread(QThread):
+    progress_signal = pyqtSignal(int, str)
+    finished_signal = pyqtSignal(str)
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, url, save_path):
+        super().__init__()
+        self.url = url
+        self.save_path = save_path
+        self.start_time = None
+        self.last_bytes = 0
+        self.last_time = None
+        self._is_cancelled = False
+        self._cancel_event = threading.Event()
+        # 下载被移除时设置：线程退出后再删除 .part 数据，避免线程仍在写入或保存续传状态
+        self.discard_on_finish = False
+
+    def run(self):
+        try:
+            # 检查URL是否有效
+            if not self.url or not self.url.startswith(('http://', 'https://')):
+                self.error_signal.emit(f"无效的下载链接: {self.url}")
+                return
+
+            # 检查保存路径
+            save_dir = os.path.dirname(self.save_path)
+            if not os.path.exists(save_dir):
+                try:
+                    os.makedirs(save_dir)
+                except Exception as e:
+                    self.error_signal.emit(f"创建目录失败: {str(e)}")
+                    return
+
+            # 检查目录可写
+            if not os.access(save_dir, os.W_OK):
+                self.error_signal.emit(f"目录无写入权限: {save_dir}")
+                return
+
+            scraper = WebScraper()
+            success = scraper.download_file(self.url, self.save_path, self.progress_signal,
+                                            cancel_event=self._cancel_event)
+
+            if self._is_cancelled:
+                # 下载被取消时保留 .part 文件和续传状态，下次下载同一地址时继续
+                return
+
+            if success:
+                self.finished_signal.emit(self.save_path)
+            else:
+                self.error_signal.emit("下载失败")
+        except Exception as e:
+            if not self._is_cancelled:
+                self.error_signal.emit(f"下载错误: {str(e)}")
+
+    def cancel(self):
+        self._is_cancelled = True
+        self._cancel_event.set()
+
+
+class DownloadItem:
+    """下载队列中的一项"""
+    STATUS_TEXT = {
+        "queued": "排队中",
+        "downloading": "下载中",
+        "paused": "已暂停",
+        "completed": "已完成",
+        "failed": "失败",
+    }
+
+    def __init__(self, url, save_path, priority=0, item_id=None, status="queued",
+                 progress=0, error="", added_at=None):
+        self.id = item_id or uuid.uuid4().hex
+        self.url = url
+        self.save_path = save_path
+        self.priority = priority
+        self.status = status
+        self.progress = progress
+        self.speed = ""
+        self.error = error
+        self.added_at = added_at or time.time()
+
+    @property
+    def filename(self):
+        return os.path.basename(self.save_path)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "url": self.url,
+            "save_path": self.save_path,
+            "priority": self.priority,
+            "status": self.status,
+            "progress": self.progress,
+            "error": self.error,
+            "added_at": self.added_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["url"], data["save_path"], priority=data.get("priority", 0),
+                   item_id=data.get("id"), status=data.get("status", "queued"),
+                   progress=data.get("progress", 0), error=data.get("error", ""),
+                   added_at=data.get("added_at"))
+
+
+class DownloadManager(QObject):
+    """
+    下载队列管理器
+
+    维护一个持久化的下载队列，按优先级（高的先下）和加入时间调度，
+    同时运行的下载数不超过 max_concurrent。暂停的下载保留 .part 文件，
+    继续时从断点续传
+    """
+    item_added = pyqtSignal(str)
+    item_updated = pyqtSignal(str)
+    item_removed = pyqtSignal(str)
+    item_finished = pyqtSignal(str, str)   # 项目ID, 保存路径
+    item_failed = pyqtSignal(str, str)     # 项目ID, 错误信息
+    queue_idle = pyqtSignal()              # 所有下载都已结束
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.config = Config()
+        self.max_concurrent = self.config.get_max_concurrent_downloads()
+        self.queue_file = os.path.join(get_data_dir(), "download_queue.json")
+        self.items = {}
+        self._threads = {}
+        self._load_queue()
+
+    def add(self, url, save_path, priority=0):
+        """加入下载队列，同一保存路径已在队列中时直接返回原有项目"""
+        for item in self.items.values():
+            if item.save_path == save_path and item.status != "completed":
+                if item.status in ("paused", "failed"):
+                    self.resume(item.id)
+                return item.id
+
+        item = DownloadItem(url, save_path, priority=priority)
+        self.items[item.id] = item
+        self._save_queue()
+        self.item_added.emit(item.id)
+        self._schedule()
+        return item.id
+
+    def pause(self, item_id):
+        item = self.items.get(item_id)
+        if not item or item.status not in ("queued", "downloading"):
+            return
+        item.status = "paused"
+        item.speed = ""
+        thread = self._threads.get(item_id)
+        if thread:
+            thread.cancel()
+        self._save_queue()
+        self.item_updated.emit(item_id)
+
+    def resume(self, item_id):
+        item = self.items.get(item_id)
+        if not item or item.status not in ("paused", "failed"):
+            return
+        item.status = "queued"
+        item.error = ""
+        self._save_queue()
+        self.item_updated.emit(item_id)
+        self._schedule()
+
+    def remove(self, item_id, discard_partial=True):
+        """从队列中移除，未完成的下载默认同时删除 .part 数据"""
+        item = self.items.pop(item_id, None)
+        if not item:
+            return
+        thread = self._threads.get(item_id)
+        if thread:
+            thread.cancel()
+            thread.wait(1000)
+        if discard_partial and item.status != "completed":
+            if thread and thread.isRunning():
+                thread.discard_on_finish = True
+            else:
+                PartialDownload(item.save_path).discard()
+        self._save_queue()
+        self.item_removed.emit(item_id)
+        self._schedule()
+
+    def set_priority(self, item_id, priority):
+        item = self.items.get(item_id)
+        if not item or item.priority == priority:
+            return
+        item.priority = priority
+        self._save_queue()
+        self.item_updated.emit(item_id)
+
+    def set_max_concurrent(self, count):
+        self.max_concurrent = max(1, count)
+        self.config.set_max_concurrent_downloads(self.max_concurrent)
+        self._schedule()
+
+    def clear_completed(self):
+        for item_id in [i.id for i in self.items.values() if i.status == "completed"]:
+            self.remove(item_id, discard_partial=False)
+
+    def is_active_url(self, url):
+        """该地址是否正在下载或排队中"""
+        return any(item.url == url and item.status in ("queued", "downloading")
+                   for item in self.items.values())
+
+    def active_count(self):
+        return len(self._threads)
+
+    def pending_count(self):
+        return sum(1 for item in self.items.values() if item.status == "queued")
+
+    def start_pending(self):
+        """启动从上次会话恢复的排队下载"""
+        self._schedule()
+
+    def shutdown(self):
+        """程序退出时停止所有下载，正在下载的项目下次启动时自动继续"""
+        for thread in list(self._threads.values()):
+            thread.cancel()
+        for thread in list(self._threads.values()):
+            thread.wait(2000)
+        self._save_queue()
+
+    def _schedule(self):
+        """在并发上限内启动排队中的下载，优先级高、加入早的先开始"""
+        queued = sorted((item for item in self.items.values() if item.status == "queued"),
+                        key=lambda item: (-item.priority, item.added_at))
+        for item in queued:
+            if len(self._threads) >= self.max_concurrent:
+                break
+            # 刚暂停又继续时旧线程可能还没退出，等它结束后再启动，避免两个线程写同一个文件
+            if item.id in self._threads:
+                continue
+            # 同一文件被移除后的线程还没退出（退出后会删除 .part 数据），等它结束
+            if any(thread.save_path == item.save_path for thread in self._threads.values()):
+                continue
+            self._start(item)
+
+    def _start(self, item):
+        item.status = "downloading"
+        item.error = ""
+        thread = DownloadThread(item.url, item.save_path)
+        thread.progress_signal.connect(lambda value, speed, item_id=item.id: self._on_progress(item_id, value, speed))
+        thread.finished_signal.connect(lambda path, item_id=item.id: self._on_finished(item_id, path))
+        thread.error_signal.connect(lambda message, item_id=item.id: self._on_error(item_id, message))
+        thread.finished.connect(lambda item_id=item.id, t=thread: self._on_thread_done(item_id, t))
+        self._threads[item.id] = thread
+        self._save_queue()
+        self.item_updated.emit(item.id)
+        thread.start()
+
+    def _on_progress(self, item_id, value, speed):
+        item = self.items.get(item_id)
+        if not item or item.status != "downloading":
+            return
+        if value >= 0:
+            item.progress = value
+        item.speed = speed
+        self.item_updated.emit(item_id)
+
+    def _on_finished(self, item_id, save_path):
+        item = self.items.get(item_id)
+        if not item:
+            return
+        item.status = "completed"
+        item.progress = 100
+        item.speed = ""
+        self._save_queue()
+        self.item_updated.emit(item_id)
+        self.item_finished.emit(item_id, save_path)
+
+    def _on_error(self, item_id, message):
+        item = self.items.get(item_id)
+        if not item:
+            return
+        item.status = "failed"
+        item.speed = ""
+        item.error = message
+        self._save_queue()
+        self.item_updated.emit(item_id)
+        self.item_failed.emit(item_id, message)
+
+    def _on_thread_done(self, item_id, thread):
+        if self._threads.get(item_id) is thread:
+            del self._threads[item_id]
+        if thread.discard_on_finish:
+            PartialDownload(thread.save_path).discard()
+        thread.deleteLater()
+        self._schedule()
+        if not self._threads and not self.pending_count():
+            self.queue_idle.emit()
+
+    def _load_queue(self):
+        if not os.path.exists(self.queue_file):
+            return
+        try:
+            with open(self.queue_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"读取下载队列失败: {e}")
+            return
+        for entry in data:
+            item = DownloadItem.from_dict(entry)
+            # 上次退出时正在下载的项目重新排队，继续断点续传
+            if item.status == "downloading":
+                item.status = "queued"
+            self.items[item.id] = item
+
+    def _save_queue(self):
+        data = [item.to_dict() for item in self.items.values()]
+        tmp_path = self.queue_file + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.queue_file)
+        except OSError as e:
+            print(f"保存下载队列失败: {e}")
+
+
+class DownloadQueueWidget(QTableWidget):
+    """下载队列视图：显示每个下载的状态、进度和速度，提供暂停/继续、优先级和移除操作"""
+    COLUMNS = ["文件名", "状态", "进度", "速度", "优先级", "操作"]
+
+    def __init__(self, manager, parent=None):
+        super().__init__(0, len(self.COLUMNS), parent)
+        self.manager = manager
+        self._rows = {}  # 项目ID -> 行对应的控件
+
+        self.setHorizontalHeaderLabels(self.COLUMNS)
+        header = self.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for column in range(1, len(self.COLUMNS)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionsClickable(False)
+        self.verticalHeader().setDefaultSectionSize(36)
+        self.verticalHeader().setVisible(False)
+        self.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+
+        manager.item_added.connect(self._add_row)
+        manager.item_updated.connect(self._update_row)
+        manager.item_removed.connect(self._remove_row)
+
+        for item_id in manager.items:
+            self._add_row(item_id)
+
+    def _add_row(self, item_id):
+        item = self.manager.items.get(item_id)
+        if not item or item_id in self._rows:
+            return
+        row = self.rowCount()
+        self.insertRow(row)
+
+        name_item = QTableWidgetItem(item.filename)
+        name_item.setData(Qt.ItemDataRole.UserRole, item_id)
+        name_item.setToolTip(item.save_path)
+        self.setItem(row, 0, name_item)
+        self.setItem(row, 1, QTableWidgetItem())
+        self.setItem(row, 3, QTableWidgetItem())
+
+        progress = QProgressBar()
+        progress.setRange(0, 100)
+        progress.setTextVisible(True)
+        self.setCellWidget(row, 2, progress)
+
+        priority = QSpinBox()
+        priority.setRange(-9, 9)
+        priority.setValue(item.priority)
+        priority.setToolTip("数值越大越先下载")
+        priority.valueChanged.connect(lambda value, i=item_id: self.manager.set_priority(i, value))
+        self.setCellWidget(row, 4, priority)
+
+        actions = QWidget()
+        actions_layout = QHBoxLayout(actions)
+        actions_layout.setContentsMargins(2, 0, 2, 0)
+        actions_layout.setSpacing(4)
+        toggle_btn = QPushButton()
+        toggle_btn.clicked.connect(lambda checked, i=item_id: self._toggle(i))
+        remove_btn = QPushButton("移除")
+        remove_btn.clicked.connect(lambda checked, i=item_id: self.manager.remove(i))
+        actions_layout.addWidget(toggle_btn)
+        actions_layout.addWidget(remove_btn)
+        self.setCellWidget(row, 5, actions)
+
+        self._rows[item_id] = {"name": name_item, "progress": progress, "toggle": toggle_btn}
+        self._update_row(item_id)
+
+    def _row_of(self, item_id):
+        widgets = self._rows.get(item_id)
+        return self.row(widgets["name"]) if widgets else -1
+
+    def _update_row(self, item_id):
+        item = self.manager.items.get(item_id)
+        row = self._row_of(item_id)
+        if not item or row < 0:
+            return
+        widgets = self._rows[item_id]
+        status_text = DownloadItem.STATUS_TEXT.get(item.status, item.status)
+        status_cell = self.item(row, 1)
+        status_cell.setText(status_text)
+        status_cell.setToolTip(item.error)
+        self.item(row, 3).setText(item.speed)
+        widgets["progress"].setValue(item.progress)
+
+        toggle_btn = widgets["toggle"]
+        if item.status in ("queued", "downloading"):
+            toggle_btn.setText("暂停")
+            toggle_btn.setEnabled(True)
+        elif item.status in ("paused", "failed"):
+            toggle_btn.setText("继续")
+            toggle_btn.setEnabled(True)
+        else:
+            toggle_btn.setText("完成")
+            toggle_btn.setEnabled(False)
+
+    def _remove_row(self, item_id):
+        row = self._row_of(item_id)
+        if row >= 0:
+            self.removeRow(row)
+        self._rows.pop(item_id, None)
+
+    def _toggle(self, item_id):
+        item = self.manager.items.get(item_id)
+        if not item:
+            return
+        if item.status in ("queued", "downloading"):
+            self.manager.pause(item_id)
+        else:
+            self.manager.resume(item_id)
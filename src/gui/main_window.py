@@ -1,79 +1,41 @@
 import os
 import sys
 import re
+import threading
 from PyQt6.QtWidgets import (QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QPushButton, 
                            QLineEdit, QLabel, QProgressBar, QMessageBox, QFileDialog,
                            QTableWidget, QTableWidgetItem, QHeaderView, QComboBox,
                            QFrame, QSizePolicy, QStyledItemDelegate, QApplication,
-                           QProgressDialog, QDialog, QCheckBox, QTextBrowser, QGraphicsOpacityEffect)
+                           QProgressDialog, QDialog, QCheckBox, QTextBrowser, QGraphicsOpacityEffect,
+                           QSpinBox, QAbstractItemView, QInputDialog)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QUrl, QTimer, QPropertyAnimation, QEasingCurve, QSize, QPoint, QRectF, QDateTime
 from PyQt6.QtGui import QDesktopServices, QIcon, QPalette, QColor, QFont, QPainter, QPainterPath
 
 from network.web_scraper import WebScraper
-from parser.html_parser import HtmlParser
+from network.download_state import PartialDownload
+from network.http_pool import get_http_pool
+from network.rate_limiter import get_bandwidth_limiter
+from network.browser_pool import get_browser_pool
+from network.prefetcher import get_trainer_prefetcher
+from network.resilience import get_resilience_manager
+from network.disk_writer import FSYNC_POLICIES
+from network.warmup import ConnectionWarmer
+from network.batch_resolver import select_versions, version_filename, RULE_LATEST_STANDALONE
+from network.manifest import HashManifest, VERIFY_OK, VERIFY_MISMATCH, VERIFY_MISSING, VERIFY_UNTRACKED
+from catalog import CatalogCrawler, CatalogSync, CatalogSyncScheduler, WatchScheduler, get_trainer_catalog, get_watch_list
+from pipeline import PostDownloadPipeline, default_stages
+from pipeline.base import EVENT_DONE, EVENT_FAILED, EVENT_SKIPPED
+from translator.translation_cache import get_translation_cache, SOURCE_MANUAL
+from translator.title_dictionary import get_title_dictionary
 from utils.config import Config
 from utils.logger import Logger
-
-class DownloadThread(QThread):
-    progress_signal = pyqtSignal(int, str)
-    finished_signal = pyqtSignal(str)
-    error_signal = pyqtSignal(str)
-    
-    def __init__(self, url, save_path):
-        super().__init__()
-        self.url = url
-        self.save_path = save_path
-        self.start_time = None
-        self.last_bytes = 0
-        self.last_time = None
-        self._is_cancelled = False
-        
-    def run(self):
-        try:
-            # 检查URL是否有效
-            if not self.url or not self.url.startswith(('http://', 'https://')):
-                self.error_signal.emit(f"无效的下载链接: {self.url}")
-                return
-                
-            # 检查保存路径
-            save_dir = os.path.dirname(self.save_path)
-            if not os.path.exists(save_dir):
-                try:
-                    os.makedirs(save_dir)
-                except Exception as e:
-                    self.error_signal.emit(f"创建目录失败: {str(e)}")
-                    return
-            
-            # 检查目录可写
-            if not os.access(save_dir, os.W_OK):
-                self.error_signal.emit(f"目录无写入权限: {save_dir}")
-                return
-                
-            scraper = WebScraper()
-            success = scraper.download_file(self.url, self.save_path, self.progress_signal)
-            
-            if self._is_cancelled:
-                # 如果下载被取消，删除部分下载的文件
-                if os.path.exists(self.save_path):
-                    try:
-                        os.remove(self.save_path)
-                    except:
-                        pass
-                return
-                
-            if success:
-                self.finished_signal.emit(self.save_path)
-            else:
-                self.error_signal.emit("下载失败")
-        except Exception as e:
-            if not self._is_cancelled:
-                self.error_signal.emit(f"下载错误: {str(e)}")
-                
-    def cancel(self):
-        self._is_cancelled = True
+from .download_manager import DownloadManager, DownloadQueueWidget
+from .batch_dialog import BatchDownloadDialog
+from .watch_dialog import WatchListDialog
 
 class SearchThread(QThread):
     result_signal = pyqtSignal(list)
+    page_signal = pyqtSignal(int, list)  # 每获取一页搜索结果发送一次（页码, 本页新增结果）
     error_signal = pyqtSignal(str)
     progress_signal = pyqtSignal(str)  # 添加进度信号
     
@@ -87,16 +49,18 @@ class SearchThread(QThread):
             self.progress_signal.emit("正在连接搜索服务...")
             scraper = WebScraper()
             self.progress_signal.emit("正在搜索游戏...")
-            html = scraper.search_game(self.search_term)
-            self.progress_signal.emit("正在解析搜索结果...")
-            parser = HtmlParser()
-            results = parser.parse_search_results(html)
+            results = scraper.search_game_pages(self.search_term, on_page=self._emit_page,
+                                                should_stop=lambda: self._is_cancelled)
             if not self._is_cancelled:
                 self.result_signal.emit(results)
         except Exception as e:
             if not self._is_cancelled:
                 self.error_signal.emit(f"搜索错误: {str(e)}")
                 
+    def _emit_page(self, page, results):
+        if not self._is_cancelled:
+            self.page_signal.emit(page, results)
+            
     def cancel(self):
         self._is_cancelled = True
 
@@ -293,6 +257,69 @@ class TranslateThread(QThread):
     def cancel(self):
         self._is_cancelled = True
 
+# 校验下载库的线程：并行重新计算下载目录中文件的SHA-256并与校验清单比对
+class VerifyLibraryThread(QThread):
+    progress_signal = pyqtSignal(int, int, str)
+    result_signal = pyqtSignal(list)
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+        
+    def run(self):
+        try:
+            manifest = HashManifest(self.directory)
+            results = manifest.verify(
+                max_workers=max(2, min(8, os.cpu_count() or 2)),
+                progress_callback=lambda done, total, result: self.progress_signal.emit(done, total, result["filename"]))
+            self.result_signal.emit(results)
+        except Exception as e:
+            self.error_signal.emit(f"校验下载库失败: {str(e)}")
+
+class CatalogCrawlThread(QThread):
+    progress_signal = pyqtSignal(int, int)
+    result_signal = pyqtSignal(dict)
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, full=True):
+        super().__init__()
+        self.full = full  # True: 完整爬取, False: 增量同步
+        self.cancel_event = threading.Event()
+        
+    def run(self):
+        try:
+            if self.full:
+                stats = CatalogCrawler().crawl(
+                    progress_callback=lambda pages, found: self.progress_signal.emit(pages, found),
+                    cancel_event=self.cancel_event)
+            else:
+                stats = CatalogSync().sync(cancel_event=self.cancel_event)
+                if stats is None:
+                    raise Exception("本地目录正在后台同步，请稍后再试")
+                if stats["error"]:
+                    raise Exception(stats["error"])
+            self.result_signal.emit(stats)
+        except Exception as e:
+            self.error_signal.emit(f"更新本地目录失败: {str(e)}")
+            
+    def cancel(self):
+        self.cancel_event.set()
+
+class WarmupThread(QThread):
+    """启动时在后台预先建立网络连接（和启动浏览器），窗口显示时不必等待"""
+    result_signal = pyqtSignal(dict)
+    
+    def __init__(self, include_browser):
+        super().__init__()
+        self.include_browser = include_browser
+        
+    def run(self):
+        try:
+            self.result_signal.emit(ConnectionWarmer().warm(include_browser=self.include_browser))
+        except Exception as e:
+            print(f"网络预热失败: {e}")
+
 # 添加协议对话框类
 class AgreementDialog(QDialog):
     def __init__(self, parent=None):
@@ -490,28 +517,61 @@ class StatusOverlay(QWidget):
         painter.drawRect(self.rect())
 
 class MainWindow(QMainWindow):
+    # 下载后处理流水线的事件（文件名, 阶段, 事件, 说明），从流水线线程发送到GUI线程
+    pipeline_event = pyqtSignal(str, str, str, str)
+    catalog_synced = pyqtSignal(dict)
+    # 关注的修改器发现新版本（关注条目, 新版本列表, 完整版本列表），从检查线程发送到GUI线程
+    watch_new_versions = pyqtSignal(dict, list, list)
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("风灵月影修改器下载器")
         self.setMinimumSize(1000, 700)
-        self.download_thread = None
         self.search_thread = None
+        self.catalog_thread = None
         self.config = Config()
         self.logger = Logger()
         self.trainer_links = []
         
+        # 下载队列管理器，支持多个下载并行
+        self.download_manager = DownloadManager(self)
+        self.download_manager.item_finished.connect(self.download_finished)
+        self.download_manager.item_failed.connect(self.download_failed)
+        self.download_manager.item_updated.connect(self.update_progress)
+        self.download_manager.item_removed.connect(self.update_progress)
+        self.download_manager.queue_idle.connect(self.on_download_queue_idle)
+        self.last_download_path = None
+        
+        # 后台预取搜索结果的修改器页面，点击“查看”时通常可以直接显示
+        self.prefetcher = get_trainer_prefetcher()
+        self.search_result_urls = []
+        self.batch_item_ids = []
+        
+        # 下载后处理流水线（校验、解压、建立索引），第一次使用时创建
+        self.pipeline = None
+        self.pipeline_event.connect(self.on_pipeline_event)
+        
+        # 定期在后台增量同步本地目录（目录为空时等用户手动完整爬取）
+        self.catalog_synced.connect(self.on_catalog_updated)
+        self.catalog_scheduler = CatalogSyncScheduler(self.config.get_catalog_sync_interval(),
+                                                      on_synced=self.catalog_synced.emit)
+        if get_trainer_catalog().count() > 0:
+            self.catalog_scheduler.start()
+        
+        # 按各自的更新频率在后台检查关注的修改器
+        self.current_trainer_url = None
+        self.current_trainer_title = None
+        self.watch_new_versions.connect(self.on_watch_new_versions)
+        self.watch_scheduler = WatchScheduler(scraper=self.prefetcher.scraper,
+                                              on_new_versions=self.watch_new_versions.emit)
+        self.watch_scheduler.start()
+        
         # 设置图标路径
         self.icon_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "resources")
         
         # 设置窗口图标
         self.setWindowIcon(QIcon(os.path.join(self.icon_path, "app_icon.jpg")))
         
-        # 初始化下载相关变量
-        self.download_start_time = None
-        self.download_speed = "0 KB/s"
-        self.download_size = "0 MB"
-        self.download_elapsed = "00:00:00"
-        
         # 检查是否首次运行，显示协议
         if self.check_first_run():
             self.show_agreement_dialog()
@@ -519,6 +579,16 @@ class MainWindow(QMainWindow):
         self.init_ui()
         self.apply_styles()
         
+        # 在后台预先建立到网站的连接并启动浏览器，第一次搜索和查看修改器页面时
+        # 不必在关键路径上进行DNS解析、TLS握手和浏览器冷启动
+        self.warmup_thread = None
+        if self.config.get_startup_warmup():
+            self.warmup_thread = WarmupThread(include_browser=self.config.get_browser_prelaunch())
+            self.warmup_thread.result_signal.connect(self.on_warmup_finished)
+            self.warmup_thread.start()
+        elif self.config.get_browser_prelaunch():
+            get_browser_pool().prelaunch()
+        
     def check_first_run(self):
         """检查是否是首次运行程序"""
         # 检查环境变量
@@ -679,8 +749,18 @@ class MainWindow(QMainWindow):
         self.official_site_btn.clicked.connect(self.open_official_site)
         self.official_site_btn.setMinimumWidth(180)  # 设置最小宽度
         
+        # 爬取网站文章列表建立本地目录，之后的搜索直接查询本地索引
+        self.update_catalog_btn = FunctionButton("更新本地目录")
+        self.update_catalog_btn.setToolTip("第一次爬取风灵月影网站的全部修改器列表保存到本地，之后只同步新发布的修改器；"
+                                           "搜索时优先使用本地目录")
+        self.update_catalog_btn.clicked.connect(self.update_catalog)
+        
         toolbar_layout.addLayout(search_layout)
         toolbar_layout.addStretch()
+        toolbar_layout.addWidget(self.update_catalog_btn)
+        self.watch_list_btn = FunctionButton("关注列表")
+        self.watch_list_btn.clicked.connect(self.open_watch_list)
+        toolbar_layout.addWidget(self.watch_list_btn)
         toolbar_layout.addWidget(self.official_site_btn)
         
         # 添加搜索警示标语
@@ -729,6 +809,13 @@ class MainWindow(QMainWindow):
                 border-bottom: 1px solid #eee;
             }
         """)
+        # 可以多选搜索结果，批量下载所选游戏
+        self.results_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.results_table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        # 悬停或选中某一行时预取该行的修改器页面
+        self.results_table.setMouseTracking(True)
+        self.results_table.cellEntered.connect(lambda row, column: self._prefetch_result_row(row))
+        self.results_table.currentCellChanged.connect(lambda row, column, prev_row, prev_column: self._prefetch_result_row(row))
         results_layout.addWidget(self.results_table)
         
         # 创建版本选择表格
@@ -736,9 +823,27 @@ class MainWindow(QMainWindow):
         versions_frame.setFrameStyle(QFrame.Shape.StyledPanel | QFrame.Shadow.Raised)
         versions_layout = QVBoxLayout(versions_frame)
         
+        versions_header = QHBoxLayout()
         versions_label = QLabel("可用修改器版本")
         versions_label.setFont(QFont("Microsoft YaHei", 12, QFont.Weight.Bold))
-        versions_layout.addWidget(versions_label)
+        self.download_selected_btn = FunctionButton("下载选中版本")
+        self.download_selected_btn.clicked.connect(self.download_selected_versions)
+        versions_header.addWidget(versions_label)
+        versions_header.addStretch()
+        # 关注当前修改器，有新版本时提醒或自动下载
+        self.watch_btn = FunctionButton("关注")
+        self.watch_btn.setEnabled(False)
+        self.watch_btn.clicked.connect(self.toggle_watch)
+        self.watch_auto_download_check = QCheckBox("新版本自动下载")
+        self.watch_auto_download_check.setChecked(self.config.get_watch_auto_download())
+        self.watch_auto_download_check.toggled.connect(self.set_watch_auto_download)
+        versions_header.addWidget(self.watch_auto_download_check)
+        versions_header.addWidget(self.watch_btn)
+        versions_header.addWidget(self.download_selected_btn)
+        self.batch_download_btn = FunctionButton("批量下载")
+        self.batch_download_btn.clicked.connect(self.open_batch_download)
+        versions_header.addWidget(self.batch_download_btn)
+        versions_layout.addLayout(versions_header)
         
         self.versions_table = QTableWidget(0, 4)
         self.versions_table.setHorizontalHeaderLabels(["文件名", "添加日期", "文件大小", "操作"])
@@ -751,6 +856,9 @@ class MainWindow(QMainWindow):
         self.versions_table.horizontalHeader().setSectionsClickable(False)
         self.versions_table.verticalHeader().setDefaultSectionSize(40)
         self.versions_table.setShowGrid(True)
+        # 允许按住Ctrl/Shift选择多个版本一起下载
+        self.versions_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.versions_table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.versions_table.setStyleSheet("""
             QTableWidget {
                 gridline-color: #ddd;
@@ -770,36 +878,96 @@ class MainWindow(QMainWindow):
         download_layout = QVBoxLayout(download_frame)
         
         download_header = QHBoxLayout()
-        self.download_label = QLabel("下载进度:")
+        self.download_label = QLabel("下载队列:")
         self.download_label.setFont(QFont("Microsoft YaHei", 10, QFont.Weight.Bold))
+        
+        # 同时下载数量
+        concurrency_label = QLabel("同时下载:")
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, 10)
+        self.concurrency_spin.setValue(self.download_manager.max_concurrent)
+        self.concurrency_spin.valueChanged.connect(self.download_manager.set_max_concurrent)
+        
+        # 限速设置（KB/s，0为不限速），修改后对正在进行的下载立即生效
+        global_limit_label = QLabel("总限速:")
+        self.global_limit_spin = QSpinBox()
+        self.global_limit_spin.setRange(0, 1024 * 1024)
+        self.global_limit_spin.setSingleStep(100)
+        self.global_limit_spin.setSuffix(" KB/s")
+        self.global_limit_spin.setSpecialValueText("不限速")
+        self.global_limit_spin.setValue(self.config.get_global_rate_limit())
+        self.global_limit_spin.valueChanged.connect(self.update_rate_limits)
+        
+        download_limit_label = QLabel("单个限速:")
+        self.download_limit_spin = QSpinBox()
+        self.download_limit_spin.setRange(0, 1024 * 1024)
+        self.download_limit_spin.setSingleStep(100)
+        self.download_limit_spin.setSuffix(" KB/s")
+        self.download_limit_spin.setSpecialValueText("不限速")
+        self.download_limit_spin.setValue(self.config.get_download_rate_limit())
+        self.download_limit_spin.valueChanged.connect(self.update_rate_limits)
+        
+        # 写盘同步策略，对之后开始的下载生效
+        fsync_label = QLabel("写盘:")
+        self.fsync_combo = QComboBox()
+        for policy, name in FSYNC_POLICIES.items():
+            self.fsync_combo.addItem(name, policy)
+        self.fsync_combo.setCurrentIndex(max(self.fsync_combo.findData(self.config.get_download_fsync_policy()), 0))
+        self.fsync_combo.setToolTip("不同步最快；完成时同步保证下载完成的文件完整；定期同步在断电后也能可靠续传")
+        self.fsync_combo.currentIndexChanged.connect(
+            lambda index: self.config.set_download_fsync_policy(self.fsync_combo.itemData(index)))
+        
+        self.clear_completed_btn = QPushButton("清除已完成")
+        self.clear_completed_btn.clicked.connect(self.download_manager.clear_completed)
+        
+        self.auto_extract_check = QCheckBox("下载后自动解压")
+        self.auto_extract_check.setToolTip("下载完成后在后台校验压缩包，并解压到下载目录中以游戏名命名的文件夹")
+        self.auto_extract_check.setChecked(self.config.get_auto_extract())
+        self.auto_extract_check.toggled.connect(self.config.set_auto_extract)
+        
+        self.verify_library_btn = QPushButton("校验下载库")
+        self.verify_library_btn.setToolTip("重新计算下载目录中修改器文件的SHA-256，检查是否损坏或被修改")
+        self.verify_library_btn.clicked.connect(self.verify_library)
+        
         self.download_path_btn = FunctionButton("选择下载路径")
         self.download_path_btn.setIcon(QIcon(os.path.join(self.icon_path, "folder.png")))
         self.download_path_btn.clicked.connect(self.select_download_path)
         self.download_path_btn.setMinimumWidth(150)  # 设置最小宽度
         download_header.addWidget(self.download_label)
         download_header.addStretch()
+        download_header.addWidget(concurrency_label)
+        download_header.addWidget(self.concurrency_spin)
+        download_header.addWidget(global_limit_label)
+        download_header.addWidget(self.global_limit_spin)
+        download_header.addWidget(download_limit_label)
+        download_header.addWidget(self.download_limit_spin)
+        download_header.addWidget(fsync_label)
+        download_header.addWidget(self.fsync_combo)
+        download_header.addWidget(self.clear_completed_btn)
+        download_header.addWidget(self.verify_library_btn)
+        download_header.addWidget(self.auto_extract_check)
         download_header.addWidget(self.download_path_btn)
         
         # 添加下载信息显示
         download_info_layout = QHBoxLayout()
-        self.speed_label = QLabel("速度: 0 KB/s")
-        self.size_label = QLabel("大小: 0 MB")
-        self.time_label = QLabel("时间: 00:00:00")
-        
-        download_info_layout.addWidget(self.speed_label)
-        download_info_layout.addWidget(self.size_label)
-        download_info_layout.addWidget(self.time_label)
+        self.queue_summary_label = QLabel("下载中: 0  排队: 0")
+        download_info_layout.addWidget(self.queue_summary_label)
         download_info_layout.addStretch()
         
+        # 总体进度（所有未完成下载的平均进度）
         self.progress_bar = AnimatedProgressBar()
         self.progress_bar.setValue(0)
         self.progress_bar.setMinimumHeight(20)
         self.progress_bar.setTextVisible(True)
-        self.progress_bar.setFormat("%p% (%v/%m)")
+        self.progress_bar.setFormat("%p%")
+        
+        self.download_queue_view = DownloadQueueWidget(self.download_manager)
+        self.download_queue_view.setMinimumHeight(120)
         
         download_layout.addLayout(download_header)
         download_layout.addLayout(download_info_layout)
         download_layout.addWidget(self.progress_bar)
+        download_layout.addWidget(self.download_queue_view)
         
         # 将所有组件添加到主布局
         main_layout.addWidget(toolbar)
@@ -824,6 +992,10 @@ class MainWindow(QMainWindow):
         # 设置默认下载路径
         self.download_path = self.config.get_download_path()
         
+        # 继续上次未完成的下载队列
+        self.update_progress()
+        self.download_manager.start_pending()
+        
     def resizeEvent(self, event):
         """重写大小调整事件，确保覆盖层覆盖整个窗口"""
         super().resizeEvent(event)
@@ -847,6 +1019,15 @@ class MainWindow(QMainWindow):
         
         # 检查是否需要翻译
         if self._contains_chinese(search_term_original):
+            # 先查本地的翻译缓存和离线词典，命中时不需要联网翻译
+            local = self._lookup_local_translation(search_term_original)
+            if local:
+                english_name, source = local
+                self.last_translation = (search_term_original, english_name)
+                self.statusBar().showMessage(f"{source}: {search_term_original} -> {english_name}, 正在搜索...")
+                self._perform_search(english_name)
+                return
+
             # 创建并显示翻译进度对话框
             self.progress_dialog = QProgressDialog("正在准备翻译游戏名称...", "取消", 0, 100, self)
             self.progress_dialog.setWindowTitle("正在翻译游戏名")
@@ -890,6 +1071,26 @@ class MainWindow(QMainWindow):
         self.statusBar().showMessage(f"正在搜索: {search_term_to_use}...")
         self._perform_search(search_term_to_use)
     
+    def _lookup_local_translation(self, chinese_name):
+        """
+        在本地查找中文游戏名的英文名：用户修正过或查询过的翻译优先，其次是离线词典
+
+        Returns:
+            (英文名, 来源说明)，找不到时返回 None
+        """
+        english_name = get_translation_cache().get(chinese_name)
+        if english_name:
+            return english_name, "已缓存的翻译"
+        try:
+            match = get_title_dictionary().lookup(chinese_name)
+        except Exception as e:
+            print(f"查询离线词典失败: {e}")
+            return None
+        if match:
+            english_name, match_type, score = match
+            return english_name, f"本地词典({match_type}, {score:.2f})"
+        return None
+
     def update_translate_progress(self, message):
         """更新翻译进度对话框的信息"""
         if hasattr(self, 'progress_dialog') and self.progress_dialog.isVisible():
@@ -916,6 +1117,7 @@ class MainWindow(QMainWindow):
         if success and hasattr(self, 'translated_name'):
             # 成功情况：显示成功信息并启动搜索
             english_name = self.translated_name
+            self.last_translation = (original_term, english_name)
             self.statusBar().showMessage(f"翻译成功: {english_name}, 正在搜索...")
             
             # 显示翻译成功的提示（可选）
@@ -951,22 +1153,43 @@ class MainWindow(QMainWindow):
                 # 用户选择取消搜索
                 self.statusBar().showMessage("搜索已取消")
             else:
-                # 用户选择手动输入英文
-                self.statusBar().showMessage("请手动输入游戏的英文名称")
-                # 保持焦点在搜索框上，便于用户立即输入
-                self.search_input.setFocus()
-                self.search_input.selectAll()
+                # 用户选择手动输入英文，保存后下次直接使用
+                self.correct_translation(original_term)
+    
+    def correct_translation(self, chinese_name, current_name=""):
+        """手动指定（或修正）中文游戏名对应的英文名，保存到翻译缓存后重新搜索"""
+        english_name, ok = QInputDialog.getText(
+            self, "手动输入英文名", f"请输入 \"{chinese_name}\" 的英文游戏名称:", text=current_name)
+        english_name = english_name.strip()
+        if not ok or not english_name:
+            self.statusBar().showMessage("请手动输入游戏的英文名称")
+            # 保持焦点在搜索框上，便于用户立即输入
+            self.search_input.setFocus()
+            self.search_input.selectAll()
+            return
+        get_translation_cache().put(chinese_name, english_name, source=SOURCE_MANUAL)
+        self.statusBar().showMessage(f"已保存翻译: {chinese_name} -> {english_name}, 正在搜索...")
+        self._perform_search(english_name)
     
     def _perform_search(self, search_term):
         """执行实际的搜索操作，从原始search_game方法中提取的逻辑"""
+        # 相同的搜索正在进行时（例如连按两次回车）不再重复启动
+        if self.search_thread and self.search_thread.isRunning() and self.search_thread.search_term == search_term:
+            return
+        
         # 显示状态指示
         if hasattr(self, 'status_overlay'):
             self.status_overlay.showMessage("搜索中")
             
+        # 上一次搜索还在获取后续页面时停止它，避免旧结果追加到新的列表中
+        if self.search_thread and self.search_thread.isRunning():
+            self.search_thread.cancel()
+            
         # 创建搜索线程
         self.search_thread = SearchThread(search_term)
         
         # 连接信号
+        self.search_thread.page_signal.connect(self.append_search_page)
         self.search_thread.result_signal.connect(self.display_search_results)
         self.search_thread.result_signal.connect(lambda: self.status_overlay.hideMessage() if hasattr(self, 'status_overlay') else None)
         self.search_thread.error_signal.connect(self.show_error)
@@ -976,58 +1199,116 @@ class MainWindow(QMainWindow):
         # 启动线程
         self.search_thread.start()
     
+    def append_search_page(self, page, results):
+        """分页搜索每获取一页就把新结果追加到表格，第一页到达时立即显示"""
+        if page == 1:
+            if hasattr(self, 'status_overlay'):
+                self.status_overlay.hideMessage()
+            self.results_table.setRowCount(0)  # 清空表格
+            self.search_result_urls = []
+            
+        for result in results:
+            self._add_result_row(result)
+            
+        if self.search_result_urls:
+            self.statusBar().showMessage(f"已找到 {len(self.search_result_urls)} 个结果，正在获取更多页面...")
+            
+        if page == 1 and results:
+            # 在后台预取前几个结果的修改器页面（同时取消上一次搜索未开始的预取）
+            top_n = self.config.get_prefetch_top_n()
+            self.prefetcher.prefetch(self.search_result_urls[:top_n] if top_n > 0 else [])
+            
+    def _add_result_row(self, result):
+        row = self.results_table.rowCount()
+        self.results_table.insertRow(row)
+        self.results_table.setItem(row, 0, QTableWidgetItem(result["title"]))
+        self.results_table.setItem(row, 1, QTableWidgetItem(result["date"]))
+        
+        # 创建按钮
+        view_btn = TableButton("查看")
+        view_btn.clicked.connect(lambda checked, url=result["url"], title=result["title"]: self.view_trainer_page(url, title))
+        
+        # 使用按钮容器
+        btn_container = ButtonContainer()
+        btn_container.addButton(view_btn)
+        
+        self.results_table.setCellWidget(row, 2, btn_container)
+        self.search_result_urls.append(result["url"])
+        
     def display_search_results(self, results):
+        """所有页面获取完成（各页结果已经通过 append_search_page 显示）"""
         # 隐藏状态指示器
         if hasattr(self, 'status_overlay'):
             self.status_overlay.hideMessage()
         
-        self.results_table.setRowCount(0)  # 清空表格
-        
         if not results:
+            self.results_table.setRowCount(0)  # 清空表格
+            self.search_result_urls = []
+            self.prefetcher.cancel_pending()
             self.statusBar().showMessage("没有找到结果")
+            # 使用翻译结果搜索不到时，可能是翻译有误，允许用户修正
+            translation = getattr(self, 'last_translation', None)
+            if translation:
+                self.last_translation = None
+                chinese_name, english_name = translation
+                reply = QMessageBox.question(
+                    self,
+                    "没有找到结果",
+                    f"使用翻译 \"{english_name}\" 没有找到结果，是否手动修正 \"{chinese_name}\" 的英文名?",
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                )
+                if reply == QMessageBox.StandardButton.Yes:
+                    self.correct_translation(chinese_name, english_name)
             return
-            
-        for i, result in enumerate(results):
-            self.results_table.insertRow(i)
-            self.results_table.setItem(i, 0, QTableWidgetItem(result["title"]))
-            self.results_table.setItem(i, 1, QTableWidgetItem(result["date"]))
-            
-            # 创建按钮
-            view_btn = TableButton("查看")
-            view_btn.clicked.connect(lambda checked, url=result["url"]: self.view_trainer_page(url))
-            
-            # 使用按钮容器
-            btn_container = ButtonContainer()
-            btn_container.addButton(view_btn)
-            
-            self.results_table.setCellWidget(i, 2, btn_container)
-            
+        self.last_translation = None
+        
         self.statusBar().showMessage(f"找到 {len(results)} 个结果")
+        self._log_pool_stats()
+        
+    def _prefetch_result_row(self, row):
+        if 0 <= row < len(self.search_result_urls):
+            self.prefetcher.prefetch_one(self.search_result_urls[row])
+        
+    def view_trainer_page(self, url, title=None):
+        self.current_trainer_url = url
+        self.current_trainer_title = title
+        self.watch_btn.setEnabled(False)
+        
+        # 已预取过的页面直接显示
+        versions = self.prefetcher.get_cached(url)
+        if versions is not None:
+            print(f"使用预取的修改器页面: {url}")
+            self.process_trainer_page(versions)
+            return
+        
+        # 同一页面正在加载时（例如双击“查看”）不再重复启动
+        current = getattr(self, 'trainer_thread', None)
+        if current and current.isRunning() and current.url == url:
+            return
         
-    def view_trainer_page(self, url):
         # 显示状态指示
         if hasattr(self, 'status_overlay'):
             self.status_overlay.showMessage("加载修改器页面")
             
-        # 使用线程获取页面内容
+        # 使用线程获取页面内容（该页面正在预取时等待预取结果）
         class TrainerPageThread(QThread):
-            result_signal = pyqtSignal(str)
+            result_signal = pyqtSignal(list)
             error_signal = pyqtSignal(str)
             
-            def __init__(self, url):
+            def __init__(self, url, prefetcher):
                 super().__init__()
                 self.url = url
+                self.prefetcher = prefetcher
                 
             def run(self):
                 try:
-                    scraper = WebScraper()
-                    html = scraper.get_trainer_page(self.url)
-                    self.result_signal.emit(html)
+                    versions = self.prefetcher.get_versions(self.url)
+                    self.result_signal.emit(versions)
                 except Exception as e:
                     self.error_signal.emit(str(e))
         
         # 创建并启动线程
-        self.trainer_thread = TrainerPageThread(url)
+        self.trainer_thread = TrainerPageThread(url, self.prefetcher)
         self.trainer_thread.result_signal.connect(self.process_trainer_page)
         self.trainer_thread.error_signal.connect(self.show_trainer_error)
         self.trainer_thread.error_signal.connect(lambda: self.status_overlay.hideMessage() if hasattr(self, 'status_overlay') else None)
@@ -1035,18 +1316,16 @@ class MainWindow(QMainWindow):
         # 启动线程
         self.trainer_thread.start()
         
-    def process_trainer_page(self, html):
-        """处理获取到的修改器页面内容"""
+    def process_trainer_page(self, versions):
+        """显示解析好的修改器版本列表"""
         # 隐藏状态指示器
         if hasattr(self, 'status_overlay'):
             self.status_overlay.hideMessage()
             
         try:
-            parser = HtmlParser()
-            versions = parser.parse_trainer_versions(html)
-            
             self.display_trainer_versions(versions)
             self.statusBar().showMessage(f"加载完成，找到 {len(versions)} 个版本")
+            self._update_watch_button()
         except Exception as e:
             self.show_error(f"解析修改器页面失败: {str(e)}")
     
@@ -1109,6 +1388,9 @@ class MainWindow(QMainWindow):
             download_btn = TableButton("下载")
             download_btn.clicked.connect(lambda checked, url=version["download_url"], index=i, btn=download_btn: 
                                          self.download_trainer(url, index, btn))
+            if self.download_manager.is_active_url(version["download_url"]):
+                download_btn.setEnabled(False)
+                download_btn.setText("下载中")
             self.download_buttons.append(download_btn)
             
             # 使用按钮容器
@@ -1219,134 +1501,251 @@ class MainWindow(QMainWindow):
                     counter += 1
                 filename = os.path.basename(save_path)
         
-        # 重置下载信息
-        self.download_start_time = None
-        self.download_speed = "0 KB/s"
-        self.download_size = "0 MB"
-        self.download_elapsed = "00:00:00"
-        self.speed_label.setText(f"速度: {self.download_speed}")
-        self.size_label.setText(f"大小: {self.download_size}")
-        self.time_label.setText(f"时间: {self.download_elapsed}")
+        if os.path.exists(save_path + PartialDownload.STATE_SUFFIX):
+            self.statusBar().showMessage(f"继续未完成的下载: {filename}")
+        else:
+            self.statusBar().showMessage(f"已加入下载队列: {filename}")
         
-        self.statusBar().showMessage(f"开始下载: {filename}")
-        self.progress_bar.setValue(0)
+        # 加入下载队列，由下载管理器按并发数调度
+        self.download_manager.add(url, save_path)
         
-        # 如果正在进行下载，先取消
-        if self.download_thread and self.download_thread.isRunning():
-            try:
-                self.download_thread.cancel()
-                self.download_thread.wait(1000)  # 等待最多1秒
-            except:
-                pass
-                
-        self.download_thread = DownloadThread(url, save_path)
-        self.download_thread.progress_signal.connect(self.update_progress)
-        self.download_thread.finished_signal.connect(self.download_finished)
-        self.download_thread.error_signal.connect(self.show_error)
-        self.download_thread.error_signal.connect(lambda: self.status_overlay.hideMessage() if hasattr(self, 'status_overlay') else None)
-        self.download_thread.start()
-        
-        # 隐藏状态指示器（下载开始后通过进度条显示状态）
+        # 隐藏状态指示器（下载开始后通过队列显示状态）
         if hasattr(self, 'status_overlay'):
             self.status_overlay.hideMessage()
         
-        # 添加取消下载按钮
-        if not hasattr(self, 'cancel_download_btn'):
-            self.cancel_download_btn = QPushButton("取消下载")
-            self.cancel_download_btn.clicked.connect(self.cancel_download)
-            self.cancel_download_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #f44336;
-                    color: white;
-                    border: none;
-                    padding: 5px 15px;
-                    border-radius: 4px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #d32f2f;
-                }
-                QPushButton:pressed {
-                    background-color: #b71c1c;
-                }
-            """)
-        
-        # 在下载信息布局中添加取消按钮
-        layout = self.speed_label.parent().layout()
-        if layout and self.cancel_download_btn not in [layout.itemAt(i).widget() for i in range(layout.count()) if layout.itemAt(i).widget()]:
-            layout.addWidget(self.cancel_download_btn)
-        
-    def update_progress(self, value, speed_info):
-        # 确保 value 是整数
-        if isinstance(value, int):
-             if value == -1:
-                 # 总大小未知，只更新速度，不更新进度条数值
-                 self.progress_bar.setFormat(f"已下载: {self.progress_bar.value() * self.progress_bar.maximum() / 100 / (1024*1024):.2f} MB - {speed_info}") # 假设最大值代表总大小
-             else:
-                 self.progress_bar.setValue(value)
-                 self.progress_bar.setFormat("%p% - " + speed_info) # 标准格式显示百分比和速度
+    def download_selected_versions(self):
+        """将版本表格中选中的所有版本加入下载队列"""
+        rows = sorted({index.row() for index in self.versions_table.selectionModel().selectedRows()})
+        if not rows:
+            QMessageBox.information(self, "提示", "请先在版本列表中选择要下载的版本（可按住Ctrl或Shift多选）")
+            return
+        for row in rows:
+            if hasattr(self, 'trainer_versions') and row < len(self.trainer_versions):
+                button = self.download_buttons[row] if row < len(self.download_buttons) else None
+                self.download_trainer(self.trainer_versions[row]["download_url"], row, button)
+        
+    def open_batch_download(self):
+        """打开批量下载对话框，搜索结果中选中的游戏会预先填入列表"""
+        rows = sorted({index.row() for index in self.results_table.selectionModel().selectedRows()})
+        urls = [self.search_result_urls[row] for row in rows if row < len(self.search_result_urls)]
+        if not self.download_path:
+            self.download_path = os.path.expanduser('~/Downloads')
+            self.config.set_download_path(self.download_path)
+        self.batch_dialog = BatchDownloadDialog(self.download_manager, self.download_path, urls, self)
+        self.batch_dialog.batch_queued.connect(self.on_batch_queued)
+        self.batch_dialog.show()
+        
+    def on_batch_queued(self, item_ids):
+        self.batch_item_ids.extend(item_ids)
+        self.statusBar().showMessage(f"批量下载: 已加入 {len(item_ids)} 个文件")
+        self.update_progress()
+        
+    def update_progress(self, item_id=None):
+        """根据下载队列更新总体进度和统计信息"""
+        manager = self.download_manager
+        unfinished = [item for item in manager.items.values() if item.status in ("queued", "downloading")]
+        summary = f"下载中: {manager.active_count()}  排队: {manager.pending_count()}"
+        # 批量下载的汇总进度：全部结束后不再显示
+        batch = [manager.items[i] for i in self.batch_item_ids if i in manager.items]
+        if any(item.status in ("queued", "downloading", "paused") for item in batch):
+            completed = sum(1 for item in batch if item.status == "completed")
+            failed = sum(1 for item in batch if item.status == "failed")
+            summary += f"  批量: {completed}/{len(batch)} 完成" + (f", {failed} 失败" if failed else "")
         else:
-             # 如果传入的不是整数，记录一个警告或错误
-             self.logger.warning(f"收到非整数进度值: {value}")
-             # 或者设置一个默认值
-             # self.progress_bar.setValue(0)
-
-        # 更新下载信息
-        if self.download_start_time is None:
-            self.download_start_time = QDateTime.currentDateTime()
-        
-        # 计算已用时间
-        elapsed = QDateTime.currentDateTime().toMSecsSinceEpoch() - self.download_start_time.toMSecsSinceEpoch()
-        seconds = elapsed // 1000
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        seconds = seconds % 60
-        self.download_elapsed = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-        
-        # 更新显示
-        self.speed_label.setText(f"速度: {speed_info}")
-        self.time_label.setText(f"时间: {self.download_elapsed}")
-        
-    def download_finished(self, save_path):
-        # 隐藏状态指示器
-        if hasattr(self, 'status_overlay'):
-            self.status_overlay.hideMessage()
+            self.batch_item_ids = []
+        self.queue_summary_label.setText(summary)
+        if unfinished:
+            self.progress_bar.setValue(int(sum(item.progress for item in unfinished) / len(unfinished)))
         
-        self.progress_bar.setValue(100)
+    def download_finished(self, item_id, save_path):
+        self.last_download_path = save_path
         self.statusBar().showMessage(f"下载完成: {save_path}")
+        self._log_pool_stats()
+        url = self.download_manager.items[item_id].url
+        self._reset_download_buttons(url)
+        if self.auto_extract_check.isChecked():
+            self._get_pipeline().submit(save_path, url=url)
+        
+    def _get_pipeline(self):
+        if self.pipeline is None:
+            self.pipeline = PostDownloadPipeline(
+                default_stages(), max_workers=self.config.get_pipeline_workers(),
+                on_event=lambda context, stage, event, message:
+                    self.pipeline_event.emit(context["filename"], stage, event, message))
+        return self.pipeline
+        
+    def on_pipeline_event(self, filename, stage, event, message):
+        """显示后处理进度；校验失败时记录错误"""
+        if event == EVENT_DONE:
+            self.statusBar().showMessage(f"{filename}: {message}")
+        elif event == EVENT_SKIPPED:
+            self.statusBar().showMessage(f"{filename}: 跳过 {stage} - {message}")
+        elif event == EVENT_FAILED:
+            self.logger.error(f"后处理失败 [{stage}] {filename}: {message}")
+            self.statusBar().showMessage(f"{filename}: 处理失败 - {message}")
+        
+    def download_failed(self, item_id, message):
+        item = self.download_manager.items.get(item_id)
+        self.statusBar().showMessage(f"下载失败: {item.filename if item else ''} - {message}")
+        self.logger.error(message)
+        if item:
+            self._reset_download_buttons(item.url)
         
-        # 从下载信息布局中移除取消按钮
-        if hasattr(self, 'cancel_download_btn'):
-            layout = self.speed_label.parent().layout()
-            if layout:
-                layout.removeWidget(self.cancel_download_btn)
-                self.cancel_download_btn.hide()
-        
-        # 重置下载信息
-        self.download_start_time = None
-        self.download_speed = "0 KB/s"
-        self.download_size = "0 MB"
-        self.download_elapsed = "00:00:00"
-        self.speed_label.setText(f"速度: {self.download_speed}")
-        self.size_label.setText(f"大小: {self.download_size}")
-        self.time_label.setText(f"时间: {self.download_elapsed}")
+    def on_download_queue_idle(self):
+        """队列中的下载全部结束后提示一次，而不是每个文件都弹窗"""
+        self.progress_bar.setValue(100)
+        self.update_progress()
+        if not self.last_download_path:
+            return
+        save_path = self.last_download_path
+        self.last_download_path = None
         
         reply = QMessageBox.question(
             self, 
             "下载完成", 
-            f"文件已保存到: {save_path}\n是否打开文件所在文件夹?",
+            f"队列中的下载已全部完成，最后保存的文件: {save_path}\n是否打开文件所在文件夹?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         
         if reply == QMessageBox.StandardButton.Yes:
             # 打开文件所在文件夹
             QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.dirname(save_path)))
+        
+    def _reset_download_buttons(self, url):
+        """重新启用对应地址的下载按钮"""
+        if hasattr(self, 'download_buttons') and hasattr(self, 'trainer_versions'):
+            for btn, version in zip(self.download_buttons, self.trainer_versions):
+                if version["download_url"] == url:
+                    btn.setEnabled(True)
+                    btn.setText("下载")
+        
+    def verify_library(self):
+        """校验下载目录中的文件是否与下载时记录的SHA-256一致"""
+        if not self.download_path or not os.path.isdir(self.download_path):
+            QMessageBox.information(self, "提示", "下载目录不存在，请先选择下载路径")
+            return
+        self.verify_library_btn.setEnabled(False)
+        self.verify_thread = VerifyLibraryThread(self.download_path)
+        self.verify_thread.progress_signal.connect(
+            lambda done, total, name: self.statusBar().showMessage(f"正在校验 ({done}/{total}): {name}"))
+        self.verify_thread.result_signal.connect(self.show_verify_results)
+        self.verify_thread.error_signal.connect(self.show_error)
+        self.verify_thread.finished.connect(lambda: self.verify_library_btn.setEnabled(True))
+        self.verify_thread.start()
+        
+    def show_verify_results(self, results):
+        labels = {VERIFY_OK: "正常", VERIFY_MISMATCH: "不一致", VERIFY_MISSING: "文件缺失", VERIFY_UNTRACKED: "新记录"}
+        counts = {status: sum(1 for r in results if r["status"] == status) for status in labels}
+        summary = (f"共校验 {len(results)} 个文件: 正常 {counts[VERIFY_OK]}, 不一致 {counts[VERIFY_MISMATCH]}, "
+                   f"缺失 {counts[VERIFY_MISSING]}, 新记录 {counts[VERIFY_UNTRACKED]}")
+        self.statusBar().showMessage(summary)
+        
+        box = QMessageBox(self)
+        box.setWindowTitle("校验下载库")
+        box.setIcon(QMessageBox.Icon.Warning if counts[VERIFY_MISMATCH] or counts[VERIFY_MISSING]
+                    else QMessageBox.Icon.Information)
+        box.setText(summary)
+        box.setDetailedText("\n".join(f"[{labels[r['status']]}] {r['filename']}  {r['actual'] or r['expected'] or ''}"
+                                      for r in results))
+        box.exec()
+        
+    def update_catalog(self):
+        """在后台爬取网站文章列表更新本地目录，再次点击取消"""
+        if self.catalog_thread and self.catalog_thread.isRunning():
+            self.catalog_thread.cancel()
+            self.update_catalog_btn.setEnabled(False)
+            self.statusBar().showMessage("正在停止更新本地目录...")
+            return
+        # 目录为空时完整爬取，之后只增量同步新文章
+        self.catalog_thread = CatalogCrawlThread(full=get_trainer_catalog().count() == 0)
+        self.catalog_thread.progress_signal.connect(
+            lambda pages, found: self.statusBar().showMessage(f"正在更新本地目录: 已获取 {pages} 页, {found} 篇文章"))
+        self.catalog_thread.result_signal.connect(self.on_catalog_updated)
+        self.catalog_thread.error_signal.connect(self.show_error)
+        self.catalog_thread.finished.connect(self._reset_catalog_button)
+        self.update_catalog_btn.setText("停止更新")
+        self.catalog_thread.start()
+        
+    def on_catalog_updated(self, stats):
+        if not stats["inserted"] and not stats["updated"] and "mode" in stats:
+            self.statusBar().showMessage(f"本地目录已是最新 (共 {get_trainer_catalog().count()} 个修改器)")
+            return
+        state = "已取消" if stats.get("cancelled") else "完成"
+        self.statusBar().showMessage(
+            f"本地目录更新{state}: 新增 {stats['inserted']}, 更新 {stats['updated']}, "
+            f"共 {get_trainer_catalog().count()} 个修改器, 耗时 {stats['elapsed']:.1f} 秒")
+        
+    def _reset_catalog_button(self):
+        self.update_catalog_btn.setText("更新本地目录")
+        self.update_catalog_btn.setEnabled(True)
+        self.catalog_scheduler.start()
+        
+    def _update_watch_button(self):
+        watched = bool(self.current_trainer_url) and get_watch_list().contains(self.current_trainer_url)
+        self.watch_btn.setText("取消关注" if watched else "关注")
+        self.watch_btn.setEnabled(bool(self.current_trainer_url))
+        
+    def toggle_watch(self):
+        """关注或取消关注当前显示的修改器，关注时以当前的版本列表作为基准"""
+        url = self.current_trainer_url
+        if not url:
+            return
+        watchlist = get_watch_list()
+        if watchlist.contains(url):
+            watchlist.remove(url)
+            self.statusBar().showMessage(f"已取消关注: {self.current_trainer_title or url}")
+        else:
+            watchlist.add(url, RULE_LATEST_STANDALONE, self.current_trainer_title,
+                          getattr(self, 'trainer_versions', None), auto_download=self.watch_auto_download_check.isChecked())
+            self.watch_scheduler.start()
+            self.statusBar().showMessage(f"已关注: {self.current_trainer_title or url}，有新版本时会提醒")
+        self._update_watch_button()
+        
+    def set_watch_auto_download(self, enabled):
+        """保存为新关注的默认设置，当前修改器已关注时同时修改它的设置"""
+        self.config.set_watch_auto_download(enabled)
+        if self.current_trainer_url and get_watch_list().contains(self.current_trainer_url):
+            get_watch_list().set_auto_download(self.current_trainer_url, enabled)
             
-        # 重新启用所有下载按钮
-        if hasattr(self, 'download_buttons'):
-            for btn in self.download_buttons:
-                btn.setEnabled(True)
-                btn.setText("下载")
+    def open_watch_list(self):
+        WatchListDialog(get_watch_list(), self.watch_scheduler, self).exec()
+        self._update_watch_button()
+        
+    def on_watch_new_versions(self, entry, new_versions, versions):
+        """关注的修改器发布了新版本：提醒，开启自动下载时按规则加入下载队列"""
+        names = ", ".join(version["filename"] for version in new_versions)
+        self.logger.info(f"关注的修改器有新版本: {entry['title']}: {names}")
+        if entry["auto_download"] and self.download_path:
+            queued = 0
+            for version in select_versions(new_versions, entry["rule"]):
+                save_path = os.path.join(self.download_path, version_filename(version))
+                if not os.path.exists(save_path):
+                    self.download_manager.add(version["download_url"], save_path)
+                    queued += 1
+            self.statusBar().showMessage(f"{entry['title']} 有新版本，已自动加入下载队列 {queued} 个文件")
+        else:
+            self.statusBar().showMessage(f"{entry['title']} 有新版本: {names}")
+        # 更新预取缓存，正在查看这个修改器时刷新版本列表
+        self.prefetcher.put(entry["url"], versions)
+        if entry["url"] == self.current_trainer_url:
+            self.display_trainer_versions(versions)
+        
+    def on_warmup_finished(self, report):
+        failed = [host["host"] for host in report["hosts"] if host["error"]]
+        self.logger.info(f"网络预热完成: 预计为首次操作节省 {report['saved_ms']} 毫秒 "
+                         f"(浏览器启动 {report['browser_ms']} 毫秒), 明细: {report['hosts']}")
+        if failed:
+            self.statusBar().showMessage(f"网络预热未能连接: {', '.join(failed)}")
+        else:
+            self.statusBar().showMessage(f"网络预热完成，预计为首次操作节省 {report['saved_ms']} 毫秒")
+        
+    def update_rate_limits(self):
+        """保存限速设置并应用到正在进行的下载"""
+        global_kbps = self.global_limit_spin.value()
+        download_kbps = self.download_limit_spin.value()
+        self.config.set_global_rate_limit(global_kbps)
+        self.config.set_download_rate_limit(download_kbps)
+        get_bandwidth_limiter().set_limits(global_rate=global_kbps * 1024, transfer_rate=download_kbps * 1024)
         
     def select_download_path(self):
         folder = QFileDialog.getExistingDirectory(self, "选择下载文件夹", self.download_path)
@@ -1361,6 +1760,7 @@ class MainWindow(QMainWindow):
     def show_error(self, message):
         self.statusBar().showMessage(f"错误: {message}")
         self.logger.error(message)
+        self._log_pool_stats()
         QMessageBox.critical(self, "错误", message)
         
         # 重新启用所有下载按钮
@@ -1369,31 +1769,31 @@ class MainWindow(QMainWindow):
                 btn.setEnabled(True)
                 btn.setText("下载")
 
+    def _log_pool_stats(self):
+        """记录连接池复用情况，用于确认连接是否被复用"""
+        stats = get_http_pool().stats()
+        self.logger.debug(f"连接池统计: 复用 {stats['hits']} 次, 新建连接 {stats['misses']} 次, 明细: {stats['hosts']}")
+        # 各主机的熔断状态和重试次数，网络故障时可以看出时间花在了哪里
+        for host, host_stats in get_resilience_manager().stats().items():
+            self.logger.debug(f"主机 {host}: 状态 {host_stats['state']}, 请求 {host_stats['requests']} 次, "
+                              f"重试 {host_stats['retries']} 次 (等待 {host_stats['retry_wait']:.1f} 秒), "
+                              f"失败 {host_stats['failures']} 次, 熔断拒绝 {host_stats['short_circuited']} 次")
+
     def _sanitize_filename(self, filename):
         """清理文件名中的非法字符"""
         # Windows系统不允许文件名包含这些字符: \ / : * ? " < > |
         invalid_chars = r'[\\/:\*\?"<>\|]'
         return re.sub(invalid_chars, '_', filename)
 
-    def cancel_download(self):
-        """取消当前下载"""
-        if self.download_thread and self.download_thread.isRunning():
-            reply = QMessageBox.question(
-                self, 
-                "取消下载", 
-                "确定要取消当前下载吗?",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-            )
-            
-            if reply == QMessageBox.StandardButton.Yes:
-                self.statusBar().showMessage("正在取消下载...")
-                self.download_thread.cancel()
-                
-                # 从下载信息布局中移除取消按钮
-                if hasattr(self, 'cancel_download_btn'):
-                    layout = self.speed_label.parent().layout()
-                    if layout:
-                        layout.removeWidget(self.cancel_download_btn)
-                        self.cancel_download_btn.hide()
-                
-                self.statusBar().showMessage("下载已取消")
\ No newline at end of file
+    def closeEvent(self, event):
+        """退出时停止下载并保存队列，未完成的下载下次启动时继续"""
+        self.download_manager.shutdown()
+        self.prefetcher.shutdown()
+        if self.catalog_thread and self.catalog_thread.isRunning():
+            self.catalog_thread.cancel()
+        self.catalog_scheduler.stop()
+        self.watch_scheduler.stop()
+        if self.pipeline:
+            self.pipeline.shutdown()
+        get_browser_pool().shutdown()
+        super().closeEvent(event)
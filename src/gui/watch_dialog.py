@@ -0,0 +1,95 @@
+import time
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QCheckBox, QWidget)
+from PyQt6.QtCore import Qt
+
+
+def _format_time(timestamp):
+    if not timestamp:
+        return "-"
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+
+
+def _format_interval(seconds):
+    if seconds >= 24 * 3600:
+        return f"{seconds / (24 * 3600):.1f} 天"
+    if seconds >= 3600:
+        return f"{seconds / 3600:.1f} 小时"
+    return f"{seconds / 60:.0f} 分钟"
+
+
+class WatchListDialog(QDialog):
+    """关注列表：查看各修改器的检查情况，设置是否自动下载，取消关注或立即检查全部"""
+
+    COLUMNS = ["修改器", "版本数", "上次检查", "检查间隔", "下次检查", "自动下载"]
+
+    def __init__(self, watchlist, scheduler, parent=None):
+        super().__init__(parent)
+        self.watchlist = watchlist
+        self.scheduler = scheduler
+        self._urls = []
+
+        self.setWindowTitle("关注列表")
+        self.setMinimumSize(760, 400)
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for column in range(1, len(self.COLUMNS)):
+            self.table.horizontalHeader().setSectionResizeMode(column, QHeaderView.ResizeMode.ResizeToContents)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        layout.addWidget(self.table)
+
+        buttons_layout = QHBoxLayout()
+        check_btn = QPushButton("立即检查全部")
+        check_btn.clicked.connect(self.check_now)
+        remove_btn = QPushButton("取消关注选中")
+        remove_btn.clicked.connect(self.remove_selected)
+        refresh_btn = QPushButton("刷新")
+        refresh_btn.clicked.connect(self.refresh)
+        close_btn = QPushButton("关闭")
+        close_btn.clicked.connect(self.accept)
+        buttons_layout.addWidget(check_btn)
+        buttons_layout.addWidget(remove_btn)
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(refresh_btn)
+        buttons_layout.addWidget(close_btn)
+        layout.addLayout(buttons_layout)
+
+        self.refresh()
+
+    def refresh(self):
+        entries = self.watchlist.entries()
+        self._urls = [entry["url"] for entry in entries]
+        self.table.setRowCount(len(entries))
+        for row, entry in enumerate(entries):
+            title_item = QTableWidgetItem(entry["title"])
+            title_item.setToolTip(entry["url"])
+            self.table.setItem(row, 0, title_item)
+            self.table.setItem(row, 1, QTableWidgetItem(str(len(entry["versions"]))))
+            self.table.setItem(row, 2, QTableWidgetItem(_format_time(entry["last_checked"])))
+            self.table.setItem(row, 3, QTableWidgetItem(_format_interval(entry["interval"])))
+            self.table.setItem(row, 4, QTableWidgetItem(_format_time(entry["next_check"])))
+
+            checkbox = QCheckBox()
+            checkbox.setChecked(entry["auto_download"])
+            checkbox.toggled.connect(lambda checked, url=entry["url"]: self.watchlist.set_auto_download(url, checked))
+            container = QWidget()
+            container_layout = QHBoxLayout(container)
+            container_layout.setContentsMargins(0, 0, 0, 0)
+            container_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            container_layout.addWidget(checkbox)
+            self.table.setCellWidget(row, 5, container)
+
+    def remove_selected(self):
+        rows = sorted({index.row() for index in self.table.selectionModel().selectedRows()})
+        for row in rows:
+            if row < len(self._urls):
+                self.watchlist.remove(self._urls[row])
+        self.refresh()
+
+    def check_now(self):
+        self.scheduler.check_now()
+        self.refresh()
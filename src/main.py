@@ -1,6 +1,7 @@
 import os
 import sys
 import struct
+import multiprocessing
 
 # 将src目录添加到Python路径
 if getattr(sys, 'frozen', False):
@@ -110,4 +111,6 @@ def main():
     sys.exit(exit_code)
 
 if __name__ == "__main__":
+    # 下载后处理流水线使用子进程，打包后的程序需要先处理子进程的启动
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
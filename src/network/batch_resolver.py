@@ -0,0 +1,203 @@
+import csv
+import re
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from network.prefetcher import get_trainer_prefetcher
+from translator.translation_cache import get_translation_cache, normalize_name
+from translator.title_dictionary import get_title_dictionary
+from utils.dates import parse_date
+
+# 版本选择规则
+RULE_LATEST_STANDALONE = "latest_standalone"   # 最新的独立版本
+RULE_AUTO_UPDATE = "auto_update"               # 自动更新版本
+RULE_LATEST = "latest"                         # 最新的一个版本（不区分类型）
+RULE_ALL = "all"                               # 全部版本
+
+RULE_NAMES = {
+    RULE_LATEST_STANDALONE: "最新独立版本",
+    RULE_AUTO_UPDATE: "自动更新版本",
+    RULE_LATEST: "最新版本",
+    RULE_ALL: "全部版本",
+}
+
+def read_batch_file(path):
+    """
+    读取批量下载列表（文本或CSV文件）
+
+    每行一个游戏名或修改器页面URL，CSV文件的第二列可以指定该行的版本选择规则；
+    空行和以 # 开头的行会被忽略
+
+    Returns:
+        [{"query": 游戏名或URL, "rule": 规则或 None}, ...]
+    """
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if path.lower().endswith('.csv'):
+            rows = list(csv.reader(f))
+        else:
+            rows = [[line] for line in f]
+    return parse_batch_rows(rows)
+
+
+def parse_batch_text(text):
+    """解析粘贴到输入框中的列表，每行一个游戏名或URL"""
+    return parse_batch_rows([[line] for line in text.splitlines()])
+
+
+def parse_batch_rows(rows):
+    entries = []
+    for row in rows:
+        if not row or not row[0].strip() or row[0].strip().startswith('#'):
+            continue
+        rule = row[1].strip() if len(row) > 1 and row[1].strip() in RULE_NAMES else None
+        entries.append({"query": row[0].strip(), "rule": rule})
+    return entries
+
+
+def is_auto_update_version(version):
+    text = f"{version.get('filename', '')} {version.get('download_url', '')}".lower()
+    return 'autoupdate' in text or 'auto-updat' in text or 'auto updat' in text
+
+
+def english_search_name(name, scraper):
+    """
+    把游戏名转换为搜索用的英文名：英文名原样返回，中文名依次查询翻译缓存、
+    离线词典和在线翻译，都失败时返回 None
+    """
+    if not re.search(r'[\u4e00-\u9fff]', name):
+        return name
+    english = get_translation_cache().get(name)
+    if not english:
+        match = get_title_dictionary().lookup(name)
+        english = match[0] if match else scraper.get_english_game_name(name)
+    return english or None
+
+
+def _newest_first(versions):
+    """按日期从新到旧排序；无法解析日期时保持页面上的顺序（页面本身按从新到旧排列）"""
+    indexed = list(enumerate(versions))
+    indexed.sort(key=lambda item: (parse_date(item[1].get('date')) or datetime.min, -item[0]), reverse=True)
+    return [version for _, version in indexed]
+
+
+def select_versions(versions, rule):
+    """按规则从一个修改器页面的版本列表中选出需要下载的版本"""
+    if rule == RULE_ALL:
+        return list(versions)
+    if rule == RULE_AUTO_UPDATE:
+        return [version for version in versions if is_auto_update_version(version)][:1]
+    if rule == RULE_LATEST:
+        return _newest_first(versions)[:1]
+    standalone = [version for version in versions if not is_auto_update_version(version)]
+    return _newest_first(standalone)[:1]
+
+
+def version_filename(version):
+    """生成保存用的文件名：补全扩展名并替换Windows不允许的字符"""
+    filename = version.get('filename') or 'trainer'
+    file_type = version.get('file_type')
+    if file_type and not filename.lower().endswith(f".{file_type}"):
+        filename = f"{filename}.{file_type}"
+    elif not file_type and not filename.lower().endswith(('.exe', '.zip', '.rar', '.7z')):
+        filename += '.exe' if version.get('download_url', '').lower().endswith('.exe') else '.zip'
+    return re.sub(r'[\\/:\*\?"<>\|]', '_', filename)
+
+
+class BatchResolver:
+    """
+    批量下载的解析阶段：把游戏名或修改器页面URL解析为需要下载的版本
+
+    游戏名先翻译（本地翻译缓存/离线词典优先），再搜索并选出最匹配的结果；
+    修改器页面通过预取器抓取解析（共用版本缓存）。多个条目在线程池中并行解析
+    """
+
+    def __init__(self, scraper=None, max_workers=4, prefetcher=None):
+        self.prefetcher = prefetcher or get_trainer_prefetcher()
+        self.scraper = scraper or self.prefetcher.scraper
+        self.max_workers = max_workers
+
+    def resolve(self, entries, default_rule=RULE_LATEST_STANDALONE, progress_callback=None, cancel_event=None):
+        """
+        并行解析所有条目
+
+        Args:
+            entries: read_batch_file/parse_batch_text 返回的条目列表
+            progress_callback: 每解析完一个条目调用一次 callback(已完成数, 总数, 结果)
+
+        Returns:
+            与 entries 顺序相同的结果列表，每项包含
+            query/title/page_url/versions（已按规则选出）/error
+        """
+        cancel_event = cancel_event or threading.Event()
+        results = [None] * len(entries)
+        done = 0
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {executor.submit(self._resolve_entry, entry, default_rule, cancel_event): index
+                       for index, entry in enumerate(entries)}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    results[index] = self._result(entries[index], error=str(e))
+                done += 1
+                if progress_callback:
+                    progress_callback(done, len(entries), results[index])
+                if cancel_event.is_set():
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return [result or self._result(entries[i], error="已取消") for i, result in enumerate(results)]
+
+    def _resolve_entry(self, entry, default_rule, cancel_event):
+        if cancel_event.is_set():
+            return self._result(entry, error="已取消")
+        query = entry["query"]
+        rule = entry.get("rule") or default_rule
+
+        if query.startswith(('http://', 'https://')):
+            title, page_url = query, query
+        else:
+            title, page_url = self._find_trainer_page(query)
+            if not page_url:
+                return self._result(entry, title=title, error="没有找到对应的修改器")
+
+        if cancel_event.is_set():
+            return self._result(entry, title=title, page_url=page_url, error="已取消")
+        versions = self.prefetcher.get_versions(page_url)
+        if not versions:
+            return self._result(entry, title=title, page_url=page_url, error="修改器页面没有可下载的版本")
+        selected = select_versions(versions, rule)
+        if not selected:
+            return self._result(entry, title=title, page_url=page_url,
+                                error=f"没有符合规则“{RULE_NAMES.get(rule, rule)}”的版本")
+        return self._result(entry, title=title, page_url=page_url, versions=selected)
+
+    def _find_trainer_page(self, name):
+        """搜索游戏名，返回 (标题, 修改器页面URL)；中文名先翻译为英文"""
+        search_name = english_search_name(name, self.scraper)
+        if not search_name:
+            return name, None
+
+        # 只需要最匹配的结果：本地目录优先，在线搜索只取第一页
+        results = self.scraper.search_game_pages(search_name, max_pages=1)
+        if not results:
+            return search_name, None
+        # 标题与搜索词一致的结果优先，否则使用第一个结果
+        wanted = normalize_name(search_name)
+        for result in results:
+            if normalize_name(re.sub(r'\s*trainer\s*$', '', result["title"], flags=re.I)) == wanted:
+                return result["title"], result["url"]
+        return results[0]["title"], results[0]["url"]
+
+    def _result(self, entry, title=None, page_url=None, versions=None, error=None):
+        return {
+            "query": entry["query"],
+            "title": title or entry["query"],
+            "page_url": page_url,
+            "versions": versions or [],
+            "error": error,
+        }
+
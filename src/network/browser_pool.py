@@ -0,0 +1,259 @@
+import asyncio
+import os
+import sys
+import threading
+
+from utils.config import Config
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36"
+# 抓取修改器页面时屏蔽图片和样式以加快加载速度
+BLOCKED_RESOURCES = '**/*.{png,jpg,jpeg,gif,css}'
+
+
+def _import_playwright():
+    """导入 playwright 异步接口，打包环境中先补全 sys.path"""
+    try:
+        from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+        return async_playwright, PlaywrightTimeoutError
+    except ImportError as e:
+        print(f"无法导入 playwright: {e}")
+        if not getattr(sys, 'frozen', False):
+            raise
+
+    # 如果在打包环境中，尝试从其他位置导入
+    print("正在打包环境中尝试导入 playwright...")
+    base_dir = getattr(sys, '_MEIPASS', os.path.dirname(sys.executable))
+    possible_paths = [
+        os.path.join(base_dir, "site-packages"),
+        os.path.join(base_dir, "Lib", "site-packages"),
+        base_dir,
+        os.path.dirname(sys.executable)
+    ]
+    for path in possible_paths:
+        if path not in sys.path and os.path.exists(path):
+            sys.path.append(path)
+            print(f"添加路径到 sys.path: {path}")
+
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+    print("成功从打包环境导入 playwright")
+    return async_playwright, PlaywrightTimeoutError
+
+
+class BrowserPool:
+    """
+    常驻的无头浏览器池
+
+    Chromium 只启动一次，由一个专用工作线程（运行 asyncio 事件循环）持有，
+    并维护最多 size 个预热的浏览器上下文/页面，多个线程的页面抓取可以并发进行。
+    每个上下文使用 max_uses 次、或页面JS堆内存超过 max_heap_mb 后会被回收重建，
+    浏览器意外退出时自动重新启动
+    """
+
+    def __init__(self, size=2, max_uses=20, max_heap_mb=256, headless=True):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_heap_bytes = max_heap_mb * 1024 * 1024
+        self.headless = headless
+        self.stats = {"launches": 0, "fetches": 0, "recycled": 0}
+
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._start_lock = threading.Lock()
+        self._start_error = None
+        self._playwright = None
+        self._browser = None
+        self._idle = None
+        self._semaphore = None
+        self._timeout_error = None
+
+    def start(self, wait=True):
+        """启动浏览器工作线程；wait 为 True 时等待浏览器启动完成"""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._ready.clear()
+                self._start_error = None
+                self._thread = threading.Thread(target=self._run, name="BrowserPool", daemon=True)
+                self._thread.start()
+        if wait:
+            self._ready.wait()
+            if self._start_error:
+                raise self._start_error
+
+    def prelaunch(self):
+        """在后台预先启动浏览器，不阻塞调用方"""
+        self.start(wait=False)
+
+    def is_running(self):
+        return (self._thread is not None and self._thread.is_alive()
+                and self._ready.is_set() and self._start_error is None)
+
+    def fetch(self, url, wait_selector=None, wait_timeout=5000, nav_timeout=15000,
+              block_resources=True, extract_selector=None, timeout=60):
+        """
+        使用池中的页面打开URL并获取内容（可在任意线程调用）
+
+        Args:
+            wait_selector: 导航完成后等待出现的CSS选择器
+            extract_selector: 需要提取文本的CSS选择器
+            timeout: 整个抓取的最长等待秒数
+
+        Returns:
+            包含 html/status/headers/text/timed_out 的字典，
+            timed_out 表示等待 wait_selector 超时
+        """
+        self.start(wait=True)
+        future = asyncio.run_coroutine_threadsafe(
+            self._fetch(url, wait_selector, wait_timeout, nav_timeout, block_resources, extract_selector),
+            self._loop)
+        return future.result(timeout)
+
+    def shutdown(self):
+        """关闭浏览器并停止工作线程"""
+        loop = self._loop
+        if loop and self._thread and self._thread.is_alive():
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(5)
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._launch())
+        except Exception as e:
+            print(f"启动浏览器池失败: {e}")
+            self._start_error = e
+            self._ready.set()
+            loop.close()
+            return
+
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                loop.run_until_complete(self._close())
+            except Exception as e:
+                print(f"关闭浏览器池时出错: {e}")
+            loop.close()
+
+    async def _launch(self):
+        async_playwright, self._timeout_error = _import_playwright()
+        self._playwright = await async_playwright().start()
+        self._idle = asyncio.Queue()
+        self._semaphore = asyncio.Semaphore(self.size)
+        await self._launch_browser()
+
+    async def _launch_browser(self):
+        self._browser = await self._playwright.chromium.launch(headless=self.headless)
+        self.stats["launches"] += 1
+        print("浏览器池: Chromium 已启动")
+
+    async def _close(self):
+        if self._browser:
+            await self._browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+
+    async def _acquire(self):
+        await self._semaphore.acquire()
+        try:
+            if not self._browser.is_connected():
+                print("浏览器池: 浏览器已断开，重新启动")
+                # 旧浏览器的上下文已全部失效
+                while not self._idle.empty():
+                    self._idle.get_nowait()
+                await self._launch_browser()
+            if not self._idle.empty():
+                return self._idle.get_nowait()
+            context = await self._browser.new_context(user_agent=USER_AGENT)
+            page = await context.new_page()
+            return {"context": context, "page": page, "uses": 0}
+        except Exception:
+            self._semaphore.release()
+            raise
+
+    async def _release(self, slot, broken):
+        try:
+            slot["uses"] += 1
+            if broken or slot["uses"] >= self.max_uses or await self._heap_exceeded(slot["page"]):
+                self.stats["recycled"] += 1
+                try:
+                    await slot["context"].close()
+                except Exception:
+                    pass
+            else:
+                self._idle.put_nowait(slot)
+        finally:
+            self._semaphore.release()
+
+    async def _heap_exceeded(self, page):
+        try:
+            used = await page.evaluate("() => performance.memory ? performance.memory.usedJSHeapSize : 0")
+        except Exception:
+            return True
+        return used > self.max_heap_bytes
+
+    async def _fetch(self, url, wait_selector, wait_timeout, nav_timeout, block_resources, extract_selector):
+        slot = await self._acquire()
+        page = slot["page"]
+        broken = False
+
+        async def abort(route):
+            await route.abort()
+
+        try:
+            if block_resources:
+                await page.route(BLOCKED_RESOURCES, abort)
+
+            response = await page.goto(url, timeout=nav_timeout)
+
+            timed_out = False
+            if wait_selector:
+                try:
+                    await page.wait_for_selector(wait_selector, timeout=wait_timeout)
+                except self._timeout_error:
+                    timed_out = True
+
+            text = None
+            if extract_selector and not timed_out:
+                element = await page.query_selector(extract_selector)
+                if element:
+                    text = ((await element.text_content()) or "").strip()
+
+            html = await page.content()
+            self.stats["fetches"] += 1
+            return {
+                "html": html,
+                "status": response.status if response else None,
+                "headers": response.headers if response else {},
+                "text": text,
+                "timed_out": timed_out,
+            }
+        except Exception:
+            broken = True
+            raise
+        finally:
+            if block_resources and not broken:
+                try:
+                    await page.unroute(BLOCKED_RESOURCES, abort)
+                except Exception:
+                    broken = True
+            await self._release(slot, broken)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """获取进程级共享的浏览器池，首次调用时按配置创建（不会立即启动浏览器）"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            config = Config()
+            _pool = BrowserPool(size=config.get_browser_pool_size(),
+                                max_uses=config.get_browser_max_uses(),
+                                max_heap_mb=config.get_browser_max_heap_mb())
+        return _pool
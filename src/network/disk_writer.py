@@ -0,0 +1,120 @@
+import errno
+import os
+import time
+
+# 写入磁盘的同步策略
+FSYNC_NONE = "none"               # 不主动同步，由操作系统决定何时写盘（最快）
+FSYNC_ON_COMPLETE = "on_complete" # 下载完成、重命名之前同步一次（默认）
+FSYNC_PERIODIC = "periodic"       # 每次保存续传状态前都同步，断电后续传位置也可靠（最慢）
+
+FSYNC_POLICIES = {
+    FSYNC_NONE: "不同步",
+    FSYNC_ON_COMPLETE: "完成时同步",
+    FSYNC_PERIODIC: "定期同步",
+}
+
+MIN_CHUNK = 64 * 1024
+MAX_CHUNK = 4 * 1024 * 1024
+
+
+class ChunkSizer:
+    """
+    根据吞吐量自动调整每次读取的块大小
+
+    每次读取的目标耗时约为 target_seconds：网速快时使用大块，减少Python循环的次数
+    （千兆网络下每秒只需循环几十次）；网速慢时使用小块，保证进度和取消足够及时。
+    限速时读取本身很快，块大小还不能超过限速下约 0.1 秒的数据量，否则每块之后都要长时间休眠
+    """
+
+    def __init__(self, initial=256 * 1024, minimum=MIN_CHUNK, maximum=MAX_CHUNK, target_seconds=0.05,
+                 bucket=None):
+        self.size = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+        self.bucket = bucket
+
+    def next_size(self):
+        """下一次读取的块大小（按当前限速封顶，限速可能在下载过程中修改）"""
+        rate = self.bucket.rate if self.bucket is not None else 0
+        if rate > 0:
+            return max(self.minimum, min(self.size, int(rate * 0.1)))
+        return self.size
+
+    def update(self, nbytes, elapsed):
+        if nbytes >= self.next_size() and elapsed < self.target_seconds / 2:
+            self.size = min(self.size * 2, self.maximum)
+        elif elapsed > self.target_seconds * 2:
+            self.size = max(self.size // 2, self.minimum)
+
+
+def open_part_file(path):
+    """以无缓冲方式打开.part文件：写入的大块数据直接交给操作系统，不再经过一次缓冲区拷贝"""
+    mode = 'r+b' if os.path.exists(path) else 'w+b'
+    return open(path, mode, buffering=0)
+
+
+def preallocate(file, size):
+    """
+    为文件预先分配磁盘空间：支持 posix_fallocate 的系统上真正分配数据块
+    （减少碎片，磁盘空间不足时立即报错），否则只设置文件长度
+    """
+    if not size:
+        return
+    if hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(file.fileno(), 0, size)
+            return
+        except OSError as e:
+            # 部分文件系统不支持，退回到设置文件长度
+            if e.errno not in (errno.EOPNOTSUPP, errno.EINVAL):
+                raise
+    if os.fstat(file.fileno()).st_size != size:
+        file.truncate(size)
+
+
+def sync_file(file):
+    file.flush()
+    os.fsync(file.fileno())
+
+
+def copy_to_file(response, file, sizer, buffer, limit=None, on_chunk=None, should_stop=None, hasher=None):
+    """
+    将响应体直接读入可复用的缓冲区并写入文件当前位置
+
+    Args:
+        buffer: 预先分配的 bytearray，大小不小于 sizer.maximum
+        limit: 最多写入的字节数（分段下载时为分段长度）
+        on_chunk: 每写入一块调用 on_chunk(字节数)
+        should_stop: 返回 True 时停止复制
+        hasher: 可选的 hashlib 对象，数据写入的同时计算摘要，不需要再读一遍文件
+
+    Returns:
+        写入的字节数
+    """
+    raw = response.raw
+    # 请求时已要求不压缩；服务器仍然压缩时由 urllib3 解压，保证写入的是文件原始内容
+    raw.decode_content = True
+    view = memoryview(buffer)
+    written = 0
+    while limit is None or written < limit:
+        if should_stop and should_stop():
+            break
+        size = sizer.next_size()
+        want = size if limit is None else min(size, limit - written)
+        started = time.monotonic()
+        count = raw.readinto(view[:want])
+        if not count:
+            break
+        chunk = view[:count]
+        while chunk:
+            # 无缓冲文件可能只写入一部分
+            done = file.write(chunk)
+            chunk = chunk[done:]
+        if hasher is not None:
+            hasher.update(view[:count])
+        sizer.update(count, time.monotonic() - started)
+        written += count
+        if on_chunk:
+            on_chunk(count)
+    return written
@@ -0,0 +1,146 @@
+import json
+import os
+
+from network.disk_writer import preallocate
+
+
+class PartialDownload:
+    """
+    未完成下载的磁盘状态
+
+    下载数据先写入 <保存路径>.part，旁边的 <保存路径>.part.json 记录下载地址、
+    ETag/Last-Modified 以及已完成的字节区间，下载中断后可以据此续传
+    """
+    PART_SUFFIX = '.part'
+    STATE_SUFFIX = '.part.json'
+
+    def __init__(self, save_path):
+        self.save_path = save_path
+        self.part_path = save_path + self.PART_SUFFIX
+        self.state_path = save_path + self.STATE_SUFFIX
+        self.url = None
+        self.etag = None
+        self.last_modified = None
+        self.total_size = 0
+        self.completed = []  # 已完成的 [起始, 结束] 区间，结束位置包含在内
+
+    def load(self):
+        """读取旁路状态文件，状态文件或.part文件缺失、损坏时返回 False"""
+        if not (os.path.exists(self.state_path) and os.path.exists(self.part_path)):
+            return False
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"读取下载状态失败: {e}")
+            return False
+
+        self.url = state.get('url')
+        self.etag = state.get('etag')
+        self.last_modified = state.get('last_modified')
+        self.total_size = state.get('total_size', 0)
+        self.completed = [tuple(r) for r in state.get('completed', [])]
+        return True
+
+    def save(self):
+        """保存状态，先写临时文件再替换，避免退出时留下半个JSON"""
+        state = {
+            'url': self.url,
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'total_size': self.total_size,
+            'completed': [list(r) for r in self.completed],
+        }
+        tmp_path = self.state_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"保存下载状态失败: {e}")
+
+    def can_resume(self, url, total_size, etag, last_modified):
+        """检查已保存的部分数据是否仍对应服务器上的同一个文件"""
+        if self.url != url or not self.completed:
+            return False
+        if not total_size or self.total_size != total_size:
+            return False
+        # 有校验信息时必须一致；服务器两者都没有提供时只能依赖文件大小
+        if self.etag or etag:
+            return self.etag == etag
+        if self.last_modified or last_modified:
+            return self.last_modified == last_modified
+        return True
+
+    def reset(self, url, total_size, etag, last_modified):
+        """开始一次全新的下载，清空已完成区间并创建（预分配）.part文件"""
+        self.url = url
+        self.total_size = total_size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.completed = []
+        with open(self.part_path, 'wb') as f:
+            preallocate(f, total_size)
+        self.save()
+
+    def add_range(self, start, end):
+        """记录一个已完成区间，并与相邻或重叠的区间合并"""
+        if end < start:
+            return
+        ranges = sorted(self.completed + [(start, end)])
+        merged = [ranges[0]]
+        for s, e in ranges[1:]:
+            last_s, last_e = merged[-1]
+            if s <= last_e + 1:
+                merged[-1] = (last_s, max(last_e, e))
+            else:
+                merged.append((s, e))
+        self.completed = merged
+
+    def completed_bytes(self):
+        return sum(e - s + 1 for s, e in self.completed)
+
+    def missing_ranges(self):
+        """返回尚未下载的区间列表"""
+        missing = []
+        position = 0
+        for s, e in sorted(self.completed):
+            if s > position:
+                missing.append((position, s - 1))
+            position = max(position, e + 1)
+        if position < self.total_size:
+            missing.append((position, self.total_size - 1))
+        return missing
+
+    def finalize(self, sync=False):
+        """
+        下载完成：将.part文件重命名为最终文件并删除状态文件。
+        sync 为 True 时先把数据同步到磁盘再重命名，避免断电后留下内容不完整的最终文件
+        """
+        if sync:
+            with open(self.part_path, 'rb+') as f:
+                os.fsync(f.fileno())
+        os.replace(self.part_path, self.save_path)
+        if sync and hasattr(os, 'O_DIRECTORY'):
+            # 同步目录项，保证重命名本身也已落盘
+            try:
+                dir_fd = os.open(os.path.dirname(os.path.abspath(self.save_path)), os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            except OSError:
+                pass
+        self._remove(self.state_path)
+
+    def discard(self):
+        """删除部分下载的数据和状态"""
+        self._remove(self.part_path)
+        self._remove(self.state_path)
+
+    def _remove(self, path):
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            print(f"删除文件失败 {path}: {e}")
@@ -0,0 +1,75 @@
+import json
+import os
+import threading
+import time
+
+from utils.config import get_data_dir
+
+TIER_STATIC = "static"     # 普通HTTP请求即可拿到完整内容
+TIER_BROWSER = "browser"   # 需要无头浏览器渲染
+
+
+class FetchTierStore:
+    """
+    记录每个修改器页面需要哪一级抓取方式
+
+    先用普通HTTP请求抓取，内容不完整时才升级到浏览器渲染；
+    结果按URL保存到磁盘，之后再抓取同一页面时直接使用对应的方式
+    """
+
+    def __init__(self, path, max_entries=5000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._tiers = self._load()
+
+    def get(self, url):
+        """返回记录的抓取方式，没有记录时返回 None"""
+        with self._lock:
+            entry = self._tiers.get(url)
+            return entry["tier"] if entry else None
+
+    def record(self, url, tier):
+        with self._lock:
+            entry = self._tiers.get(url)
+            if entry and entry["tier"] == tier:
+                return
+            self._tiers[url] = {"tier": tier, "updated_at": time.time()}
+            if len(self._tiers) > self.max_entries:
+                # 丢弃最早的记录
+                oldest = sorted(self._tiers, key=lambda u: self._tiers[u]["updated_at"])
+                for old_url in oldest[:len(self._tiers) - self.max_entries]:
+                    del self._tiers[old_url]
+            self._save()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"读取抓取方式记录失败: {e}")
+            return {}
+
+    def _save(self):
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._tiers, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"保存抓取方式记录失败: {e}")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_fetch_tier_store():
+    """获取进程级共享的抓取方式记录"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FetchTierStore(os.path.join(get_data_dir(), 'fetch_tiers.json'))
+        return _store
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from utils.config import Config, get_data_dir
+
+
+class HttpCache:
+    """
+    磁盘HTTP页面缓存，以URL为键
+
+    保存页面内容以及 ETag/Last-Modified。在有效期(TTL)内直接返回缓存，
+    过期后由调用方带 If-None-Match/If-Modified-Since 重新验证，服务器返回
+    304 时继续使用磁盘上的内容。总大小超过上限时按最近最少使用(LRU)淘汰
+    """
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, cache_dir, ttl=600, max_bytes=50 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    def lookup(self, url):
+        """
+        查找缓存
+
+        Returns:
+            包含 body/etag/last_modified/fresh 的字典，没有缓存时返回 None
+        """
+        key = self._key(url)
+        with self._lock:
+            entry = self._index.get(key)
+            if not entry:
+                return None
+            try:
+                with open(os.path.join(self.cache_dir, entry['file']), 'r', encoding='utf-8') as f:
+                    body = f.read()
+            except OSError:
+                # 内容文件丢失，丢弃这条索引
+                self._index.pop(key, None)
+                self._save_index()
+                return None
+            entry['last_access'] = time.time()
+            return {
+                'body': body,
+                'etag': entry.get('etag'),
+                'last_modified': entry.get('last_modified'),
+                'fresh': time.time() - entry['stored_at'] < self.ttl,
+            }
+
+    def conditional_headers(self, cached):
+        """根据缓存的校验信息生成条件请求头"""
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+
+    def store(self, url, body, etag=None, last_modified=None):
+        key = self._key(url)
+        filename = key + '.html'
+        data = body.encode('utf-8')
+        with self._lock:
+            try:
+                with open(os.path.join(self.cache_dir, filename), 'wb') as f:
+                    f.write(data)
+            except OSError as e:
+                print(f"写入页面缓存失败: {e}")
+                return
+            now = time.time()
+            self._index[key] = {
+                'url': url,
+                'file': filename,
+                'etag': etag,
+                'last_modified': last_modified,
+                'size': len(data),
+                'stored_at': now,
+                'last_access': now,
+            }
+            self._evict()
+            self._save_index()
+
+    def refresh(self, url):
+        """服务器返回304，重新开始计算有效期"""
+        key = self._key(url)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry:
+                entry['stored_at'] = time.time()
+                self._save_index()
+
+    def clear(self):
+        with self._lock:
+            for entry in self._index.values():
+                self._remove_file(entry['file'])
+            self._index = {}
+            self._save_index()
+
+    def _evict(self):
+        total = sum(entry['size'] for entry in self._index.values())
+        if total <= self.max_bytes:
+            return
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            self._remove_file(entry['file'])
+            total -= entry['size']
+            del self._index[key]
+
+    def _key(self, url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _remove_file(self, filename):
+        try:
+            os.remove(os.path.join(self.cache_dir, filename))
+        except OSError:
+            pass
+
+    def _load_index(self):
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"读取页面缓存索引失败: {e}")
+            return {}
+
+    def _save_index(self):
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        tmp_path = path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"保存页面缓存索引失败: {e}")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_http_cache():
+    """获取进程级共享的页面缓存，首次调用时按配置创建"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            config = Config()
+            _cache = HttpCache(os.path.join(get_data_dir(), 'http_cache'),
+                               ttl=config.get_http_cache_ttl(),
+                               max_bytes=config.get_http_cache_max_mb() * 1024 * 1024)
+        return _cache
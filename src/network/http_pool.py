@@ -0,0 +1,117 @@
+import threading
+import urllib.parse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from network.resilience import get_resilience_manager, IDEMPOTENT_METHODS
+from utils.config import Config
+
+
+class HttpPool:
+    """
+    进程级共享的HTTP连接池
+
+    每个主机持有一个 keep-alive 的 requests.Session，所有线程共用，
+    这样搜索、页面抓取和下载可以复用已经建立的 TCP/TLS 连接，
+    不必每次都重新进行 DNS 解析和握手。所有请求都经过共享的重试与熔断策略
+    """
+
+    def __init__(self, pool_connections=4, pool_maxsize=16):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self.resilience = get_resilience_manager()
+
+    def session_for(self, url):
+        """获取URL所属主机的共享会话，不存在时创建"""
+        host = self._host_key(url)
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create_session()
+                self._sessions[host] = session
+            return session
+
+    def request(self, method, url, **kwargs):
+        """发出请求；幂等请求失败时按退避策略重试，主机熔断时直接抛出 CircuitOpenError"""
+        session = self.session_for(url)
+        return self.resilience.call(url, lambda: session.request(method, url, **kwargs),
+                                    idempotent=method.upper() in IDEMPOTENT_METHODS)
+
+    def get(self, url, **kwargs):
+        kwargs.setdefault('allow_redirects', True)
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault('allow_redirects', False)
+        return self.request('HEAD', url, **kwargs)
+
+    def stats(self):
+        """
+        统计连接复用情况
+
+        Returns:
+            字典，hits 为复用已有连接的请求数，misses 为新建连接数，
+            hosts 为每个主机的明细
+        """
+        with self._lock:
+            sessions = dict(self._sessions)
+
+        hosts = {}
+        for host, session in sessions.items():
+            requests_count = 0
+            connections = 0
+            for adapter in session.adapters.values():
+                pools = adapter.poolmanager.pools
+                for key in pools.keys():
+                    pool = pools.get(key)
+                    if pool is None:
+                        continue
+                    requests_count += pool.num_requests
+                    connections += pool.num_connections
+            hosts[host] = {
+                "hits": max(requests_count - connections, 0),
+                "misses": connections,
+            }
+
+        return {
+            "hits": sum(h["hits"] for h in hosts.values()),
+            "misses": sum(h["misses"] for h in hosts.values()),
+            "hosts": hosts,
+        }
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                              pool_maxsize=self.pool_maxsize)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _host_key(self, url):
+        parsed = urllib.parse.urlsplit(url)
+        return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_http_pool():
+    """获取进程级共享连接池，首次调用时按配置创建"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            config = Config()
+            _pool = HttpPool(pool_connections=config.get_http_pool_connections(),
+                             pool_maxsize=config.get_http_pool_maxsize())
+        return _pool
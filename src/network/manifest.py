@@ -0,0 +1,204 @@
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+MANIFEST_NAME = 'flyying_manifest.json'
+HASH_BLOCK = 8 * 1024 * 1024
+
+# 校验结果
+VERIFY_OK = "ok"                # 内容与清单一致
+VERIFY_MISMATCH = "mismatch"    # 大小或SHA-256不一致（文件损坏或被修改）
+VERIFY_MISSING = "missing"      # 清单中有记录但文件不存在
+VERIFY_UNTRACKED = "untracked"  # 文件存在但清单中没有记录（已补充记录）
+
+_dir_locks = {}
+_dir_locks_lock = threading.Lock()
+
+
+def _lock_for(directory):
+    with _dir_locks_lock:
+        return _dir_locks.setdefault(os.path.abspath(directory), threading.Lock())
+
+
+def hash_file(path, length=None, hasher=None):
+    """
+    用内存映射读取文件计算SHA-256（大块更新时 hashlib 会释放GIL，多个文件可以并行计算）
+
+    Args:
+        length: 只计算前 length 个字节（用于续传时补上已下载部分的摘要）
+        hasher: 继续更新已有的 hashlib 对象，不指定时新建
+
+    Returns:
+        hashlib 对象
+    """
+    hasher = hasher or hashlib.sha256()
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        length = size if length is None else min(length, size)
+        if length == 0:
+            return hasher
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for offset in range(0, length, HASH_BLOCK):
+                    hasher.update(view[offset:min(offset + HASH_BLOCK, length)])
+            finally:
+                view.release()
+    return hasher
+
+
+class HashManifest:
+    """
+    下载目录中的校验清单（flyying_manifest.json）
+
+    以文件名为键记录每个下载文件的SHA-256、大小、下载地址和 ETag，
+    用于确认文件完整、判断是否与已有的副本相同，以及之后重新校验整个下载库
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, MANIFEST_NAME)
+
+    def record(self, file_path, sha256, size, url=None, etag=None, last_modified=None):
+        entry = {
+            "sha256": sha256,
+            "size": size,
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "recorded_at": time.time(),
+        }
+        # 多个下载可能同时写同一个清单，加锁并在写入前重新读取
+        with _lock_for(self.directory):
+            entries = self._load()
+            entries[os.path.basename(file_path)] = entry
+            self._save(entries)
+
+    def record_extracted(self, archive_path, folder, files):
+        """记录压缩包解压出的文件（相对路径、大小和SHA-256）"""
+        with _lock_for(self.directory):
+            entries = self._load()
+            entry = entries.setdefault(os.path.basename(archive_path), {})
+            entry["extracted"] = {
+                "folder": os.path.relpath(folder, self.directory),
+                "files": files,
+                "extracted_at": time.time(),
+            }
+            self._save(entries)
+
+    def touch(self, file_path):
+        """更新记录时间（确认服务器上的文件没有变化时调用）"""
+        with _lock_for(self.directory):
+            entries = self._load()
+            entry = entries.get(os.path.basename(file_path))
+            if entry is not None:
+                entry["recorded_at"] = time.time()
+                self._save(entries)
+
+    def get(self, file_path):
+        return self._load().get(os.path.basename(file_path))
+
+    def find_by_hash(self, sha256):
+        """查找内容相同的已下载文件名"""
+        return [name for name, entry in self._load().items() if entry.get("sha256") == sha256]
+
+    def find_by_url(self, url):
+        """查找从该地址下载的文件名，没有时返回 None"""
+        for name, entry in self._load().items():
+            if entry.get("url") == url:
+                return name
+        return None
+
+    def remove(self, file_path):
+        with _lock_for(self.directory):
+            entries = self._load()
+            if entries.pop(os.path.basename(file_path), None) is not None:
+                self._save(entries)
+
+    def entries(self):
+        return self._load()
+
+    def verify(self, max_workers=4, progress_callback=None, cancel_event=None, include_untracked=True):
+        """
+        并行重新计算目录中文件的SHA-256并与清单比对
+
+        Args:
+            include_untracked: 是否同时为清单中没有记录的修改器文件补充记录
+            progress_callback: 每校验完一个文件调用 callback(已完成数, 总数, 结果)
+
+        Returns:
+            结果列表，每项包含 filename/status/expected/actual/size
+        """
+        entries = self._load()
+        names = list(entries)
+        if include_untracked:
+            for name in sorted(os.listdir(self.directory)):
+                path = os.path.join(self.directory, name)
+                if (name not in entries and os.path.isfile(path)
+                        and name.lower().endswith(('.exe', '.zip', '.rar', '.7z'))):
+                    names.append(name)
+
+        results = []
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {executor.submit(self._verify_one, name, entries.get(name)): name for name in names}
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if progress_callback:
+                    progress_callback(len(results), len(names), result)
+                if cancel_event and cancel_event.is_set():
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        untracked = [r for r in results if r["status"] == VERIFY_UNTRACKED]
+        if untracked:
+            with _lock_for(self.directory):
+                current = self._load()
+                for result in untracked:
+                    entry = current.setdefault(result["filename"], {
+                        "url": None, "etag": None, "last_modified": None, "recorded_at": time.time()})
+                    entry.update({"sha256": result["actual"], "size": result["size"]})
+                self._save(current)
+        return sorted(results, key=lambda r: r["filename"])
+
+    def _verify_one(self, name, entry):
+        path = os.path.join(self.directory, name)
+        result = {"filename": name, "expected": entry.get("sha256") if entry else None,
+                  "actual": None, "size": None}
+        if not os.path.isfile(path):
+            result["status"] = VERIFY_MISSING
+            return result
+        result["size"] = os.path.getsize(path)
+        result["actual"] = hash_file(path).hexdigest()
+        if not entry or not entry.get("sha256"):
+            result["status"] = VERIFY_UNTRACKED
+        elif entry.get("size") != result["size"] or entry.get("sha256") != result["actual"]:
+            result["status"] = VERIFY_MISMATCH
+        else:
+            result["status"] = VERIFY_OK
+        return result
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f).get("files", {})
+        except (OSError, ValueError) as e:
+            print(f"读取校验清单失败: {e}")
+            return {}
+
+    def _save(self, entries):
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": 1, "files": entries}, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"保存校验清单失败: {e}")
@@ -0,0 +1,144 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+from network.web_scraper import WebScraper
+
+
+class TrainerPrefetcher:
+    """
+    修改器页面的后台预取器
+
+    搜索结果出来后，在 WebScraper 的线程池中预先抓取并解析前几个结果的修改器页面，
+    用户悬停或选中某一行时也会预取该行。解析出的版本列表保存在有限大小的内存缓存中（LRU），
+    点击“查看”时通常可以直接显示。新的搜索会取消上一次尚未开始的预取任务
+    """
+
+    def __init__(self, scraper=None, max_entries=64, ttl=600, max_hover_pending=3):
+        self.scraper = scraper or WebScraper()
+        self.executor = self.scraper.executor
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_hover_pending = max_hover_pending
+        self.stats = {"hits": 0, "misses": 0, "loaded": 0, "cancelled": 0}
+
+        # 任务可能在 add_done_callback 之前就已完成，回调会在持锁的线程中同步执行
+        self._lock = threading.RLock()
+        self._versions = OrderedDict()   # url -> (versions, fetched_at)
+        self._inflight = {}              # url -> Future
+        self._hover_pending = deque()
+
+    def prefetch(self, urls):
+        """新的搜索结果：取消之前尚未开始的预取，按顺序预取给定的URL"""
+        with self._lock:
+            self._cancel_pending_locked()
+            for url in urls:
+                self._submit_locked(url)
+
+    def prefetch_one(self, url):
+        """用户悬停或选中了某一行；只保留最近的几个悬停预取，避免快速划过时堆积任务"""
+        with self._lock:
+            future = self._submit_locked(url)
+            if future is None:
+                return
+            self._hover_pending.append(future)
+            while len(self._hover_pending) > self.max_hover_pending:
+                old = self._hover_pending.popleft()
+                if old.cancel():
+                    self.stats["cancelled"] += 1
+
+    def get_cached(self, url):
+        """返回缓存中仍有效的版本列表，没有时返回 None"""
+        with self._lock:
+            entry = self._versions.get(url)
+            if entry and time.time() - entry[1] < self.ttl:
+                self._versions.move_to_end(url)
+                self.stats["hits"] += 1
+                return entry[0]
+            self.stats["misses"] += 1
+            return None
+
+    def get_versions(self, url, timeout=90):
+        """
+        获取版本列表（阻塞，需在工作线程中调用）
+        优先使用缓存；该页面正在预取时等待预取结果，否则立即抓取
+        """
+        versions = self.get_cached(url)
+        if versions is not None:
+            return versions
+        with self._lock:
+            future = self._inflight.get(url)
+        if future is not None and not future.cancelled():
+            try:
+                return future.result(timeout)
+            except Exception as e:
+                print(f"等待预取结果失败，重新抓取: {e}")
+        return self._load(url)
+
+    def put(self, url, versions):
+        """保存在别处获取到的最新版本列表（例如关注列表检查到页面更新）"""
+        with self._lock:
+            self._versions[url] = (versions, time.time())
+            self._versions.move_to_end(url)
+            while len(self._versions) > self.max_entries:
+                self._versions.popitem(last=False)
+
+    def cancel_pending(self):
+        with self._lock:
+            self._cancel_pending_locked()
+
+    def clear(self):
+        with self._lock:
+            self._versions.clear()
+
+    def shutdown(self):
+        """取消所有尚未开始的预取并关闭线程池"""
+        self.cancel_pending()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit_locked(self, url):
+        if not url or url in self._inflight:
+            return None
+        entry = self._versions.get(url)
+        if entry and time.time() - entry[1] < self.ttl:
+            return None
+        try:
+            future = self.executor.submit(self._load, url)
+        except RuntimeError:
+            # 线程池已关闭（程序正在退出）
+            return None
+        self._inflight[url] = future
+        future.add_done_callback(lambda f, url=url: self._forget(url, f))
+        return future
+
+    def _cancel_pending_locked(self):
+        for future in list(self._inflight.values()):
+            if future.cancel():
+                self.stats["cancelled"] += 1
+        self._hover_pending.clear()
+
+    def _forget(self, url, future):
+        with self._lock:
+            if self._inflight.get(url) is future:
+                del self._inflight[url]
+
+    def _load(self, url):
+        html = self.scraper.get_trainer_page(url)
+        versions = self.scraper.parser.parse_trainer_versions(html)
+        with self._lock:
+            self.put(url, versions)
+            self.stats["loaded"] += 1
+        return versions
+
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_trainer_prefetcher():
+    """获取进程级共享的修改器页面预取器"""
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = TrainerPrefetcher()
+        return _prefetcher
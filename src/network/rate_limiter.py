@@ -0,0 +1,120 @@
+import threading
+import time
+
+from utils.config import Config
+
+
+class TokenBucket:
+    """
+    令牌桶限速器，速率单位为字节/秒，0 表示不限速
+
+    令牌不足时允许暂时"欠账"，调用方按欠下的字节数休眠，
+    因此任意大小的数据块都能被正确限速
+    """
+
+    def __init__(self, rate=0, burst_seconds=0.5):
+        self.burst_seconds = burst_seconds
+        self._lock = threading.Lock()
+        self.rate = 0
+        self.capacity = 0
+        self.tokens = 0
+        self.timestamp = time.monotonic()
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        """运行时修改速率，对正在进行的传输立即生效"""
+        with self._lock:
+            self._refill()
+            self.rate = max(0, rate)
+            self.capacity = self.rate * self.burst_seconds
+            self.tokens = min(self.tokens, self.capacity)
+
+    def consume(self, amount, should_stop=None):
+        """
+        消耗 amount 字节的令牌，令牌不足时阻塞到允许发送为止
+
+        等待分成不超过 0.1 秒的小段，每段之后检查 should_stop，
+        取消、暂停时不必等到整个欠账还清
+        """
+        with self._lock:
+            if self.rate <= 0:
+                return
+            self._refill()
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        deadline = time.monotonic() + wait
+        while wait > 0:
+            time.sleep(min(wait, 0.1))
+            if should_stop and should_stop():
+                return
+            wait = deadline - time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate > 0:
+            self.tokens = min(self.capacity, self.tokens + (now - self.timestamp) * self.rate)
+        self.timestamp = now
+
+
+class BandwidthLimiter:
+    """
+    下载带宽管理
+
+    支持全局总限速和单个下载限速。设置了全局限速时，总带宽在所有
+    正在进行的下载之间平均分配，每个下载实际速率取
+    min(单个限速, 全局限速 / 下载数)，下载开始或结束时重新分配
+    """
+
+    def __init__(self, global_rate=0, transfer_rate=0):
+        self.global_rate = global_rate
+        self.transfer_rate = transfer_rate
+        self._transfers = {}  # 令牌桶 -> 该下载单独指定的限速（None 表示使用默认值）
+        self._lock = threading.Lock()
+
+    def set_limits(self, global_rate=None, transfer_rate=None):
+        """修改限速（字节/秒，0 为不限速），正在进行的下载立即按新速率运行"""
+        with self._lock:
+            if global_rate is not None:
+                self.global_rate = max(0, global_rate)
+            if transfer_rate is not None:
+                self.transfer_rate = max(0, transfer_rate)
+            self._rebalance()
+
+    def register(self, rate=None):
+        """登记一个新的下载，返回它专用的令牌桶"""
+        bucket = TokenBucket()
+        with self._lock:
+            self._transfers[bucket] = rate
+            self._rebalance()
+        return bucket
+
+    def unregister(self, bucket):
+        with self._lock:
+            self._transfers.pop(bucket, None)
+            self._rebalance()
+
+    def active_count(self):
+        with self._lock:
+            return len(self._transfers)
+
+    def _rebalance(self):
+        share = self.global_rate / len(self._transfers) if self.global_rate and self._transfers else 0
+        for bucket, own_rate in self._transfers.items():
+            cap = own_rate if own_rate is not None else self.transfer_rate
+            limits = [r for r in (cap, share) if r]
+            bucket.set_rate(min(limits) if limits else 0)
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_bandwidth_limiter():
+    """获取进程级共享的带宽管理器，首次调用时按配置创建"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            config = Config()
+            _limiter = BandwidthLimiter(global_rate=config.get_global_rate_limit() * 1024,
+                                        transfer_rate=config.get_download_rate_limit() * 1024)
+        return _limiter
@@ -0,0 +1,239 @@
+import email.utils
+import random
+import threading
+import time
+import urllib.parse
+
+import requests
+
+from utils.config import Config
+
+STATE_CLOSED = "closed"         # 正常
+STATE_OPEN = "open"             # 熔断中，直接失败
+STATE_HALF_OPEN = "half_open"   # 冷却结束，放行一个试探请求
+
+# 这些状态码表示服务器暂时不可用，可以重试
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """主机处于熔断状态，请求未发出直接失败"""
+
+    def __init__(self, host, retry_in):
+        super().__init__(f"{host} 暂时不可用（连续请求失败），{retry_in:.0f} 秒后再试")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    单个主机的熔断器
+
+    连续 failure_threshold 个请求失败（一个请求的多次重试只算一次）后进入熔断状态，reset_timeout 秒内的请求直接失败；
+    冷却结束后只放行一个试探请求，成功则恢复正常，失败则重新熔断
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened_at = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        是否允许发出请求
+
+        Returns:
+            (是否允许, 距离可以重试的秒数)
+        """
+        with self._lock:
+            if self.state == STATE_CLOSED:
+                return True, 0
+            remaining = self.opened_at + self.reset_timeout - time.time()
+            if self.state == STATE_OPEN and remaining <= 0:
+                self.state = STATE_HALF_OPEN
+                self._probing = False
+            if self.state == STATE_HALF_OPEN and not self._probing:
+                self._probing = True
+                return True, 0
+            return False, max(remaining, 0)
+
+    def record_success(self):
+        with self._lock:
+            self.state = STATE_CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def release(self):
+        """试探请求因与主机状态无关的原因失败，允许下一个请求继续试探"""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = STATE_OPEN
+                self.opened_at = time.time()
+                self._probing = False
+
+
+class ResilienceManager:
+    """
+    所有网络请求共用的重试与熔断策略
+
+    幂等请求失败（连接错误、超时、429/5xx）时按指数退避加随机抖动重试，
+    服务器返回 Retry-After 时按其要求等待；每个主机一个熔断器，主机不可用时快速失败，
+    避免持续请求一个已经宕机的站点。各主机的熔断状态和重试统计可通过 stats() 查看
+    """
+
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=8.0, max_retry_after=30,
+                 failure_threshold=5, reset_timeout=30):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def call(self, url, fn, idempotent=True, max_attempts=None, status_of=None,
+             retry_on=(requests.ConnectionError, requests.Timeout), breaker_key=None):
+        """
+        按重试和熔断策略执行一次请求
+
+        Args:
+            fn: 发出请求的函数，返回响应对象
+            idempotent: 非幂等请求失败时不重试
+            status_of: 从 fn 的返回值中取HTTP状态码的函数，默认取 status_code 属性
+            retry_on: 视为主机故障、需要重试的异常类型
+            breaker_key: 使用单独的熔断器（默认按URL的主机），例如浏览器渲染的失败不影响普通请求
+
+        Returns:
+            fn 的返回值；重试次数用完后返回最后一次的响应（由调用方处理错误状态码）
+        """
+        host = breaker_key or urllib.parse.urlsplit(url).netloc.lower()
+        breaker, stats = self._host_state(host)
+        attempts = (max_attempts or self.max_attempts) if idempotent else 1
+        status_of = status_of or (lambda response: getattr(response, 'status_code', None))
+
+        for attempt in range(1, attempts + 1):
+            allowed, retry_in = breaker.allow()
+            if not allowed:
+                self._count(stats, "short_circuited")
+                raise CircuitOpenError(host, retry_in)
+
+            self._count(stats, "requests")
+            try:
+                response = fn()
+            except retry_on as e:
+                self._count(stats, "failures")
+                # 每个请求只在放弃时记一次失败；试探请求失败说明主机仍不可用，立即重新熔断
+                if attempt >= attempts or breaker.state == STATE_HALF_OPEN:
+                    breaker.record_failure()
+                    raise
+                delay = self._backoff(attempt)
+                print(f"请求 {host} 失败 ({e.__class__.__name__})，{delay:.1f} 秒后第 {attempt} 次重试")
+                self._wait(stats, delay)
+                continue
+            except Exception:
+                breaker.release()
+                raise
+
+            status = status_of(response)
+            if status not in RETRY_STATUSES:
+                breaker.record_success()
+                return response
+
+            self._count(stats, "failures")
+            delay = self._retry_after(response)
+            if delay is None:
+                delay = self._backoff(attempt)
+            if attempt >= attempts or delay > self.max_retry_after or breaker.state == STATE_HALF_OPEN:
+                breaker.record_failure()
+                return response
+            print(f"{host} 返回 HTTP {status}，{delay:.1f} 秒后第 {attempt} 次重试")
+            close = getattr(response, 'close', None)
+            if close:
+                close()
+            self._wait(stats, delay)
+
+    def stats(self):
+        """每个主机的熔断状态、连续失败数、请求/重试/失败/被熔断拒绝的次数和重试等待的总秒数"""
+        with self._lock:
+            hosts = {}
+            for host, breaker in self._breakers.items():
+                entry = dict(self._stats[host])
+                entry["state"] = breaker.state
+                entry["consecutive_failures"] = breaker.failures
+                hosts[host] = entry
+            return hosts
+
+    def reset(self, host=None):
+        """手动恢复熔断的主机（例如用户确认网络已恢复）"""
+        with self._lock:
+            if host is None:
+                breakers = list(self._breakers.values())
+            else:
+                breakers = [self._breakers[host]] if host in self._breakers else []
+        for breaker in breakers:
+            breaker.record_success()
+
+    def _host_state(self, host):
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self._breakers[host] = breaker
+                self._stats[host] = {"requests": 0, "retries": 0, "failures": 0,
+                                     "short_circuited": 0, "retry_wait": 0.0}
+            return breaker, self._stats[host]
+
+    def _count(self, stats, name, amount=1):
+        with self._lock:
+            stats[name] += amount
+
+    def _wait(self, stats, delay):
+        self._count(stats, "retries")
+        self._count(stats, "retry_wait", delay)
+        time.sleep(delay)
+
+    def _backoff(self, attempt):
+        """指数退避加全抖动：在 [0, min(max_delay, base*2^n)] 内随机等待"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def _retry_after(self, response):
+        headers = getattr(response, 'headers', None) or {}
+        value = headers.get('Retry-After') or headers.get('retry-after')
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(retry_at.timestamp() - time.time(), 0)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_resilience_manager():
+    """获取进程级共享的重试与熔断策略，首次调用时按配置创建"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            config = Config()
+            _manager = ResilienceManager(max_attempts=config.get_retry_max_attempts(),
+                                         failure_threshold=config.get_circuit_failure_threshold(),
+                                         reset_timeout=config.get_circuit_reset_timeout())
+        return _manager
@@ -0,0 +1,98 @@
+import threading
+import urllib.parse
+
+# 合并的操作类型
+OP_HTTP = "http"           # 普通HTTP页面请求
+OP_TRAINER = "trainer"     # 修改器页面（分级抓取）
+OP_BROWSER = "browser"     # 浏览器渲染
+OP_TRANSLATE = "translate" # 游戏名翻译
+
+
+def normalize_url(url):
+    """统一URL写法作为合并的键：协议和主机名小写、去掉片段和默认端口、查询参数排序"""
+    parts = urllib.parse.urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme == 'http' and netloc.endswith(':80')) or (scheme == 'https' and netloc.endswith(':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True)))
+    return urllib.parse.urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    合并相同的并发请求
+
+    同一个键（操作类型 + 规范化的URL或名称）同时只执行一次：第一个调用方真正执行，
+    在它完成之前到达的调用方等待并共享同一个结果（或同一个异常）。
+    例如双击“查看”、连按两次回车或预取与用户点击同时发生时，只会抓取一次页面
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.stats = {"executed": 0, "shared": 0}
+
+    def do(self, key, fn, on_join=None):
+        """
+        执行 fn() 并返回结果；相同键的请求正在进行时等待并返回它的结果
+
+        Args:
+            key: 合并键，一般为 (操作类型, 规范化的URL或名称)
+            on_join: 加入已有请求时调用（可用于提示用户正在等待）
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+                self.stats["executed"] += 1
+            else:
+                call.waiters += 1
+                leader = False
+                self.stats["shared"] += 1
+
+        if not leader:
+            if on_join:
+                on_join()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+_flights = None
+_flights_lock = threading.Lock()
+
+
+def get_single_flight():
+    """获取进程级共享的请求合并器"""
+    global _flights
+    with _flights_lock:
+        if _flights is None:
+            _flights = SingleFlight()
+        return _flights
@@ -1,61 +1,72 @@
 import requests
-from PyQt6.QtCore import pyqtSignal
 import time
 import random
 # 不再需要 BeautifulSoup for get_english_game_name
 # from bs4 import BeautifulSoup 
 import urllib.parse
+import re
 import os
 import sys
 import hashlib
 import json
+import threading
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION, FIRST_COMPLETED
 
-# 确保 playwright 可用
-try:
-    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
-except ImportError as e:
-    print(f"无法导入 playwright: {e}")
-    # 如果在打包环境中，尝试从其他位置导入
-    if getattr(sys, 'frozen', False):
-        print("正在打包环境中尝试导入 playwright...")
-        try:
-            # 添加所有可能的路径
-            base_dir = getattr(sys, '_MEIPASS', os.path.dirname(sys.executable))
-            possible_paths = [
-                os.path.join(base_dir, "site-packages"),
-                os.path.join(base_dir, "Lib", "site-packages"),
-                base_dir,
-                os.path.dirname(sys.executable)
-            ]
-            for path in possible_paths:
-                if path not in sys.path and os.path.exists(path):
-                    sys.path.append(path)
-                    print(f"添加路径到 sys.path: {path}")
-            
-            from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
-            print("成功从打包环境导入 playwright")
-        except ImportError as e2:
-            print(f"从打包环境导入 playwright 失败: {e2}")
-            print("sys.path:", sys.path)
-            raise
+from network.download_state import PartialDownload
+from network.manifest import HashManifest, hash_file
+from network.disk_writer import (ChunkSizer, open_part_file, preallocate, sync_file, copy_to_file,
+                                 MAX_CHUNK, FSYNC_NONE, FSYNC_PERIODIC)
+from network.http_pool import get_http_pool
+from network.http_cache import get_http_cache
+from network.rate_limiter import get_bandwidth_limiter
+from network.browser_pool import get_browser_pool
+from network.fetch_strategy import get_fetch_tier_store, TIER_STATIC, TIER_BROWSER
+from network.resilience import get_resilience_manager, CircuitOpenError
+from network.single_flight import get_single_flight, normalize_url, OP_HTTP, OP_TRAINER, OP_BROWSER, OP_TRANSLATE
+from parser.html_parser import HtmlParser
+from catalog.store import get_trainer_catalog
+from translator.translation_cache import get_translation_cache, normalize_name
+from utils.config import Config
 
 class WebScraper:
-    def __init__(self):
-        self.base_url = "https://flingtrainer.com"
+    def __init__(self, base_url=None, max_workers=3):
+        # 可以指向本地替身站点（见 standin 包）进行测试和压测
+        self.base_url = (base_url or Config().get_base_url()).rstrip('/')
         self.baidu_url = "https://www.baidu.com"
         self.headers = {
             # 保留这个headers给其他非playwright的请求
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
         
+        # 所有请求共用进程级连接池，复用 keep-alive 连接
+        self.http = get_http_pool()
+        # 搜索页和修改器页面的磁盘缓存，支持条件请求重新验证
+        self.cache = get_http_cache()
+        # 常驻的无头浏览器池，避免每次抓取都冷启动Chromium
+        self.browser_pool = get_browser_pool()
+        # 记录每个修改器页面需要普通请求还是浏览器渲染
+        self.tier_store = get_fetch_tier_store()
+        # 相同的页面抓取/浏览器渲染/翻译同时只执行一次，并发的调用方共享结果
+        self.flights = get_single_flight()
+        # 所有主机共用的重试与熔断策略（HTTP请求在连接池中已经接入）
+        self.resilience = get_resilience_manager()
+        self.parser = HtmlParser(self.base_url)
+        
         # 创建线程池用于并行请求
-        self.executor = ThreadPoolExecutor(max_workers=3)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        
+        # 分段下载设置：服务器支持Range时，将大文件拆分为多个区间并行下载
+        self.download_segments = 4
+        self.min_segment_size = 1024 * 1024  # 每段至少1MB，小文件直接单连接下载
+        # 下载数据同步到磁盘的策略（不同步/完成时同步/定期同步）
+        self.fsync_policy = Config().get_download_fsync_policy()
+        # 下载请求的连接/读取超时，服务器停止发送数据时不会让下载线程一直挂起
+        self.download_timeouts = Config().get_download_timeouts()
         
     def search_game(self, game_name):
         """
-        搜索游戏 - 直接从服务器获取最新内容
+        搜索游戏 - 有效期内直接使用缓存，过期后向服务器验证是否有更新
         """
         encoded_game_name = urllib.parse.quote(game_name)
         url = f"{self.base_url}/?s={encoded_game_name}"
@@ -64,50 +75,258 @@ class WebScraper:
         content = self._make_request(url, timeout=10)  # 减少超时时间
         return content
         
+    def search_game_pages(self, game_name, on_page=None, max_pages=None, concurrency=None, should_stop=None,
+                          use_catalog=None):
+        """
+        分页搜索游戏：优先查询本地修改器目录，没有结果时在线搜索——先获取第一页，
+        从分页导航中发现后续页面并按并发上限并行获取
+
+        每解析完一页就调用 on_page(页码, 本页新增的结果)（在调用线程中执行），
+        调用方可以立即显示第一页的结果而不必等待所有页面。不同页面中重复的结果只返回一次
+
+        Args:
+            max_pages: 最多获取的页数，不指定时使用配置
+            concurrency: 同时获取的页面数，不指定时使用配置
+            should_stop: 返回 True 时停止获取剩余页面
+            use_catalog: 是否先查询本地目录，不指定时使用配置
+
+        Returns:
+            按页码排序的全部结果
+        """
+        config = Config()
+        if use_catalog is None:
+            use_catalog = config.get_use_local_catalog()
+        if use_catalog:
+            local_results = self.search_local(game_name)
+            if local_results:
+                if on_page:
+                    on_page(1, local_results)
+                return local_results
+        
+        encoded_game_name = urllib.parse.quote(game_name)
+        results = self.fetch_listing_pages(
+            f"{self.base_url}/?s={encoded_game_name}", on_page=on_page,
+            max_pages=max_pages or config.get_search_max_pages(),
+            concurrency=concurrency or config.get_search_page_concurrency(),
+            should_stop=should_stop, timeout=10)
+        print(f"搜索 \"{game_name}\" 共找到 {len(results)} 个结果")
+        return results
+        
+    def search_local(self, game_name):
+        """在本地修改器目录中搜索，目录为空或没有匹配时返回空列表（由调用方改用在线搜索）"""
+        catalog = get_trainer_catalog()
+        if catalog.count() == 0:
+            return []
+        started = time.perf_counter()
+        results = catalog.search(game_name)
+        print(f"本地目录搜索 \"{game_name}\": {len(results)} 个结果, "
+              f"耗时 {(time.perf_counter() - started) * 1000:.1f} 毫秒")
+        return results
+        
+    def fetch_listing_pages(self, first_url, on_page=None, max_pages=10, concurrency=3, should_stop=None,
+                            timeout=15, use_cache=True):
+        """
+        获取分页的文章列表（搜索结果、首页或分类归档），后续页面按并发上限并行获取
+
+        分页导航可能只显示部分页码（如 1 2 3 … 10）或只有“下一页”，每解析一页都会检查
+        是否发现了新的页面。每解析完一页调用 on_page(页码, 本页新增的结果)（在调用线程中执行）
+
+        Returns:
+            按页码排序的全部结果（不同页面中重复的文章只出现一次）
+        """
+        seen_urls = set()
+        page_results = {}
+        
+        def collect(page, html):
+            new_results = []
+            for result in self.parser.parse_search_results(html):
+                if result["url"] not in seen_urls:
+                    seen_urls.add(result["url"])
+                    new_results.append(result)
+            page_results[page] = new_results
+            if on_page:
+                on_page(page, new_results)
+        
+        first_html = self._make_request(first_url, timeout=timeout, use_cache=use_cache)
+        collect(1, first_html)
+        
+        scheduled = {1}
+        pending = {}
+        executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="listing-page")
+        
+        def submit(page, url):
+            scheduled.add(page)
+            pending[executor.submit(self._make_request, url, timeout=timeout, use_cache=use_cache)] = page
+        
+        def schedule(html):
+            pagination = self.parser.parse_search_pagination(html)
+            links = dict(pagination["pages"])
+            if pagination["next"]:
+                next_page = self.parser.search_page_number(pagination["next"])
+                if next_page:
+                    links.setdefault(next_page, pagination["next"])
+            template = next(iter(links.values()), None)
+            for page in range(2, min(pagination["last"], max_pages) + 1):
+                if page not in scheduled:
+                    submit(page, links.get(page) or self._listing_page_url(first_url, page, template))
+            for page, url in links.items():
+                if page not in scheduled and page <= max_pages:
+                    submit(page, url)
+        
+        try:
+            schedule(first_html)
+            while pending:
+                if should_stop and should_stop():
+                    break
+                done, _ = wait(list(pending), timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page = pending.pop(future)
+                    try:
+                        html = future.result()
+                    except Exception as e:
+                        # 后续页面失败不影响已经获取的结果
+                        print(f"获取列表第 {page} 页失败: {first_url} {e}")
+                        continue
+                    collect(page, html)
+                    schedule(html)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return [result for page in sorted(page_results) for result in page_results[page]]
+        
+    def get_listing_page(self, page=1, use_cache=False):
+        """获取网站文章列表（首页）的第 page 页"""
+        first_url = f"{self.base_url}/"
+        url = first_url if page <= 1 else self._listing_page_url(first_url, page)
+        return self._make_request(url, use_cache=use_cache)
+        
+    def get_feed(self):
+        """获取网站的RSS（最近发布的文章），总是向服务器请求最新内容"""
+        return self._make_request(f"{self.base_url}/feed/", use_cache=False)
+        
+    def _listing_page_url(self, first_url, page, template=None):
+        """构造列表第 page 页的URL，优先沿用页面中已有分页链接的格式，否则使用 WordPress 的 /page/N/"""
+        if template:
+            if re.search(r'/page/\d+', template):
+                return re.sub(r'/page/\d+', f'/page/{page}', template, count=1)
+            if re.search(r'[?&]paged=\d+', template):
+                return re.sub(r'([?&]paged=)\d+', rf'\g<1>{page}', template, count=1)
+        parts = urllib.parse.urlsplit(first_url)
+        path = f"{parts.path.rstrip('/')}/page/{page}/"
+        return urllib.parse.urlunsplit((parts.scheme, parts.netloc, path, parts.query, ''))
+        
     def get_trainer_page(self, url):
+        """获取修改器页面内容；同一页面正在抓取时等待并共享其结果"""
+        return self.flights.do((OP_TRAINER, normalize_url(url)), lambda: self._get_trainer_page(url))
+        
+    def poll_trainer_page(self, url):
+        """
+        检查修改器页面是否有更新（用于关注列表的定期检查）
+
+        只发送一次条件请求：服务器返回304时不再下载页面，返回200时直接使用响应中的新页面，
+        只有页面需要浏览器渲染时才再打开浏览器
+
+        Returns:
+            页面未变化时返回 None，否则返回最新的页面内容
         """
-        使用Playwright获取修改器页面内容
-        这样可以确保动态内容（如自动更新版本EXE）被正确抓取
+        cached = self.cache.lookup(url)
+        response = None
+        if cached:
+            not_modified, response = self._revalidate(url, cached, read_body=True)
+            if not_modified:
+                return None
+        return self.flights.do((OP_TRAINER, normalize_url(url), "poll"),
+                               lambda: self._get_trainer_page(url, refresh=True, static_response=response))
+        
+    def _get_trainer_page(self, url, refresh=False, static_response=None):
         """
+        获取修改器页面内容（分级抓取）
+        先用普通HTTP请求抓取并解析，下载区域缺失或内容不完整（如缺少自动更新版本）时
+        才升级到Playwright渲染，以确保动态内容被正确抓取。
+        每个URL实际需要的抓取方式会被记录，下次直接使用对应的方式
+        
+        Args:
+            refresh: 已确认页面有变化，不使用缓存
+            static_response: 已经获取到的普通请求响应（200），不再重复请求
+        """
+        # 缓存仍在有效期内时直接返回
+        cached = None if refresh else self.cache.lookup(url)
+        if cached and cached['fresh']:
+            print(f"使用缓存的修改器页面: {url}")
+            return cached['body']
+        
+        tier = self.tier_store.get(url)
+        static_html = None
+        static_versions = []
+        
+        if tier != TIER_BROWSER:
+            # 普通请求（缓存过期时带条件请求头，304时直接使用缓存）
+            try:
+                if static_response is not None:
+                    static_html = static_response.text
+                else:
+                    static_html = self._make_request(url, timeout=10)
+                static_versions = self.parser.parse_trainer_versions(static_html)
+            except Exception as e:
+                print(f"普通请求抓取修改器页面失败: {e}")
+            
+            if static_html is not None:
+                complete = self.parser.is_trainer_page_complete(static_html, static_versions)
+                # 之前已确认该页面不需要浏览器时，只要解析到版本就直接使用
+                if complete or (tier == TIER_STATIC and static_versions):
+                    print(f"普通请求已获取完整的修改器页面: {url}")
+                    self.tier_store.record(url, TIER_STATIC)
+                    if static_response is not None:
+                        self.cache.store(url, static_html, etag=static_response.headers.get('ETag'),
+                                         last_modified=static_response.headers.get('Last-Modified'))
+                    return static_html
+                print("页面内容不完整，升级为Playwright抓取")
+        elif cached and self._revalidate(url, cached)[0]:
+            print(f"修改器页面未变化(304)，使用缓存: {url}")
+            return cached['body']
+        
         print(f"使用Playwright抓取修改器页面: {url}")
         
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-                
-                # 优化: 禁用图片和样式以加快加载速度
-                page.route('**/*.{png,jpg,jpeg,gif,css}', lambda route: route.abort())
-                
-                # 增加User-Agent模拟真实浏览器
-                page.set_extra_http_headers({
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36"
-                })
-                
-                # 导航到目标页面，减少超时
-                page.goto(url, timeout=15000)  # 减少到15秒
-                
-                # 等待页面加载完成（等待下载区域出现）
-                try:
-                    page.wait_for_selector("div.download-attachments", timeout=5000)  # 减少到5秒
-                except PlaywrightTimeoutError:
-                    print("等待下载区域超时，尝试继续获取内容")
-                
-                # 获取页面内容
-                html_content = page.content()
-                
-                # 关闭浏览器
-                browser.close()
-                
-                return html_content
+            # 等待下载区域出现；超时也继续获取内容
+            result = self._browser_fetch(url, wait_selector="div.download-attachments",
+                                         wait_timeout=5000, nav_timeout=15000)
+            if result["timed_out"]:
+                print("等待下载区域超时，尝试继续获取内容")
+            html_content = result["html"]
+            
+            # 浏览器渲染没有比普通请求多出版本时，说明该页面其实不需要浏览器
+            browser_versions = self.parser.parse_trainer_versions(html_content)
+            if static_html is not None and static_versions and len(browser_versions) <= len(static_versions):
+                self.tier_store.record(url, TIER_STATIC)
+            else:
+                self.tier_store.record(url, TIER_BROWSER)
+            
+            # 保存渲染后的页面和服务器返回的校验信息
+            self.cache.store(url, html_content,
+                             etag=result["headers"].get('etag'),
+                             last_modified=result["headers"].get('last-modified'))
+            return html_content
         except Exception as e:
             print(f"使用Playwright抓取页面时出错: {e}")
+            if static_html is not None:
+                print("使用普通请求获取的页面内容")
+                return static_html
             # 出错时回退到旧方法
             print(f"回退到requests方法抓取页面")
             content = self._make_request(url, timeout=10)
             return content
     
     def get_english_game_name(self, chinese_name, progress_callback=None):
+        """获取游戏的英文名称；同一名称正在查询时等待并共享其结果"""
+        def on_join():
+            if progress_callback:
+                progress_callback(f"\"{chinese_name}\" 正在查询中，等待结果...")
+        return self.flights.do((OP_TRANSLATE, normalize_name(chinese_name)),
+                               lambda: self._get_english_game_name(chinese_name, progress_callback),
+                               on_join=on_join)
+        
+    def _get_english_game_name(self, chinese_name, progress_callback=None):
         """
         获取游戏的英文名称。
         
@@ -118,6 +337,20 @@ class WebScraper:
         Returns:
             英文游戏名称，如果找不到则返回 None
         """
+        # 先查本地翻译缓存，命中时不需要启动浏览器
+        translation_cache = get_translation_cache()
+        cached_name = translation_cache.get(chinese_name)
+        if cached_name:
+            if progress_callback:
+                progress_callback(f"使用已保存的翻译: {cached_name}")
+            return cached_name
+        if translation_cache.is_recent_failure(chinese_name):
+            if progress_callback:
+                progress_callback("该名称最近查询失败，暂不重复查询")
+            else:
+                print(f"\"{chinese_name}\" 最近查询失败，跳过")
+            return None
+        
         query = f"{chinese_name} 的英文游戏名称"
         encoded_query = urllib.parse.quote(query)
         search_url = f"{self.baidu_url}/s?wd={encoded_query}"
@@ -133,184 +366,434 @@ class WebScraper:
             print(f"等待选择器: {selector}")
 
         try:
-            with sync_playwright() as p:
-                if progress_callback:
-                    progress_callback("正在初始化翻译环境...")
-                
-                # 尝试启动 Chromium 浏览器，可以改为 'firefox' 或 'webkit'
-                # headless=True 表示无头模式，不显示浏览器窗口
-                # headless=False 可以用于调试，会显示浏览器窗口
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-                
-                # 增加User-Agent模拟真实浏览器，防止被检测
-                page.set_extra_http_headers({"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36"})
-                
+            if progress_callback:
+                progress_callback("正在查询中，正在分析数据 (可能需要约15秒)...")
+            else:
+                print("正在导航到页面并等待目标元素...")
+            
+            # 使用浏览器池中的页面，导航超时20秒，等待目标元素最长15秒
+            result = self._browser_fetch(search_url, wait_selector=selector, wait_timeout=15000,
+                                         nav_timeout=20000, block_resources=False,
+                                         extract_selector=selector)
+            
+            if result["timed_out"]:
                 if progress_callback:
-                    progress_callback("正在查询中，请稍候...")
+                    progress_callback("查询超时，未能找到英文名称")
                 else:
-                    print("正在导航到页面...")
-                    
-                page.goto(search_url, timeout=20000) # 设置导航超时为20秒
-                
+                    print(f"等待元素超时（15秒），未能找到选择器: {selector}")
+            elif result["text"]:
+                english_name = result["text"]
                 if progress_callback:
-                    progress_callback("查询中，正在等待结果生成...")
+                    progress_callback(f"成功获取英文名: {english_name}")
                 else:
-                    print("导航完成，等待目标元素...")
-
-                try:
-                    # 等待目标元素出现，最长等待15秒
-                    if progress_callback:
-                        progress_callback("正在分析数据 (可能需要约15秒)...")
-                        
-                    page.wait_for_selector(selector, timeout=15000)
-                    
-                    if progress_callback:
-                        progress_callback("已找到结果，提取英文名称...")
-                    else:
-                        print("目标元素已找到!")
-                    
-                    # 获取元素文本
-                    element = page.query_selector(selector)
-                    if element:
-                        english_name = element.text_content().strip()
-                        if progress_callback:
-                            progress_callback(f"成功获取英文名: {english_name}")
-                        else:
-                            print(f"提取到英文名: {english_name}")
-                    else:
-                        if progress_callback:
-                            progress_callback("已分析完成，但无法提取有效内容")
-                        else:
-                            print("元素找到但无法获取内容")
-                        
-                except PlaywrightTimeoutError:
-                    if progress_callback:
-                        progress_callback("查询超时，未能找到英文名称")
-                    else:
-                        print(f"等待元素超时（15秒），未能找到选择器: {selector}")
-                    # 超时后，可以尝试保存页面快照或HTML用于调试
-                    # page.screenshot(path='baidu_timeout_screenshot.png')
-                    # with open('baidu_timeout_page.html', 'w', encoding='utf-8') as f:
-                    #     f.write(page.content())
-                except Exception as wait_err:
-                    if progress_callback:
-                        progress_callback(f"分析过程中出错: {wait_err}")
-                    else:
-                        print(f"等待或查找元素时发生错误: {wait_err}")
-
+                    print(f"提取到英文名: {english_name}")
+            else:
                 if progress_callback:
-                    progress_callback("查询完成，正在关闭环境...")
+                    progress_callback("已分析完成，但无法提取有效内容")
                 else:
-                    print("关闭浏览器...")
-                browser.close()
+                    print("元素找到但无法获取内容")
                 
         except Exception as e:
             if progress_callback:
                 progress_callback(f"翻译过程中出错: {e}")
             else:
                 print(f"Playwright 操作过程中出错: {e}")
+            # 熔断、浏览器启动失败、导航超时等都是暂时的故障，不记入负缓存，下次仍然查询
+            return None
         
+        # 保存结果；页面正常加载但没有答案的名称记入负缓存，一段时间内不再重复打开浏览器查询
         if english_name:
-             # 可以在这里进行一些最终的清理
-             pass
+            translation_cache.put(chinese_name, english_name)
+        else:
+            translation_cache.record_failure(chinese_name)
 
         return english_name
         
-    def download_file(self, url, save_path, progress_signal):
-        # 这个方法仍然使用 requests
+    def download_file(self, url, save_path, progress_signal, cancel_event=None, rate_limit=None):
+        """
+        下载文件。数据先写入 .part 文件，并在旁边的状态文件中记录校验信息和
+        已完成区间，中断后再次下载同一URL时会校验 ETag/Last-Modified 并续传。
+        服务器支持Range请求且文件足够大时使用多连接分段下载，否则回退到单连接流式下载
+        
+        Args:
+            cancel_event: 可选的 threading.Event，置位后下载停止并保留已下载部分
+            rate_limit: 可选的本次下载限速（字节/秒），不指定时使用配置中的单个下载限速
+        """
+        cancel_event = cancel_event or threading.Event()
+        partial = PartialDownload(save_path)
+        # 登记到带宽管理器，与其他正在进行的下载共享全局限速
+        limiter = get_bandwidth_limiter()
+        bucket = limiter.register(rate_limit)
         try:
-            response = requests.get(url, headers=self.headers, stream=True)
-            response.raise_for_status()
+            info = self.probe_download(url)
+            resumable = bool(info and info["accept_ranges"] and info["total_size"])
             
-            total_size = int(response.headers.get('content-length', 0))
-            block_size = 8192
-            downloaded_size = 0
-            
-            # 初始化下载速度和大小计算相关变量
-            start_time = time.time()
-            last_time = start_time
-            last_bytes = 0
+            if info and partial.load() and resumable and partial.can_resume(
+                    url, info["total_size"], info["etag"], info["last_modified"]):
+                print(f"检测到未完成的下载，已完成 {partial.completed_bytes()} 字节，继续下载: {save_path}")
+            else:
+                if partial.url:
+                    print(f"服务器文件已变化或无法续传，重新下载: {save_path}")
+                total_size = info["total_size"] if info else 0
+                etag = info["etag"] if info else None
+                last_modified = info["last_modified"] if info else None
+                partial.reset(url, total_size, etag, last_modified)
             
-            # 设置标志，防止下载时被取消后继续更新进度
-            cancelled = False
+            # 单连接顺序下载时边写边计算SHA-256；分段下载的数据乱序到达，完成后再计算一次
+            hasher = None
+            if resumable:
+                segments = self._split_ranges(partial.missing_ranges())
+                if not segments:
+                    # 上次已下载完整，只是还没来得及重命名
+                    success = True
+                elif len(segments) > 1 or partial.completed:
+                    # 续传时缺失的区间可能在文件中间，按分段方式只请求缺失的部分
+                    print(f"服务器支持分段下载，使用 {len(segments)} 个连接: {info['url']}")
+                    success = self._download_segmented(info["url"], partial, segments, progress_signal, cancel_event, bucket)
+                else:
+                    hasher = hashlib.sha256()
+                    success = self._download_single(info["url"], partial, progress_signal, cancel_event, bucket,
+                                                    resumable=True, hasher=hasher)
+            else:
+                hasher = hashlib.sha256()
+                success = self._download_single(url, partial, progress_signal, cancel_event, bucket,
+                                                resumable=False, hasher=hasher)
             
-            with open(save_path, 'wb') as file:
-                for data in response.iter_content(block_size):
-                    # 检查线程是否被标记为取消
-                    # 由于此代码运行在QThread中，需要检查QThread.isRunning()
-                    # 这里无法直接访问QThread，所以用一个变量标记
-                    if cancelled:
-                        return False
-                        
-                    size = file.write(data)
-                    downloaded_size += size
-                    
-                    current_time = time.time()
-                    time_diff = current_time - last_time
-                    bytes_diff = downloaded_size - last_bytes
-
-                    # 更新进度和速度信息 (每0.5秒更新一次避免过于频繁)
-                    if time_diff > 0.5 or downloaded_size == total_size:
-                        speed = bytes_diff / time_diff if time_diff > 0 else 0
-                        speed_str = self._format_speed(speed)
-                        
-                        if total_size > 0:
-                            progress = int((downloaded_size / total_size) * 100)
-                            try:
-                                progress_signal.emit(progress, speed_str) # 传递速度信息
-                            except RuntimeError:
-                                # 当线程被终止时可能会抛出RuntimeError
-                                cancelled = True
-                                return False
-                        else:
-                            # 如果总大小未知，只显示已下载量和速度
-                            try:
-                                progress_signal.emit(-1, speed_str) # 使用-1表示进度未知
-                            except RuntimeError:
-                                cancelled = True
-                                return False
-                            
-                        last_time = current_time
-                        last_bytes = downloaded_size
-                        
-            return True
+            if success:
+                if hasher is None:
+                    hasher = hash_file(partial.part_path)
+                partial.finalize(sync=self.fsync_policy != FSYNC_NONE)
+                self._record_manifest(save_path, hasher.hexdigest(), partial)
+            return success
         except requests.RequestException as e:
             print(f"下载文件失败: {str(e)}")
             raise Exception(f"下载文件失败: {str(e)}")
+        finally:
+            limiter.unregister(bucket)
+    
+    def probe_download(self, url):
+        """
+        探测下载地址：通过一个单字节Range请求获取最终地址、文件大小、
+        是否支持分段以及 ETag/Last-Modified
+        
+        Returns:
+            包含 url/total_size/accept_ranges/etag/last_modified 的字典，探测失败时返回 None
+        """
+        headers = self.headers.copy()
+        headers["Range"] = "bytes=0-0"
+        try:
+            response = self.http.get(url, headers=headers, stream=True, timeout=10)
+            response.raise_for_status()
+            if response.status_code == 206:
+                # 读完这一个字节，连接才能归还连接池
+                response.content
+            else:
+                # 服务器忽略了Range，直接关闭，避免读取整个文件
+                response.close()
+        except requests.RequestException as e:
+            print(f"探测下载信息失败: {e}")
+            return None
+        
+        info = {
+            # 使用重定向后的地址，避免每个分段都重复跳转
+            "url": response.url,
+            "total_size": 0,
+            "accept_ranges": False,
+            "etag": response.headers.get('ETag'),
+            "last_modified": response.headers.get('Last-Modified'),
+        }
+        
+        # 只有返回206且带有Content-Range总大小时才认为支持分段
+        content_range = response.headers.get('Content-Range', '')
+        if response.status_code == 206 and '/' in content_range:
+            total = content_range.rsplit('/', 1)[1].strip()
+            if total.isdigit() and response.headers.get('Accept-Ranges', 'bytes').lower() != 'none':
+                info["total_size"] = int(total)
+                info["accept_ranges"] = True
+        elif response.status_code == 200:
+            info["total_size"] = int(response.headers.get('content-length', 0))
+        return info
+    
+    def _split_ranges(self, ranges):
+        """
+        将待下载区间拆分为最多 download_segments 个 (起始, 结束) 字节区间，结束位置包含在内。
+        每次拆分当前最大的区间，拆分后的区间不小于 min_segment_size
+        """
+        ranges = list(ranges)
+        while 0 < len(ranges) < self.download_segments:
+            largest = max(ranges, key=lambda r: r[1] - r[0])
+            start, end = largest
+            size = end - start + 1
+            if size < self.min_segment_size * 2:
+                break
+            middle = start + size // 2
+            ranges.remove(largest)
+            ranges.extend([(start, middle - 1), (middle, end)])
+        return sorted(ranges)
+    
+    def _download_headers(self):
+        headers = self.headers.copy()
+        # 要求服务器不压缩，读到的字节就是文件内容，可以直接写入磁盘
+        headers["Accept-Encoding"] = "identity"
+        return headers
+    
+    def _record_manifest(self, save_path, sha256, partial):
+        """把下载文件的SHA-256、大小、地址和ETag写入下载目录的校验清单"""
+        manifest = HashManifest(os.path.dirname(os.path.abspath(save_path)))
+        size = os.path.getsize(save_path)
+        duplicates = [name for name in manifest.find_by_hash(sha256) if name != os.path.basename(save_path)]
+        if duplicates:
+            print(f"下载的文件与已有的 {', '.join(duplicates)} 内容相同")
+        manifest.record(save_path, sha256, size, url=partial.url, etag=partial.etag,
+                        last_modified=partial.last_modified)
+        print(f"SHA-256: {sha256}  {save_path}")
+    
+    def _download_single(self, url, partial, progress_signal, cancel_event, bucket, resumable, hasher=None):
+        """
+        单连接流式下载，从头开始写入.part文件（续传由分段下载处理，只请求缺失的区间）。
+        响应体直接读入可复用的缓冲区再写入文件，块大小随吞吐量自动调整
+        """
+        response = self.http.get(url, headers=self._download_headers(), stream=True, timeout=self.download_timeouts)
+        response.raise_for_status()
+        
+        if partial.total_size:
+            total_size = partial.total_size
+        else:
+            total_size = int(response.headers.get('content-length', 0))
+        state = {"downloaded": 0, "last_time": time.monotonic(), "last_bytes": 0,
+                 "last_save": time.monotonic(), "stopped": False}
+        
+        def on_chunk(size):
+            state["downloaded"] += size
+            bucket.consume(size, should_stop=lambda: state["stopped"] or cancel_event.is_set())
+            current_time = time.monotonic()
+            downloaded_size = state["downloaded"]
+            time_diff = current_time - state["last_time"]
+            
+            # 更新进度和速度信息 (每0.5秒更新一次避免过于频繁)
+            if time_diff > 0.5 or downloaded_size == total_size:
+                speed = (downloaded_size - state["last_bytes"]) / time_diff if time_diff > 0 else 0
+                if not self._emit_progress(progress_signal, downloaded_size, total_size, speed):
+                    # 当线程被终止时可能会抛出RuntimeError
+                    state["stopped"] = True
+                state["last_time"] = current_time
+                state["last_bytes"] = downloaded_size
+            
+            # 定期记录续传位置，程序异常退出时最多损失几秒的数据
+            if resumable and current_time - state["last_save"] > 2:
+                if self.fsync_policy == FSYNC_PERIODIC:
+                    sync_file(file)
+                partial.add_range(0, downloaded_size - 1)
+                partial.save()
+                state["last_save"] = current_time
+        
+        try:
+            with open_part_file(partial.part_path) as file:
+                preallocate(file, total_size)
+                copy_to_file(response, file, ChunkSizer(bucket=bucket), bytearray(MAX_CHUNK), on_chunk=on_chunk,
+                             should_stop=lambda: state["stopped"] or cancel_event.is_set(), hasher=hasher)
+        finally:
+            response.close()
+            if resumable and state["downloaded"] > 0:
+                partial.add_range(0, state["downloaded"] - 1)
+                partial.save()
+        
+        if state["stopped"] or cancel_event.is_set():
+            return False
+        downloaded_size = state["downloaded"]
+        if total_size and downloaded_size < total_size:
+            raise requests.RequestException(f"下载数据不完整: {downloaded_size}/{total_size}")
+        return True
+    
+    def _download_segmented(self, url, partial, segments, progress_signal, cancel_event, bucket):
+        """
+        多连接分段下载：每个分段在独立线程中请求自己的字节区间，
+        写入.part文件的对应位置，进度由当前线程统一汇总发送并定期保存续传状态
+        """
+        lock = threading.Lock()
+        stop_event = threading.Event()
+        received = [0] * len(segments)  # 每个分段已写入的字节数
+        base_size = partial.completed_bytes()
+        total_size = partial.total_size
+        
+        def fetch_segment(index, start, end):
+            headers = self._download_headers()
+            headers["Range"] = f"bytes={start}-{end}"
+            response = self.http.get(url, headers=headers, stream=True, timeout=self.download_timeouts)
+            response.raise_for_status()
+            if response.status_code != 206:
+                response.close()
+                raise requests.RequestException(f"服务器未按分段返回数据 (HTTP {response.status_code})")
+            
+            def on_chunk(size):
+                with lock:
+                    received[index] += size
+                # 所有分段共用同一个令牌桶，限速针对整个下载
+                bucket.consume(size, should_stop=lambda: stop_event.is_set() or cancel_event.is_set())
+            
+            expected = end - start + 1
+            try:
+                with open_part_file(partial.part_path) as file:
+                    file.seek(start)
+                    # 每个分段线程使用自己的缓冲区，最多读取到分段末尾
+                    copy_to_file(response, file, ChunkSizer(bucket=bucket), bytearray(MAX_CHUNK), limit=expected,
+                                 on_chunk=on_chunk,
+                                 should_stop=lambda: stop_event.is_set() or cancel_event.is_set())
+                    if self.fsync_policy == FSYNC_PERIODIC:
+                        sync_file(file)
+            finally:
+                response.close()
+            if stop_event.is_set() or cancel_event.is_set():
+                return
+            
+            if received[index] < expected:
+                raise requests.RequestException(f"分段 {start}-{end} 数据不完整: {received[index]}/{expected}")
+        
+        def record_progress():
+            with lock:
+                for (start, end), count in zip(segments, received):
+                    if count:
+                        partial.add_range(start, start + count - 1)
+            partial.save()
+        
+        executor = ThreadPoolExecutor(max_workers=len(segments))
+        futures = [executor.submit(fetch_segment, i, start, end) for i, (start, end) in enumerate(segments)]
+        
+        last_time = time.time()
+        last_save = last_time
+        last_bytes = base_size
+        try:
+            pending = futures
+            while pending:
+                done, pending = wait(pending, timeout=0.5, return_when=FIRST_EXCEPTION)
+                for future in done:
+                    error = future.exception()
+                    if error:
+                        raise error
+                if cancel_event.is_set():
+                    return False
+                
+                with lock:
+                    downloaded_size = base_size + sum(received)
+                current_time = time.time()
+                time_diff = current_time - last_time
+                speed = (downloaded_size - last_bytes) / time_diff if time_diff > 0 else 0
+                if not self._emit_progress(progress_signal, downloaded_size, total_size, speed):
+                    return False
+                last_time = current_time
+                last_bytes = downloaded_size
+                
+                if current_time - last_save > 2:
+                    record_progress()
+                    last_save = current_time
+        finally:
+            # 出错或取消时通知其余分段尽快退出，并保存已完成的部分
+            stop_event.set()
+            executor.shutdown(wait=True)
+            record_progress()
+        
+        return True
+    
+    def _emit_progress(self, progress_signal, downloaded_size, total_size, speed):
+        """发送下载进度，线程已被终止（信号失效）时返回 False"""
+        speed_str = self._format_speed(speed)
+        try:
+            if total_size > 0:
+                progress = int((downloaded_size / total_size) * 100)
+                progress_signal.emit(progress, speed_str)  # 传递速度信息
+            else:
+                # 如果总大小未知，只显示已下载量和速度
+                progress_signal.emit(-1, speed_str)  # 使用-1表示进度未知
+        except RuntimeError:
+            return False
+        return True
+        
+    def _revalidate(self, url, cached, read_body=False):
+        """
+        用条件请求检查缓存的页面是否仍然有效
+        
+        Returns:
+            (是否未变化, 响应)：服务器返回304时为 (True, None) 并刷新有效期；
+            read_body 为 True 且返回200时为 (False, 响应)，调用方可以直接使用其中的新页面而不必再请求一次
+            （缓存没有校验信息时发送普通请求）；其他情况为 (False, None)
+        """
+        conditional = self.cache.conditional_headers(cached)
+        if not conditional and not read_body:
+            return False, None
+        headers = self.headers.copy()
+        headers.update(conditional)
+        try:
+            response = self.http.get(url, headers=headers, timeout=10, stream=not read_body)
+            if not read_body:
+                response.close()
+        except requests.RequestException as e:
+            print(f"验证页面缓存失败: {e}")
+            return False, None
+        if response.status_code == 304:
+            self.cache.refresh(url)
+            return True, None
+        if not read_body or response.status_code != 200:
+            return False, None
+        response.encoding = response.apparent_encoding if response.apparent_encoding else 'utf-8'
+        return False, response
+        
+    def _browser_fetch(self, url, **kwargs):
+        """
+        使用浏览器池渲染页面；同一URL正在渲染时共享结果，失败时重试一次
+
+        浏览器启动失败、页面关闭等本地错误也会抛出异常，所以浏览器渲染使用单独的熔断器，
+        不会因此把主机的普通请求也熔断
+        """
+        breaker_key = f"browser:{urllib.parse.urlsplit(url).netloc.lower()}"
+        
+        def render():
+            return self.resilience.call(url, lambda: self.browser_pool.fetch(url, **kwargs),
+                                        max_attempts=2, status_of=lambda result: result["status"],
+                                        retry_on=(Exception,), breaker_key=breaker_key)
+        return self.flights.do((OP_BROWSER, normalize_url(url)), render)
+        
+    def _make_request(self, url, is_baidu=False, timeout=15, use_cache=True):
+        """改进的网络请求方法，支持自定义超时和磁盘缓存；同一URL正在请求时共享结果"""
+        return self.flights.do((OP_HTTP, normalize_url(url), use_cache),
+                               lambda: self._fetch_url(url, timeout, use_cache))
+        
+    def _fetch_url(self, url, timeout=15, use_cache=True):
+        cached = self.cache.lookup(url) if use_cache else None
+        if cached and cached['fresh']:
+            return cached['body']
         
-    def _make_request(self, url, is_baidu=False, timeout=15):
-        """改进的网络请求方法，支持自定义超时"""
         try:
             headers_to_use = self.headers.copy()
+            headers_to_use.update(self.cache.conditional_headers(cached))
             
-            response = requests.get(url, headers=headers_to_use, timeout=timeout)
+            response = self.http.get(url, headers=headers_to_use, timeout=timeout)
+            if cached and response.status_code == 304:
+                # 内容没有变化，直接使用磁盘上的缓存
+                self.cache.refresh(url)
+                return cached['body']
             response.raise_for_status()
             
             content_type = response.headers.get('Content-Type', '')
-            if 'text/html' not in content_type.lower() and not url.endswith(('.zip', '.rar', '.7z')): 
+            if ('text/html' not in content_type.lower() and 'xml' not in content_type.lower()
+                    and not url.endswith(('.zip', '.rar', '.7z'))):
                  print(f"警告：请求 {url} 返回的不是HTML ({content_type})")
 
             response.encoding = response.apparent_encoding if response.apparent_encoding else 'utf-8'
+            if use_cache:
+                self.cache.store(url, response.text,
+                                 etag=response.headers.get('ETag'),
+                                 last_modified=response.headers.get('Last-Modified'))
             return response.text
+        except CircuitOpenError as e:
+            # 主机熔断中，不再发出请求；搜索失败也如实报错，而不是显示为“没有找到结果”
+            print(f"网络请求被熔断: {e}")
+            raise Exception(str(e))
         except requests.Timeout:
-             print(f"网络请求超时: {url}")
-             if url.startswith(self.base_url) and "?s=" in url:  # 这是搜索请求
-                 # 搜索请求超时时返回空HTML而不是抛出异常，保持与原来的行为一致
-                 print("搜索请求超时，返回空结果")
-                 return "<html><body></body></html>"
-             # 其他请求仍然抛出异常
-             raise Exception(f"网络请求超时: {url}")
+            print(f"网络请求超时: {url}")
+            raise Exception(f"网络请求超时（已重试）: {url}")
         except requests.RequestException as e:
             print(f"网络请求失败: {str(e)}")
-            if url.startswith(self.base_url) and "?s=" in url:  # 这是搜索请求
-                 # 搜索请求失败时返回空HTML而不是抛出异常，保持与原来的行为一致
-                 print("搜索请求失败，返回空结果")
-                 return "<html><body></body></html>"
-            # 其他请求仍然抛出异常
             raise Exception(f"网络请求失败: {str(e)}")
-        finally:
-            pass
 
     def _format_speed(self, speed_bps):
         """格式化速度显示"""
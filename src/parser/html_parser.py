@@ -1,7 +1,13 @@
 from bs4 import BeautifulSoup
 import re
 
+from utils.config import Config
+
 class HtmlParser:
+    def __init__(self, base_url=None):
+        # 相对链接补全为该网站的绝对地址
+        self.base_url = (base_url or Config().get_base_url()).rstrip('/')
+        
     def parse_search_results(self, html):
         soup = BeautifulSoup(html, 'html.parser')
         results = []
@@ -33,6 +39,36 @@ class HtmlParser:
                 
         return results
         
+    def parse_search_pagination(self, html):
+        """
+        解析搜索结果页底部的分页导航（WordPress 的 /page/N/?s= 或 ?paged=N 链接）
+
+        Returns:
+            {"pages": {页码: URL}, "last": 已知的最大页码, "next": 下一页URL或None}
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        pages = {}
+        next_url = None
+        for link in soup.find_all('a', href=True):
+            classes = link.get('class') or []
+            href = self._fix_url(link['href'])
+            page = self.search_page_number(href)
+            if page is None:
+                continue
+            # 只关注分页导航中的链接，避免把文章里的链接当成页码
+            if not ('page-numbers' in classes or 'next' in classes
+                    or link.find_parent(class_=re.compile(r'pagination|nav-links|page-nav'))):
+                continue
+            pages.setdefault(page, href)
+            if 'next' in classes or link.get('rel') == ['next']:
+                next_url = href
+        return {"pages": pages, "last": max(pages) if pages else 1, "next": next_url}
+        
+    def search_page_number(self, url):
+        """从搜索结果分页URL中提取页码，不是分页链接时返回 None"""
+        match = re.search(r'/page/(\d+)/?', url) or re.search(r'[?&]paged=(\d+)', url)
+        return int(match.group(1)) if match else None
+        
     def parse_trainer_versions(self, html):
         soup = BeautifulSoup(html, 'html.parser')
         versions = []
@@ -270,8 +306,24 @@ class HtmlParser:
         
         return versions
         
+    def is_trainer_page_complete(self, html, versions):
+        """
+        判断（未经浏览器渲染的）修改器页面是否已包含完整的下载信息：
+        需要有下载区域、解析出至少一个版本，并且包含自动更新版本那一行
+        （该行由页面脚本动态生成，静态页面中经常缺失）
+        """
+        if not versions:
+            return False
+        soup = BeautifulSoup(html, 'html.parser')
+        download_area = soup.find('div', class_='download-attachments')
+        if not download_area:
+            return False
+        return download_area.find('tr', class_=lambda c: c and 'autoupdate' in c) is not None
+        
     def _fix_url(self, url):
         """确保URL路径完整，将相对路径转换为绝对路径"""
+        if url and url.startswith('//'):
+            return f"{self.base_url.split(':', 1)[0]}:{url}"
         if url and url.startswith('/'):
-            return f"https://flingtrainer.com{url}"
+            return f"{self.base_url}{url}"
         return url
\ No newline at end of file
@@ -0,0 +1,6 @@
+# 下载后处理流水线
+from .base import PipelineStage, PostDownloadPipeline, StageSkipped
+from .stages import VerifyArchiveStage, ExtractArchiveStage, IndexExtractedStage, default_stages
+
+__all__ = ['PipelineStage', 'PostDownloadPipeline', 'StageSkipped',
+           'VerifyArchiveStage', 'ExtractArchiveStage', 'IndexExtractedStage', 'default_stages']
@@ -0,0 +1,92 @@
+"""
+压缩包处理函数，在流水线的工作进程中执行
+
+这里的函数只依赖标准库（RAR需要可选的 rarfile 库），不能导入 PyQt，
+以便在子进程中快速加载
+"""
+import hashlib
+import os
+import zipfile
+
+try:
+    import rarfile
+except ImportError:
+    rarfile = None
+
+ARCHIVE_ZIP = "zip"
+ARCHIVE_RAR = "rar"
+
+
+def archive_type(path):
+    """根据文件内容判断压缩包类型，不是支持的压缩包时返回 None"""
+    if zipfile.is_zipfile(path):
+        return ARCHIVE_ZIP
+    if rarfile is not None and rarfile.is_rarfile(path):
+        return ARCHIVE_RAR
+    return None
+
+
+def rar_supported():
+    return rarfile is not None
+
+
+def _open_archive(path, kind):
+    if kind == ARCHIVE_ZIP:
+        return zipfile.ZipFile(path)
+    if kind == ARCHIVE_RAR and rarfile is not None:
+        return rarfile.RarFile(path)
+    raise Exception(f"不支持的压缩包格式: {os.path.basename(path)}")
+
+
+def test_archive(path, kind):
+    """
+    校验压缩包中每个文件的CRC
+
+    Returns:
+        (是否完好, 说明)
+    """
+    try:
+        with _open_archive(path, kind) as archive:
+            bad = archive.testzip()
+            count = len(archive.infolist())
+    except Exception as e:
+        return False, f"压缩包已损坏: {e}"
+    if bad:
+        return False, f"压缩包中的文件校验失败: {bad}"
+    return True, f"压缩包完好，共 {count} 个文件"
+
+
+def extract_archive(path, kind, destination):
+    """
+    解压到目标目录，拒绝解压到目录之外的条目（防止路径穿越）
+
+    Returns:
+        解压出的文件相对路径列表
+    """
+    destination = os.path.abspath(destination)
+    os.makedirs(destination, exist_ok=True)
+    extracted = []
+    with _open_archive(path, kind) as archive:
+        for info in archive.infolist():
+            name = info.filename.replace('\\', '/')
+            target = os.path.abspath(os.path.join(destination, name))
+            if os.path.commonpath([destination, target]) != destination:
+                raise Exception(f"压缩包包含不安全的路径: {info.filename}")
+            if info.is_dir():
+                continue
+            archive.extract(info, destination)
+            extracted.append(os.path.relpath(target, destination).replace('\\', '/'))
+    return extracted
+
+
+def index_files(folder, relative_paths):
+    """计算解压出的每个文件的大小和SHA-256"""
+    index = []
+    for relative in relative_paths:
+        full_path = os.path.join(folder, relative)
+        hasher = hashlib.sha256()
+        with open(full_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(block)
+        index.append({"path": relative, "size": os.path.getsize(full_path), "sha256": hasher.hexdigest()})
+    return index
@@ -0,0 +1,118 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# 阶段事件
+EVENT_STARTED = "started"
+EVENT_DONE = "done"
+EVENT_SKIPPED = "skipped"
+EVENT_FAILED = "failed"
+
+
+class StageSkipped(Exception):
+    """阶段不适用于当前文件（例如缺少可选依赖），继续执行后面的阶段"""
+
+
+class PipelineStage:
+    """
+    下载后处理流水线的一个阶段
+
+    子类设置 name，实现 run(context, pipeline)；context 是在各阶段之间传递的字典，
+    阶段可以读取前面阶段写入的信息并添加自己的结果。耗时的计算通过
+    pipeline.run_in_process 交给工作进程执行
+    """
+    name = ""
+
+    def applies(self, context):
+        """是否需要处理该文件，默认处理所有文件"""
+        return True
+
+    def run(self, context, pipeline):
+        """执行阶段，返回一条说明文字；失败时抛出异常，后面的阶段不再执行"""
+        raise NotImplementedError
+
+
+class PostDownloadPipeline:
+    """
+    下载完成后的处理流水线
+
+    每个文件在协调线程中依次经过各阶段，CPU/磁盘密集的工作在进程池中执行，
+    GUI线程不会被阻塞。阶段的开始、完成、跳过和失败通过 on_event(context, 阶段名, 事件, 说明)
+    通知调用方（在协调线程中调用）。新的阶段（如去重、更新资料库）可以通过 add_stage 加入
+    """
+
+    def __init__(self, stages=None, max_workers=2, on_event=None):
+        self.stages = list(stages or [])
+        self.max_workers = max_workers
+        self.on_event = on_event
+        self._coordinator = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pipeline")
+        self._processes = None
+        self._lock = threading.Lock()
+
+    def add_stage(self, stage, before=None):
+        """加入一个阶段，before 为已有阶段的名称时插入到它前面"""
+        names = [s.name for s in self.stages]
+        if before in names:
+            self.stages.insert(names.index(before), stage)
+        else:
+            self.stages.append(stage)
+
+    def submit(self, path, **meta):
+        """
+        提交一个下载完成的文件
+
+        Args:
+            meta: 附加信息，如 url、game（游戏名）、file_type
+
+        Returns:
+            concurrent.futures.Future，结果为最终的 context
+        """
+        context = dict(meta)
+        context["path"] = path
+        context["directory"] = os.path.dirname(os.path.abspath(path))
+        context["filename"] = os.path.basename(path)
+        context["results"] = {}
+        return self._coordinator.submit(self._run, context)
+
+    def run_in_process(self, fn, *args):
+        """在工作进程中执行 fn(*args) 并等待结果（fn 必须是可序列化的模块级函数）"""
+        with self._lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(max_workers=self.max_workers)
+            processes = self._processes
+        return processes.submit(fn, *args).result()
+
+    def shutdown(self, wait=False):
+        self._coordinator.shutdown(wait=wait, cancel_futures=True)
+        with self._lock:
+            if self._processes is not None:
+                self._processes.shutdown(wait=wait, cancel_futures=True)
+                self._processes = None
+
+    def _run(self, context):
+        for stage in list(self.stages):
+            if not stage.applies(context):
+                continue
+            self._emit(context, stage.name, EVENT_STARTED, "")
+            try:
+                message = stage.run(context, self)
+            except StageSkipped as e:
+                context["results"][stage.name] = EVENT_SKIPPED
+                self._emit(context, stage.name, EVENT_SKIPPED, str(e))
+                continue
+            except Exception as e:
+                context["results"][stage.name] = EVENT_FAILED
+                context["error"] = str(e)
+                self._emit(context, stage.name, EVENT_FAILED, str(e))
+                break
+            context["results"][stage.name] = EVENT_DONE
+            self._emit(context, stage.name, EVENT_DONE, message or "")
+        return context
+
+    def _emit(self, context, stage_name, event, message):
+        print(f"[{stage_name}] {context['filename']}: {event} {message}")
+        if self.on_event:
+            try:
+                self.on_event(context, stage_name, event, message)
+            except Exception as e:
+                print(f"处理流水线事件时出错: {e}")
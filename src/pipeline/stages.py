@@ -0,0 +1,74 @@
+import os
+import re
+
+from network.manifest import HashManifest
+from pipeline.base import PipelineStage, StageSkipped
+from pipeline import archive
+
+_GAME_SUFFIX = re.compile(r'\s+(?:v\d|ver\.?\s*\d|early access|plus\s*\d|\d+\s*trainer|trainer|auto[-\s]?updat)', re.I)
+
+
+def game_folder_name(filename):
+    """从修改器文件名推断游戏名作为解压目录，例如 “Elden Ring v1.02 Plus 28 Trainer.zip” -> “Elden Ring”"""
+    stem = os.path.splitext(filename)[0].replace('_', ' ').strip()
+    match = _GAME_SUFFIX.search(stem)
+    name = stem[:match.start()] if match and match.start() > 0 else stem
+    name = re.sub(r'[\\/:\*\?"<>\|]', '_', name).strip(' .')
+    return name or "trainer"
+
+
+class VerifyArchiveStage(PipelineStage):
+    """校验压缩包是否完整（逐个文件检查CRC）"""
+    name = "verify"
+
+    def applies(self, context):
+        return context.get("file_type") in ("zip", "rar") or context["filename"].lower().endswith(('.zip', '.rar'))
+
+    def run(self, context, pipeline):
+        kind = archive.archive_type(context["path"])
+        if kind is None:
+            is_rar = context.get("file_type") == "rar" or context["filename"].lower().endswith('.rar')
+            if is_rar and not archive.rar_supported():
+                raise StageSkipped("不支持RAR压缩包（未安装可选的 rarfile 库），请手动解压")
+            raise Exception("文件不是有效的压缩包，下载可能不完整")
+        ok, message = pipeline.run_in_process(archive.test_archive, context["path"], kind)
+        if not ok:
+            raise Exception(message)
+        context["archive_type"] = kind
+        return message
+
+
+class ExtractArchiveStage(PipelineStage):
+    """解压到下载目录下以游戏名命名的文件夹中"""
+    name = "extract"
+
+    def applies(self, context):
+        return bool(context.get("archive_type"))
+
+    def run(self, context, pipeline):
+        game = context.get("game") or game_folder_name(context["filename"])
+        destination = os.path.join(context["directory"], game_folder_name(game),
+                                   os.path.splitext(context["filename"])[0])
+        files = pipeline.run_in_process(archive.extract_archive, context["path"], context["archive_type"], destination)
+        context["extracted_dir"] = destination
+        context["extracted_files"] = files
+        return f"已解压 {len(files)} 个文件到 {destination}"
+
+
+class IndexExtractedStage(PipelineStage):
+    """记录解压出的文件（大小和SHA-256）到下载目录的校验清单"""
+    name = "index"
+
+    def applies(self, context):
+        return bool(context.get("extracted_files"))
+
+    def run(self, context, pipeline):
+        index = pipeline.run_in_process(archive.index_files, context["extracted_dir"], context["extracted_files"])
+        HashManifest(context["directory"]).record_extracted(context["path"], context["extracted_dir"], index)
+        context["index"] = index
+        return f"已记录 {len(index)} 个文件"
+
+
+def default_stages():
+    """默认的下载后处理阶段：校验压缩包 -> 解压 -> 建立文件索引"""
+    return [VerifyArchiveStage(), ExtractArchiveStage(), IndexExtractedStage()]
@@ -0,0 +1,4 @@
+# 局域网共享服务模式（HTTP/JSON接口）
+from .server import FlyyingService
+
+__all__ = ['FlyyingService']
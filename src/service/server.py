@@ -0,0 +1,338 @@
+"""
+局域网共享服务模式
+
+一台机器运行服务，其他机器通过HTTP/JSON接口搜索、解析版本和下载修改器。
+所有客户端共用同一个页面缓存（磁盘HTTP缓存 + 版本缓存）、翻译缓存、本地目录和文件库，
+相同的页面和文件只从上游获取一次：
+
+    python src/cli.py serve --host 0.0.0.0 --port 8780 --store D:/TrainerStore
+
+    GET /api/search?q=Elden+Ring[&pages=3][&live=1]
+    GET /api/versions?url=<修改器页面URL>   或   ?q=<游戏名>[&rule=latest_standalone]
+    GET /api/download?url=<下载地址>[&filename=<文件名>]   支持Range，可断点续传
+    GET /api/stats
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+
+from network.batch_resolver import BatchResolver, english_search_name, version_filename, RULE_NAMES, RULE_ALL
+from network.manifest import HashManifest
+from network.prefetcher import TrainerPrefetcher, get_trainer_prefetcher
+from network.single_flight import get_single_flight, normalize_url
+from network.http_pool import get_http_pool
+from network.warmup import ConnectionWarmer
+from network.web_scraper import WebScraper
+from utils.config import Config, get_data_dir
+
+OP_STORE = "store"
+
+MAX_HEADER_SIZE = 64 * 1024
+
+
+class _NullProgress:
+    def emit(self, progress, speed):
+        pass
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class FlyyingService:
+    """
+    基于 asyncio 的HTTP/JSON服务
+
+    连接和请求解析在事件循环中异步处理，抓取、解析等阻塞操作交给线程池；
+    文件通过 loop.sendfile 发送，平台支持时使用零拷贝的 sendfile/TransmitFile，
+    否则自动退化为普通读写
+    """
+
+    def __init__(self, host="127.0.0.1", port=8780, store_dir=None, workers=None, file_ttl=None, base_url=None):
+        config = Config()
+        self.host = host
+        self.port = port
+        self.store_dir = store_dir or os.path.join(get_data_dir(), 'store')
+        os.makedirs(self.store_dir, exist_ok=True)
+        self.file_ttl = config.get_service_file_ttl() if file_ttl is None else file_ttl
+        self.executor = ThreadPoolExecutor(max_workers=workers or config.get_service_workers(),
+                                           thread_name_prefix="service")
+        if base_url:
+            # 指向其他站点（如本地替身站点）时使用独立的抓取器，不影响进程中共享的预取器
+            self.prefetcher = TrainerPrefetcher(scraper=WebScraper(base_url))
+        else:
+            self.prefetcher = get_trainer_prefetcher()
+        self.scraper = self.prefetcher.scraper
+        self.resolver = BatchResolver(scraper=self.scraper, prefetcher=self.prefetcher)
+        self.manifest = HashManifest(self.store_dir)
+        self.flights = get_single_flight()
+        base_host = (urllib.parse.urlsplit(self.scraper.base_url).hostname or "").lower()
+        self.allowed_hosts = {base_host} | {host.lower() for host in config.get_service_allowed_hosts()}
+        self.stats = {"requests": 0, "errors": 0, "files_served": 0, "file_cache_hits": 0,
+                      "files_fetched": 0, "bytes_sent": 0, "active_connections": 0}
+        self._stats_lock = threading.Lock()
+        self._server = None
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    # ---- 服务器 ----
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                  limit=MAX_HEADER_SIZE)
+        sockets = self._server.sockets or []
+        if sockets:
+            self.port = sockets[0].getsockname()[1]
+        print(f"服务已启动: http://{self.host}:{self.port}  文件库: {self.store_dir}")
+        # 在后台预先建立到上游的连接，第一个客户端请求不必等待DNS解析和TLS握手
+        if Config().get_startup_warmup():
+            asyncio.get_running_loop().run_in_executor(self.executor, ConnectionWarmer(urls=[self.scraper.base_url]).warm)
+        return self._server
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def run(self):
+        """阻塞运行直到 Ctrl+C"""
+        try:
+            asyncio.run(self.serve_forever())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _handle_connection(self, reader, writer):
+        self._count("active_connections")
+        try:
+            # HTTP/1.1 keep-alive：同一连接上依次处理多个请求
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                keep_alive = await self._handle_request(head, writer)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self._count("active_connections", -1)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _handle_request(self, head, writer):
+        self._count("requests")
+        lines = head.decode('latin-1').split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            await self._send_json(writer, 400, {"error": "无效的请求"}, keep_alive=False)
+            return False
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+        keep_alive = (headers.get("connection", "").lower() != "close"
+                      and version.upper() == "HTTP/1.1")
+
+        parts = urllib.parse.urlsplit(target)
+        query = {key: values[0] for key, values in urllib.parse.parse_qs(parts.query).items()}
+        started = time.perf_counter()
+        # 下载响应的头部发出之后出错时不能再发送错误响应，只能关闭连接
+        response = {"headers_sent": False}
+        try:
+            if method not in ("GET", "HEAD"):
+                raise HttpError(405, "只支持 GET/HEAD 请求")
+            if parts.path == "/api/download":
+                await self._serve_download(writer, query, headers, head_only=method == "HEAD",
+                                           keep_alive=keep_alive, response=response)
+            else:
+                handler = {
+                    "/api/search": self._api_search,
+                    "/api/versions": self._api_versions,
+                    "/api/stats": self._api_stats,
+                }.get(parts.path.rstrip("/") or "/")
+                if handler is None:
+                    raise HttpError(404, f"未知的接口: {parts.path}")
+                payload = await asyncio.get_running_loop().run_in_executor(self.executor, handler, query)
+                await self._send_json(writer, 200, payload, keep_alive=keep_alive, head_only=method == "HEAD")
+        except HttpError as e:
+            self._count("errors")
+            await self._send_json(writer, e.status, {"error": str(e)}, keep_alive=keep_alive)
+        except ConnectionError:
+            return False
+        except Exception as e:
+            self._count("errors")
+            print(f"处理请求出错 {target}: {e}")
+            if response["headers_sent"]:
+                writer.close()
+                return False
+            await self._send_json(writer, 502, {"error": str(e)}, keep_alive=keep_alive)
+        print(f"{method} {target} {(time.perf_counter() - started) * 1000:.0f}ms")
+        return keep_alive
+
+    # ---- 接口（在线程池中执行） ----
+
+    def _api_search(self, query):
+        name = (query.get("q") or "").strip()
+        if not name:
+            raise HttpError(400, "缺少参数 q")
+        search_name = english_search_name(name, self.scraper)
+        if not search_name:
+            return {"query": name, "search_name": None, "results": []}
+        max_pages = int(query["pages"]) if query.get("pages", "").isdigit() else None
+        results = self.scraper.search_game_pages(search_name, max_pages=max_pages,
+                                                 use_catalog=False if query.get("live") == "1" else None)
+        return {"query": name, "search_name": search_name, "results": results}
+
+    def _check_url(self, url):
+        """只允许访问修改器网站和已知的下载主机，拒绝其他地址（包括本机和内网地址）"""
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or (parts.hostname or "").lower() not in self.allowed_hosts:
+            raise HttpError(403, f"不允许访问的地址: {url}")
+
+    def _api_versions(self, query):
+        if query.get("url"):
+            self._check_url(query["url"])
+            versions = self.prefetcher.get_versions(query["url"])
+            return {"page_url": query["url"], "versions": versions or []}
+        if not query.get("q"):
+            raise HttpError(400, "缺少参数 url 或 q")
+        if query["q"].startswith(("http://", "https://")):
+            self._check_url(query["q"])
+        rule = query.get("rule") if query.get("rule") in RULE_NAMES else RULE_ALL
+        return self.resolver.resolve([{"query": query["q"], "rule": rule}])[0]
+
+    def _api_stats(self, query):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["pool"] = get_http_pool().stats()
+        stats["store_files"] = len(self.manifest.entries())
+        return stats
+
+    def _ensure_file(self, url, filename):
+        """
+        返回文件库中该下载地址对应的文件，没有或已过期（服务器上的文件已更新）时从上游下载。
+        同一地址同时只下载一次，其他请求等待并共享结果
+        """
+        name = self.manifest.find_by_url(url)
+        if name and os.path.isfile(os.path.join(self.store_dir, name)):
+            entry = self.manifest.get(name) or {}
+            fresh = time.time() - entry.get("recorded_at", 0) < self.file_ttl
+            if not fresh and not self._remote_changed(url, entry):
+                # 上游文件没有变化，重新开始计算有效期，期间不再向上游确认
+                self.manifest.touch(name)
+                fresh = True
+            if fresh:
+                self._count("file_cache_hits")
+                return os.path.join(self.store_dir, name)
+
+        def fetch():
+            filename_safe = version_filename({"filename": filename or os.path.basename(urllib.parse.urlsplit(url).path),
+                                              "download_url": url})
+            path = os.path.join(self.store_dir, filename_safe)
+            existing = self.manifest.get(path)
+            if existing and existing.get("url") not in (None, url):
+                # 不同地址的文件同名，加上地址的摘要区分
+                digest = hashlib.sha1(normalize_url(url).encode('utf-8')).hexdigest()[:8]
+                path = os.path.join(self.store_dir, f"{digest}-{filename_safe}")
+            print(f"从上游获取文件: {url}")
+            if not self.scraper.download_file(url, path, _NullProgress()):
+                raise Exception("下载被取消")
+            self._count("files_fetched")
+            return path
+
+        return self.flights.do((OP_STORE, normalize_url(url)), fetch)
+
+    def _remote_changed(self, url, entry):
+        info = self.scraper.probe_download(url)
+        if not info:
+            # 上游不可用时继续使用已有的文件
+            return False
+        if info["etag"] and entry.get("etag"):
+            return info["etag"] != entry["etag"]
+        if info["last_modified"] and entry.get("last_modified"):
+            return info["last_modified"] != entry["last_modified"]
+        return bool(info["total_size"]) and info["total_size"] != entry.get("size")
+
+    # ---- 响应 ----
+
+    async def _serve_download(self, writer, query, headers, head_only, keep_alive, response):
+        url = query.get("url")
+        if not url:
+            raise HttpError(400, "缺少参数 url")
+        self._check_url(url)
+        loop = asyncio.get_running_loop()
+        path = await loop.run_in_executor(self.executor, self._ensure_file, url, query.get("filename"))
+        entry = self.manifest.get(path) or {}
+
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            start, end, status = 0, size - 1, 200
+            match = re.fullmatch(r'bytes=(\d*)-(\d*)', headers.get("range", ""))
+            if match and size > 0:
+                first, last = match.groups()
+                if first:
+                    start, end = int(first), min(int(last), size - 1) if last else size - 1
+                elif last:
+                    start = max(0, size - int(last))
+                if start >= size or start > end:
+                    await self._send_head(writer, 416, {"Content-Range": f"bytes */{size}", "Content-Length": "0"},
+                                          keep_alive)
+                    return
+                status = 206
+            length = max(0, end - start + 1)
+            response_headers = {
+                "Content-Type": "application/octet-stream",
+                "Content-Length": str(length),
+                "Accept-Ranges": "bytes",
+                "Last-Modified": formatdate(os.path.getmtime(path), usegmt=True),
+                "Content-Disposition": f"attachment; filename*=UTF-8''{urllib.parse.quote(os.path.basename(path))}",
+            }
+            if entry.get("sha256"):
+                response_headers["ETag"] = f'"{entry["sha256"]}"'
+                response_headers["X-Content-SHA256"] = entry["sha256"]
+            if status == 206:
+                response_headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            response["headers_sent"] = True
+            await self._send_head(writer, status, response_headers, keep_alive)
+            if head_only or length == 0:
+                return
+            # 零拷贝发送文件内容（平台不支持时 asyncio 自动改为分块读写）
+            sent = await loop.sendfile(writer.transport, f, start, length)
+            self._count("files_served")
+            self._count("bytes_sent", sent)
+
+    async def _send_head(self, writer, status, headers, keep_alive):
+        reason = {200: "OK", 206: "Partial Content", 400: "Bad Request", 404: "Not Found",
+                  403: "Forbidden", 405: "Method Not Allowed", 416: "Range Not Satisfiable", 502: "Bad Gateway"}.get(status, "OK")
+        lines = [f"HTTP/1.1 {status} {reason}", f"Date: {formatdate(usegmt=True)}", "Server: FLYYING-Service",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines += [f"{key}: {value}" for key, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('utf-8'))
+        await writer.drain()
+
+    async def _send_json(self, writer, status, payload, keep_alive, head_only=False):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        await self._send_head(writer, status, {"Content-Type": "application/json; charset=UTF-8",
+                                               "Content-Length": str(len(body))}, keep_alive)
+        if not head_only:
+            writer.write(body)
+            await writer.drain()
@@ -0,0 +1,5 @@
+# 本地替身修改器网站（测试和压测用，程序本身不会导入）
+from .site import SyntheticSite
+from .server import StandinServer
+
+__all__ = ['SyntheticSite', 'StandinServer']
@@ -0,0 +1,3 @@
+from standin.server import main
+
+main()
@@ -0,0 +1,281 @@
+"""
+本地替身修改器网站
+
+在不访问 flingtrainer.com 的情况下测试和压测抓取、搜索、目录同步和下载：
+
+    cd src
+    python -m standin --port 8765 --games 30000 --latency 80 --bandwidth 2048 --error-rate 0.02
+
+然后设置环境变量 FLYYING_BASE_URL=http://127.0.0.1:8765 启动程序（或在配置中设置 base_url），
+WebScraper 的所有请求都会发往替身站点
+"""
+import argparse
+import hashlib
+import random
+import re
+import threading
+import time
+import urllib.parse
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from standin.site import SyntheticSite
+
+SEND_CHUNK = 64 * 1024
+
+
+class StandinServer:
+    """
+    提供替身站点的HTTP服务器（标准库 ThreadingHTTPServer，支持 keep-alive）
+
+    Args:
+        latency_ms / jitter_ms: 每个请求在响应前的固定延迟和随机抖动
+        bandwidth: 每个连接的下载带宽上限（KB/s），0 表示不限
+        error_rate: 返回 503（带 Retry-After）的概率
+        drop_rate: 下载文件时发送部分内容后断开连接的概率（测试断点续传）
+    """
+
+    def __init__(self, site=None, host="127.0.0.1", port=0, latency_ms=0, jitter_ms=0, bandwidth=0,
+                 error_rate=0.0, drop_rate=0.0, retry_after=1):
+        self.site = site or SyntheticSite()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.bandwidth = bandwidth * 1024
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.retry_after = retry_after
+        self.stats = {"requests": 0, "pages": 0, "downloads": 0, "bytes_sent": 0,
+                      "not_modified": 0, "errors_injected": 0, "drops_injected": 0}
+        self._stats_lock = threading.Lock()
+        self._random = random.Random()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """在后台线程中启动服务器，返回站点地址"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="standin-server", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self.site.cleanup()
+
+    def count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def chance(self, probability):
+        with self._stats_lock:
+            return probability > 0 and self._random.random() < probability
+
+    def delay(self):
+        if self.latency_ms or self.jitter_ms:
+            time.sleep((self.latency_ms + self._random.uniform(0, self.jitter_ms)) / 1000)
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(StandinRequestHandler):
+            standin = server
+
+        return Handler
+
+
+class StandinRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FlyyingStandin/1.0"
+    standin = None
+
+    def log_message(self, format, *args):
+        # 压测时每个请求都打印会拖慢服务器
+        pass
+
+    def do_HEAD(self):
+        self._handle(head=True)
+
+    def do_GET(self):
+        self._handle(head=False)
+
+    def _handle(self, head):
+        standin = self.standin
+        standin.count("requests")
+        standin.delay()
+        if standin.chance(standin.error_rate):
+            standin.count("errors_injected")
+            self._send_text(503, "Service Unavailable (injected)", head,
+                            extra={"Retry-After": str(standin.retry_after)})
+            return
+
+        parts = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(parts.query)
+        path = parts.path
+        site = standin.site
+        base_url = f"http://{self.headers.get('Host') or standin.base_url.split('//', 1)[1]}"
+
+        match = re.fullmatch(r'/downloads/([^/]+)/([^/]+)', path)
+        if match:
+            version = site.find_download(match.group(1), urllib.parse.unquote(match.group(2)))
+            if version is None:
+                self._send_text(404, "Not Found", head)
+                return
+            self._send_file(site.download_body(match.group(1), version), version["filename"], head)
+            return
+
+        if path in ("/feed", "/feed/"):
+            self._send_page(site.render_feed(base_url), head, content_type="application/rss+xml; charset=UTF-8")
+            return
+
+        match = re.fullmatch(r'/trainer/([^/]+)/?', path)
+        if match:
+            post = site.by_slug.get(match.group(1))
+            if post is None:
+                self._send_text(404, "Not Found", head)
+                return
+            self._send_page(site.render_trainer(post), head)
+            return
+
+        match = re.fullmatch(r'/(?:page/(\d+)/?)?', path)
+        if match:
+            page = int(match.group(1) or 1)
+            search = query.get("s", [None])[0]
+            posts = site.search(search) if search is not None else site.posts
+            if page > site.page_count(posts):
+                self._send_text(404, "Not Found", head)
+                return
+            self._send_page(site.render_listing(base_url, posts, page, search), head)
+            return
+
+        self._send_text(404, "Not Found", head)
+
+    def _send_text(self, status, text, head, extra=None):
+        body = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (extra or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _send_page(self, text, head, content_type="text/html; charset=UTF-8"):
+        self.standin.count("pages")
+        body = text.encode('utf-8')
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.standin.count("not_modified")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "max-age=0")
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _send_file(self, body, filename, head):
+        """支持 Range / If-Range 的文件下载，按配置限速并可能在中途断开"""
+        standin = self.standin
+        standin.count("downloads")
+        etag = f'"{body.etag}"'
+        start, end, status = 0, body.size - 1, 200
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        match = re.fullmatch(r'bytes=(\d*)-(\d*)', range_header or '')
+        if match and (not if_range or if_range == etag):
+            first, last = match.groups()
+            if first:
+                start = int(first)
+                end = min(int(last), body.size - 1) if last else body.size - 1
+            elif last:
+                start = max(0, body.size - int(last))
+            if start >= body.size or start > end:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{body.size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            status = 206
+
+        length = end - start + 1
+        self.send_response(status)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", formatdate(usegmt=True))
+        self.send_header("Content-Disposition", f'attachment; filename="{urllib.parse.quote(filename)}"')
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{body.size}")
+        self.end_headers()
+        if head:
+            return
+
+        drop_at = None
+        if length > SEND_CHUNK and standin.chance(standin.drop_rate):
+            drop_at = start + random.randint(SEND_CHUNK, length - 1)
+            standin.count("drops_injected")
+        sent = 0
+        began = time.monotonic()
+        offset = start
+        while offset <= end:
+            size = min(SEND_CHUNK, end - offset + 1)
+            if drop_at is not None and offset + size > drop_at:
+                self.wfile.write(body.read(offset, drop_at - offset))
+                self.close_connection = True
+                self.connection.shutdown(2)
+                return
+            self.wfile.write(body.read(offset, size))
+            offset += size
+            sent += size
+            standin.count("bytes_sent", size)
+            if standin.bandwidth:
+                # 按已发送的字节数计算应该经过的时间，超前时等待
+                ahead = sent / standin.bandwidth - (time.monotonic() - began)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m standin", description="本地替身修改器网站（用于测试和压测）")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--games", type=int, default=20000, help="生成的游戏数量")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子，相同种子生成相同的目录")
+    parser.add_argument("--file-size", type=int, default=4096, help="下载文件大小（KB）")
+    parser.add_argument("--latency", type=int, default=0, help="每个请求的延迟（毫秒）")
+    parser.add_argument("--jitter", type=int, default=0, help="延迟的随机抖动（毫秒）")
+    parser.add_argument("--bandwidth", type=int, default=0, help="每个连接的下载带宽（KB/s），0 表示不限")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回503的概率")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="下载中途断开连接的概率")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    site = SyntheticSite(games=args.games, seed=args.seed, file_size=args.file_size * 1024)
+    server = StandinServer(site, host=args.host, port=args.port, latency_ms=args.latency, jitter_ms=args.jitter,
+                           bandwidth=args.bandwidth, error_rate=args.error_rate, drop_rate=args.drop_rate)
+    print(f"已生成 {len(site.posts)} 个游戏 ({time.perf_counter() - started:.1f} 秒)")
+    print(f"替身站点: {server.base_url}  (设置 FLYYING_BASE_URL={server.base_url} 后启动程序)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"统计: {server.stats}")
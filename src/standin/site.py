@@ -0,0 +1,259 @@
+import hashlib
+import html
+import os
+import random
+import re
+import tempfile
+import threading
+import urllib.parse
+import zipfile
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+POSTS_PER_PAGE = 10
+
+_SERIES = ["Resident Evil", "Monster Hunter", "Final Fantasy", "Assassin's Creed", "Dark Souls",
+           "Far Cry", "Tomb Raider", "Dragon Quest", "Yakuza", "Borderlands", "Fallout", "Metro"]
+_ADJECTIVES = ["Shadow", "Iron", "Crimson", "Silent", "Eternal", "Broken", "Hidden", "Frozen", "Savage", "Golden",
+               "Lost", "Wild", "Dark", "Ancient", "Burning", "Hollow", "Star", "Neon", "Royal", "Mystic"]
+_NOUNS = ["Kingdom", "Legends", "Frontier", "Odyssey", "Protocol", "Dynasty", "Horizon", "Empire", "Chronicles",
+          "Warfare", "Tactics", "Survivor", "Hunter", "Knight", "Colony", "Outpost", "Rebellion", "Saga", "Quest", "Drift"]
+_SUFFIXES = ["", "", "", " II", " III", " Remastered", " Definitive Edition", ": Origins", " Reloaded", " Zero"]
+
+
+def _slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class PatternBody:
+    """按偏移量生成的确定性文件内容，任意大小都不占用内存，支持任意区间读取"""
+
+    def __init__(self, name, size):
+        self.size = size
+        self.etag = hashlib.sha1(f"{name}:{size}".encode('utf-8')).hexdigest()
+        self._block = hashlib.sha256(name.encode('utf-8')).digest() * 2048  # 64KB 重复块
+
+    def read(self, offset, length):
+        block_len = len(self._block)
+        start = offset % block_len
+        data = bytearray()
+        while len(data) < length:
+            piece = self._block[start:start + length - len(data)]
+            data += piece
+            start = 0
+        return bytes(data)
+
+
+class FileBody:
+    """磁盘上的文件（替身站点生成的压缩包）"""
+
+    def __init__(self, path):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.etag = hashlib.sha1(f"{path}:{self.size}".encode('utf-8')).hexdigest()
+
+    def read(self, offset, length):
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return f.read(length)
+
+
+class SyntheticSite:
+    """
+    确定性生成的替身修改器网站
+
+    按种子生成数万个游戏的修改器文章（标题、发布日期、版本列表），并输出与
+    flingtrainer.com 相同结构的列表页、搜索结果页、修改器页面和RSS，供 HtmlParser 解析。
+    下载文件按需生成：exe 为按偏移量生成的内容，zip 为真实可解压的压缩包（缓存在临时目录中）
+    """
+
+    def __init__(self, games=20000, seed=1, file_size=4 * 1024 * 1024, newest=None):
+        self.file_size = file_size
+        self._rng = random.Random(seed)
+        self._newest = newest or datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+        self._archive_dir = None
+        self._archive_lock = threading.Lock()
+        self.posts = self._generate(games)
+        self.by_slug = {post["slug"]: post for post in self.posts}
+
+    def _generate(self, count):
+        posts = []
+        used = set()
+        for index in range(count):
+            rng = self._rng
+            if rng.random() < 0.15:
+                name = f"{rng.choice(_SERIES)} {rng.randint(1, 9)}"
+            else:
+                name = f"{rng.choice(_ADJECTIVES)} {rng.choice(_NOUNS)}{rng.choice(_SUFFIXES)}"
+            base, number = name, 2
+            while name in used:
+                name = f"{base} {number}"
+                number += 1
+            used.add(name)
+            # 文章按从新到旧排列，平均每3小时一篇
+            published = self._newest - timedelta(hours=index * 3, minutes=rng.randint(0, 170))
+            slug = _slugify(name)
+            versions = [{
+                "filename": f"{name} Trainer Auto-Updating Version.exe",
+                "row_class": "autoupdate",
+                "date": published.strftime("%Y-%m-%d"),
+            }]
+            for k in range(rng.randint(1, 4)):
+                released = published - timedelta(days=k * rng.randint(5, 60))
+                versions.append({
+                    "filename": f"{name} v1.{rng.randint(0, 30)}.{k} Plus {rng.randint(8, 40)} Trainer.zip",
+                    "row_class": "zip",
+                    "date": released.strftime("%Y-%m-%d"),
+                })
+            for version in versions:
+                version["path"] = f"/downloads/{slug}/{urllib.parse.quote(version['filename'])}"
+                version["downloads"] = rng.randint(100, 500000)
+            posts.append({"title": f"{name} Trainer", "name": name, "slug": slug,
+                          "published": published, "versions": versions})
+        return posts
+
+    # ---- 查询 ----
+
+    def search(self, query):
+        words = re.findall(r'\w+', (query or '').lower())
+        if not words:
+            return []
+        return [post for post in self.posts if all(word in post["title"].lower() for word in words)]
+
+    def page_of(self, posts, page):
+        start = (page - 1) * POSTS_PER_PAGE
+        return posts[start:start + POSTS_PER_PAGE]
+
+    def page_count(self, posts):
+        return max(1, (len(posts) + POSTS_PER_PAGE - 1) // POSTS_PER_PAGE)
+
+    def find_download(self, slug, filename):
+        post = self.by_slug.get(slug)
+        if not post:
+            return None
+        for version in post["versions"]:
+            if version["filename"] == filename:
+                return version
+        return None
+
+    # ---- 页面 ----
+
+    def render_listing(self, base_url, posts, page, query=None):
+        """列表页/搜索结果页：与网站相同的 article.post 结构和 WordPress 分页导航"""
+        articles = []
+        for post in self.page_of(posts, page):
+            published = post["published"]
+            articles.append(
+                f'<article class="post type-post">'
+                f'<div class="post-details"><div class="post-details-day">{published.day}</div>'
+                f'<div class="post-details-month">{published:%b}</div>'
+                f'<div class="post-details-year">{published.year}</div></div>'
+                f'<h2 class="post-title"><a href="{base_url}/trainer/{post["slug"]}/">{html.escape(post["title"])}</a></h2>'
+                f'</article>')
+        if not articles and query is not None:
+            articles.append('<div class="no-results">Nothing Found</div>')
+        title = f"Search Results for {html.escape(query)}" if query is not None else "FLiNG Trainer"
+        return self._page(title, "\n".join(articles) + self._pagination(base_url, page, self.page_count(posts), query))
+
+    def _pagination(self, base_url, current, total, query):
+        """WordPress 的 paginate_links 输出：首尾各一页、当前页前后各两页，中间用省略号"""
+        if total <= 1:
+            return ""
+
+        def url(page):
+            path = f"{base_url}/" if page == 1 else f"{base_url}/page/{page}/"
+            return path + (f"?s={urllib.parse.quote_plus(query)}" if query is not None else "")
+
+        items = []
+        if current > 1:
+            items.append(f'<a class="prev page-numbers" href="{url(current - 1)}">Previous</a>')
+        dots = False
+        for page in range(1, total + 1):
+            if page == current:
+                items.append(f'<span aria-current="page" class="page-numbers current">{page}</span>')
+                dots = True
+            elif page == 1 or page == total or abs(page - current) <= 2:
+                items.append(f'<a class="page-numbers" href="{url(page)}">{page}</a>')
+                dots = True
+            elif dots:
+                items.append('<span class="page-numbers dots">&hellip;</span>')
+                dots = False
+        if current < total:
+            items.append(f'<a class="next page-numbers" href="{url(current + 1)}">Next</a>')
+        return f'<nav class="navigation pagination"><div class="nav-links">{"".join(items)}</div></nav>'
+
+    def render_trainer(self, post):
+        """修改器页面：download-attachments 区域中的版本表格（包含自动更新版本行，不需要浏览器渲染）"""
+        rows = []
+        for version in post["versions"]:
+            size = self.file_size if version["row_class"] != "zip" else self._archive_estimate()
+            label = version["filename"].rsplit('.', 1)[0]
+            rows.append(
+                f'<tr class="{version["row_class"]}">'
+                f'<td class="attachment-title"><a href="{version["path"]}" title="{html.escape(label)}">{html.escape(label)}</a></td>'
+                f'<td class="attachment-date">{version["date"]}</td>'
+                f'<td class="attachment-size">{format_size(size)}</td>'
+                f'<td class="attachment-downloads">{version["downloads"]}</td></tr>')
+        body = (f'<article class="post"><h1 class="post-title">{html.escape(post["title"])}</h1>'
+                f'<div class="entry-content"><p>{html.escape(post["name"])} trainer options.</p></div>'
+                f'<div class="download-attachments"><table class="da-attachments-table">'
+                f'<thead><tr><th>File</th><th>Date added</th><th>File size</th><th>Downloads</th></tr></thead>'
+                f'<tbody>{"".join(rows)}</tbody></table></div></article>')
+        return self._page(post["title"], body)
+
+    def render_feed(self, base_url, count=10):
+        items = []
+        for post in self.posts[:count]:
+            items.append(
+                f'<item><title>{html.escape(post["title"])}</title>'
+                f'<link>{base_url}/trainer/{post["slug"]}/</link>'
+                f'<pubDate>{format_datetime(post["published"])}</pubDate></item>')
+        return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+                f'<title>FLiNG Trainer</title><link>{base_url}/</link>{"".join(items)}</channel></rss>')
+
+    def _page(self, title, body):
+        return (f'<!DOCTYPE html><html><head><meta charset="UTF-8"><title>{title}</title></head>'
+                f'<body><div id="content">{body}</div></body></html>')
+
+    # ---- 下载文件 ----
+
+    def download_body(self, slug, version):
+        if version["row_class"] != "zip":
+            return PatternBody(f"{slug}/{version['filename']}", self.file_size)
+        return FileBody(self._archive_path(slug, version))
+
+    def _archive_estimate(self):
+        # 压缩包使用存储模式，大小约等于内容大小
+        return self.file_size + 256
+
+    def _archive_path(self, slug, version):
+        with self._archive_lock:
+            if self._archive_dir is None:
+                self._archive_dir = tempfile.mkdtemp(prefix="flyying-standin-")
+            name = hashlib.sha1(f"{slug}/{version['filename']}".encode('utf-8')).hexdigest() + ".zip"
+            path = os.path.join(self._archive_dir, name)
+            if not os.path.exists(path):
+                member = PatternBody(f"{slug}/{version['filename']}/member", self.file_size)
+                tmp_path = path + ".tmp"
+                with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_STORED) as archive:
+                    with archive.open(version["filename"].rsplit('.', 1)[0] + ".exe", 'w', force_zip64=True) as f:
+                        for offset in range(0, member.size, 1024 * 1024):
+                            f.write(member.read(offset, min(1024 * 1024, member.size - offset)))
+                os.replace(tmp_path, path)
+            return path
+
+    def cleanup(self):
+        """删除生成的压缩包"""
+        with self._archive_lock:
+            if self._archive_dir and os.path.isdir(self._archive_dir):
+                for name in os.listdir(self._archive_dir):
+                    os.remove(os.path.join(self._archive_dir, name))
+                os.rmdir(self._archive_dir)
+            self._archive_dir = None
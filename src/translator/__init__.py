@@ -0,0 +1,5 @@
+# 翻译模块初始化文件
+from .translation_cache import TranslationCache, get_translation_cache
+from .title_dictionary import TitleDictionary, get_title_dictionary
+
+__all__ = ['TranslationCache', 'get_translation_cache', 'TitleDictionary', 'get_title_dictionary']
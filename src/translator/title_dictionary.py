@@ -0,0 +1,202 @@
+import bisect
+import json
+import os
+import sys
+import threading
+
+from translator.translation_cache import normalize_name
+from utils.config import get_data_dir
+
+# 游戏名中常见的繁体字及对应简体字，查询和建索引前统一转换为简体
+_TRADITIONAL = ("戰國傳說劍俠龍靈獵遺跡園環爾發對馬島騎聖盜賊車裝幾遊戲機紀異廠醫動羅進擬歐陸風雲鋼鐵軍聯鏢贖獸魯門隻茲穀語亞惡莊"
+                "諸黃製線絕擱淺條謊輝捲軸滾際與殺錘驚奧團麗臥蒼隕無雙繪譚淵虛東聞錄頭時饑閉殭屍壞爭終離恥倖質應騰護點螢細墮軌"
+                "蘇鬥潛諜靜嶺後還輯斷極飛羈競決領霧鎖開義話賽師齊體實圖書畫號門獨們會來見過現開關問題間發聲長")
+_SIMPLIFIED = ("战国传说剑侠龙灵猎遗迹园环尔发对马岛骑圣盗贼车装几游戏机纪异厂医动罗进拟欧陆风云钢铁军联镖赎兽鲁门只兹谷语亚恶庄"
+               "诸黄制线绝搁浅条谎辉卷轴滚际与杀锤惊奥团丽卧苍陨无双绘谭渊虚东闻录头时饥闭僵尸坏争终离耻幸质应腾护点萤细堕轨"
+               "苏斗潜谍静岭后还辑断极飞羁竞决领雾锁开义话赛师齐体实图书画号门独们会来见过现开关问题间发声长")
+_TO_SIMPLIFIED = str.maketrans(_TRADITIONAL, _SIMPLIFIED)
+
+MATCH_EXACT = "exact"
+MATCH_PREFIX = "prefix"
+MATCH_FUZZY = "fuzzy"
+
+
+def normalize_title(name):
+    """统一写法并把繁体字转换为简体，用作词典的键"""
+    return normalize_name(name).translate(_TO_SIMPLIFIED)
+
+
+def _ngrams(text, n=2):
+    if len(text) <= n:
+        return {text}
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _common_word_prefix(names):
+    """多个英文名按单词计算的共同前缀，例如 Monster Hunter: World / Monster Hunter Rise -> Monster Hunter"""
+    split_names = [name.replace(':', ' ').split() for name in names]
+    common = []
+    for words in zip(*split_names):
+        if len(set(w.lower() for w in words)) != 1:
+            break
+        common.append(words[0])
+    return " ".join(common)
+
+
+def _bundled_dictionary_path():
+    """程序自带的词典文件路径（兼容打包环境）"""
+    if getattr(sys, 'frozen', False):
+        base_dir = getattr(sys, '_MEIPASS', os.path.dirname(sys.executable))
+        return os.path.join(base_dir, 'resources', 'game_titles.json')
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        'resources', 'game_titles.json')
+
+
+class TitleDictionary:
+    """
+    离线的中文游戏名 -> 英文名词典
+
+    词典由程序自带的 game_titles.json 和用户数据目录中的同名文件（可更新、
+    优先级更高）合并而成，包含别名、简称和繁体写法。建立三种索引：
+    精确匹配、前缀匹配（有序键 + 二分查找）和模糊匹配（字符二元组倒排索引）
+    """
+
+    def __init__(self, bundled_path=None, user_path=None, fuzzy_threshold=0.6):
+        self.bundled_path = bundled_path or _bundled_dictionary_path()
+        self.user_path = user_path or os.path.join(get_data_dir(), 'game_titles.json')
+        self.fuzzy_threshold = fuzzy_threshold
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self):
+        """重新读取词典文件并重建索引"""
+        titles = {}
+        for path in (self.bundled_path, self.user_path):
+            for entry in self._read_titles(path):
+                english = entry.get("en", "").strip()
+                if english:
+                    titles.setdefault(english, set()).update(entry.get("zh", []))
+
+        exact = {}
+        for english, aliases in titles.items():
+            for alias in aliases:
+                key = normalize_title(alias)
+                if key:
+                    exact[key] = english
+
+        grams = {}
+        for key in exact:
+            for gram in _ngrams(key):
+                grams.setdefault(gram, set()).add(key)
+
+        with self._lock:
+            self._titles = titles
+            self._exact = exact
+            self._sorted_keys = sorted(exact)
+            self._grams = grams
+
+    def lookup(self, name):
+        """
+        查找中文游戏名对应的英文名
+
+        Returns:
+            (英文名, 匹配方式, 相似度) ，找不到时返回 None
+        """
+        query = normalize_title(name)
+        if not query:
+            return None
+
+        with self._lock:
+            # 1. 精确匹配（包括别名、简称和繁体写法）
+            english = self._exact.get(query)
+            if english:
+                return english, MATCH_EXACT, 1.0
+
+            # 2. 前缀匹配：输入的是名称的开头部分，取最短（最接近）的那个
+            if len(query) >= 2:
+                index = bisect.bisect_left(self._sorted_keys, query)
+                candidates = []
+                while index < len(self._sorted_keys) and self._sorted_keys[index].startswith(query):
+                    candidates.append(self._sorted_keys[index])
+                    index += 1
+                if candidates:
+                    best = min(candidates, key=len)
+                    names = {self._exact[key] for key in candidates}
+                    if len(names) == 1:
+                        return self._exact[best], MATCH_PREFIX, len(query) / len(best)
+                    # 对应多个游戏（如系列作品）时，使用它们英文名的共同前缀搜索整个系列
+                    common = _common_word_prefix(names)
+                    if len(common) >= 4:
+                        return common, MATCH_PREFIX, len(query) / len(best)
+
+            # 3. 模糊匹配：按二元组的 Dice 系数打分
+            query_grams = _ngrams(query)
+            counts = {}
+            for gram in query_grams:
+                for key in self._grams.get(gram, ()):
+                    counts[key] = counts.get(key, 0) + 1
+            best_key, best_score = None, 0.0
+            for key, common in counts.items():
+                score = 2.0 * common / (len(query_grams) + len(_ngrams(key)))
+                if score > best_score:
+                    best_key, best_score = key, score
+            if best_key and best_score >= self.fuzzy_threshold:
+                return self._exact[best_key], MATCH_FUZZY, best_score
+        return None
+
+    def add(self, english_name, aliases):
+        """向用户词典添加条目（保存到用户数据目录）并更新索引"""
+        entries = self._read_titles(self.user_path)
+        for entry in entries:
+            if entry.get("en") == english_name:
+                entry["zh"] = sorted(set(entry.get("zh", [])) | set(aliases))
+                break
+        else:
+            entries.append({"en": english_name, "zh": list(aliases)})
+        self._write_titles(self.user_path, entries)
+        self.reload()
+
+    def update_from_file(self, path):
+        """合并一个新的词典文件（格式与 game_titles.json 相同）到用户词典"""
+        merged = {entry["en"]: set(entry.get("zh", [])) for entry in self._read_titles(self.user_path)}
+        new_entries = self._read_titles(path)
+        if not new_entries:
+            raise Exception(f"词典文件无效或为空: {path}")
+        for entry in new_entries:
+            merged.setdefault(entry["en"], set()).update(entry.get("zh", []))
+        self._write_titles(self.user_path, [{"en": en, "zh": sorted(zh)} for en, zh in merged.items()])
+        self.reload()
+        return len(new_entries)
+
+    def __len__(self):
+        return len(self._titles)
+
+    def _read_titles(self, path):
+        if not path or not os.path.exists(path):
+            return []
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"读取游戏名词典失败 {path}: {e}")
+            return []
+        return [entry for entry in data.get("titles", []) if entry.get("en")]
+
+    def _write_titles(self, path, entries):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": 1, "titles": entries}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+
+
+_dictionary = None
+_dictionary_lock = threading.Lock()
+
+
+def get_title_dictionary():
+    """获取进程级共享的游戏名词典，首次调用时加载并建立索引"""
+    global _dictionary
+    with _dictionary_lock:
+        if _dictionary is None:
+            _dictionary = TitleDictionary()
+        return _dictionary
@@ -0,0 +1,129 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from utils.config import Config, get_data_dir
+
+SOURCE_BAIDU = "baidu"     # 通过百度查询得到
+SOURCE_MANUAL = "manual"   # 用户手动修正
+
+
+def normalize_name(name):
+    """统一中文游戏名的写法：全角转半角、转小写、去掉书名号等标点和空白"""
+    name = unicodedata.normalize('NFKC', name or '').strip().lower()
+    name = re.sub(r'[《》〈〉「」『』“”"\'·:：,，.。!！?？\-_\s]+', '', name)
+    return name
+
+
+class TranslationCache:
+    """
+    持久化的中文游戏名 -> 英文名翻译缓存（SQLite）
+
+    成功的翻译永久保存，查询失败的名称在 negative_ttl 秒内不再重复查询。
+    用户手动修正的条目不会被自动查询结果覆盖。所有条目在内存中另有一份副本，
+    查询不需要访问数据库
+    """
+
+    def __init__(self, db_path, negative_ttl=3600):
+        self.db_path = db_path
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                key TEXT PRIMARY KEY,
+                chinese TEXT NOT NULL,
+                english TEXT NOT NULL,
+                source TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )""")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS failures (
+                key TEXT PRIMARY KEY,
+                chinese TEXT NOT NULL,
+                failed_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 1
+            )""")
+        self._conn.commit()
+
+        self._translations = {
+            key: (english, source)
+            for key, english, source in self._conn.execute("SELECT key, english, source FROM translations")
+        }
+        self._failures = dict(self._conn.execute("SELECT key, failed_at FROM failures"))
+
+    def get(self, chinese_name):
+        """返回缓存的英文名，没有时返回 None"""
+        entry = self._translations.get(normalize_name(chinese_name))
+        return entry[0] if entry else None
+
+    def is_recent_failure(self, chinese_name):
+        """该名称最近是否查询失败过（仍在负缓存有效期内）"""
+        failed_at = self._failures.get(normalize_name(chinese_name))
+        return failed_at is not None and time.time() - failed_at < self.negative_ttl
+
+    def put(self, chinese_name, english_name, source=SOURCE_BAIDU):
+        """保存翻译结果；自动查询的结果不会覆盖用户手动修正的条目"""
+        key = normalize_name(chinese_name)
+        english_name = (english_name or '').strip()
+        if not key or not english_name:
+            return
+        existing = self._translations.get(key)
+        if existing and existing[1] == SOURCE_MANUAL and source != SOURCE_MANUAL:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (key, chinese, english, source, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (key, chinese_name.strip(), english_name, source, time.time()))
+            self._conn.execute("DELETE FROM failures WHERE key = ?", (key,))
+            self._conn.commit()
+            self._translations[key] = (english_name, source)
+            self._failures.pop(key, None)
+
+    def record_failure(self, chinese_name):
+        key = normalize_name(chinese_name)
+        if not key:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO failures (key, chinese, failed_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET failed_at = excluded.failed_at, attempts = attempts + 1",
+                (key, chinese_name.strip(), now))
+            self._conn.commit()
+            self._failures[key] = now
+
+    def remove(self, chinese_name):
+        """删除一条翻译（例如翻译有误且用户不想手动指定时）"""
+        key = normalize_name(chinese_name)
+        with self._lock:
+            self._conn.execute("DELETE FROM translations WHERE key = ?", (key,))
+            self._conn.execute("DELETE FROM failures WHERE key = ?", (key,))
+            self._conn.commit()
+            self._translations.pop(key, None)
+            self._failures.pop(key, None)
+
+    def entries(self):
+        """列出所有翻译条目，按更新时间倒序"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chinese, english, source, updated_at FROM translations ORDER BY updated_at DESC").fetchall()
+        return [{"chinese": c, "english": e, "source": s, "updated_at": u} for c, e, s, u in rows]
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_translation_cache():
+    """获取进程级共享的翻译缓存，数据库保存在用户数据目录中"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            config = Config()
+            _cache = TranslationCache(os.path.join(get_data_dir(), 'translations.db'),
+                                      negative_ttl=config.get_translation_negative_ttl())
+        return _cache
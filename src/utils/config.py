@@ -1,6 +1,14 @@
 import json
 import os
 
+def get_data_dir():
+    """获取用户数据目录（与协议标记文件同一目录），不存在时创建"""
+    data_dir = os.path.join(os.path.expanduser("~"), "Documents", "FLYYING")
+    os.makedirs(data_dir, exist_ok=True)
+    return data_dir
+
+DEFAULT_BASE_URL = "https://flingtrainer.com"
+
 class Config:
     def __init__(self):
         self.config_file = 'config.json'
@@ -28,4 +36,203 @@ class Config:
         
     def set_last_search(self, search_term):
         self.config['last_search'] = search_term
-        self.save_config()
\ No newline at end of file
+        self.save_config()
+        
+    def get_http_pool_connections(self):
+        return self.config.get('http_pool_connections', 4)
+        
+    def get_http_pool_maxsize(self):
+        return self.config.get('http_pool_maxsize', 16)
+        
+    def get_max_concurrent_downloads(self):
+        return self.config.get('max_concurrent_downloads', 3)
+        
+    def set_max_concurrent_downloads(self, count):
+        self.config['max_concurrent_downloads'] = count
+        self.save_config()
+        
+    def get_global_rate_limit(self):
+        """全局下载限速，单位KB/s，0为不限速"""
+        return self.config.get('global_rate_limit_kbps', 0)
+        
+    def set_global_rate_limit(self, kbps):
+        self.config['global_rate_limit_kbps'] = kbps
+        self.save_config()
+        
+    def get_download_rate_limit(self):
+        """单个下载限速，单位KB/s，0为不限速"""
+        return self.config.get('download_rate_limit_kbps', 0)
+        
+    def set_download_rate_limit(self, kbps):
+        self.config['download_rate_limit_kbps'] = kbps
+        self.save_config()
+        
+    def get_http_cache_ttl(self):
+        """页面缓存有效期（秒），过期后向服务器重新验证"""
+        return self.config.get('http_cache_ttl', 600)
+        
+    def set_http_cache_ttl(self, seconds):
+        self.config['http_cache_ttl'] = seconds
+        self.save_config()
+        
+    def get_http_cache_max_mb(self):
+        return self.config.get('http_cache_max_mb', 50)
+        
+    def set_http_cache_max_mb(self, size_mb):
+        self.config['http_cache_max_mb'] = size_mb
+        self.save_config()
+        
+    def get_browser_pool_size(self):
+        """浏览器池中同时可用的页面数量"""
+        return self.config.get('browser_pool_size', 2)
+        
+    def get_browser_max_uses(self):
+        """每个浏览器上下文使用多少次后回收重建"""
+        return self.config.get('browser_max_uses', 20)
+        
+    def get_browser_max_heap_mb(self):
+        return self.config.get('browser_max_heap_mb', 256)
+        
+    def get_browser_prelaunch(self):
+        """是否在程序启动时在后台预先启动浏览器"""
+        return self.config.get('browser_prelaunch', True)
+        
+    def set_browser_prelaunch(self, enabled):
+        self.config['browser_prelaunch'] = enabled
+        self.save_config()
+        
+    def get_translation_negative_ttl(self):
+        """翻译查询失败后多长时间（秒）内不再重复查询"""
+        return self.config.get('translation_negative_ttl', 3600)
+        
+    def get_prefetch_top_n(self):
+        """搜索结果出来后在后台预取前几个修改器页面，0 表示不预取"""
+        return self.config.get('prefetch_top_n', 5)
+        
+    def set_prefetch_top_n(self, count):
+        self.config['prefetch_top_n'] = count
+        self.save_config()
+        
+    def get_retry_max_attempts(self):
+        """幂等请求失败时最多尝试的次数（包括第一次）"""
+        return self.config.get('retry_max_attempts', 3)
+        
+    def get_circuit_failure_threshold(self):
+        """同一主机连续失败多少次后熔断"""
+        return self.config.get('circuit_failure_threshold', 5)
+        
+    def get_circuit_reset_timeout(self):
+        """熔断后多少秒再试探主机是否恢复"""
+        return self.config.get('circuit_reset_timeout', 30)
+        
+    def get_download_timeouts(self):
+        """下载请求的 (连接超时, 读取超时) 秒数；读取超时指两次收到数据之间的最长间隔"""
+        return (self.config.get('download_connect_timeout', 10), self.config.get('download_read_timeout', 30))
+        
+    def get_download_fsync_policy(self):
+        """下载数据同步到磁盘的策略: none / on_complete / periodic"""
+        return self.config.get('download_fsync_policy', 'on_complete')
+        
+    def set_download_fsync_policy(self, policy):
+        self.config['download_fsync_policy'] = policy
+        self.save_config()
+        
+    def get_auto_extract(self):
+        """下载完成后是否自动校验并解压压缩包"""
+        return self.config.get('auto_extract', False)
+        
+    def set_auto_extract(self, enabled):
+        self.config['auto_extract'] = enabled
+        self.save_config()
+        
+    def get_pipeline_workers(self):
+        """下载后处理流水线的工作进程数"""
+        return self.config.get('pipeline_workers', 2)
+        
+    def get_search_max_pages(self):
+        """分页搜索最多获取的结果页数"""
+        return self.config.get('search_max_pages', 10)
+        
+    def get_search_page_concurrency(self):
+        """分页搜索时同时获取的页面数"""
+        return self.config.get('search_page_concurrency', 3)
+        
+    def get_use_local_catalog(self):
+        """搜索时是否优先使用本地修改器目录（目录中没有结果时仍会在线搜索）"""
+        return self.config.get('use_local_catalog', True)
+        
+    def set_use_local_catalog(self, enabled):
+        self.config['use_local_catalog'] = enabled
+        self.save_config()
+        
+    def get_crawl_max_pages(self):
+        """爬取本地目录时最多获取的列表页数"""
+        return self.config.get('crawl_max_pages', 500)
+        
+    def get_crawl_concurrency(self):
+        """爬取本地目录时同时获取的列表页数"""
+        return self.config.get('crawl_concurrency', 3)
+        
+    def get_catalog_sync_interval(self):
+        """后台增量同步本地目录的间隔（分钟），0 表示不自动同步"""
+        return self.config.get('catalog_sync_interval', 360)
+        
+    def set_catalog_sync_interval(self, minutes):
+        self.config['catalog_sync_interval'] = minutes
+        self.save_config()
+        
+    def get_sync_max_pages(self):
+        """增量同步时RSS没有覆盖到上次同步位置的情况下，最多读取的最新列表页数"""
+        return self.config.get('sync_max_pages', 20)
+        
+    def get_base_url(self):
+        """修改器网站地址；环境变量 FLYYING_BASE_URL 优先，用于指向本地替身站点等测试环境"""
+        url = os.environ.get('FLYYING_BASE_URL') or self.config.get('base_url') or DEFAULT_BASE_URL
+        return url.rstrip('/')
+        
+    def get_service_workers(self):
+        """服务模式下执行抓取、解析等阻塞操作的线程数"""
+        return self.config.get('service_workers', 8)
+        
+    def get_service_file_ttl(self):
+        """服务模式下文件库中的文件在多少秒内直接使用，超过后先向上游确认文件是否更新"""
+        return self.config.get('service_file_ttl', 3600)
+        
+    def get_watch_default_interval(self):
+        """关注的修改器在无法从版本日期估计更新频率时的检查间隔（秒）"""
+        return self.config.get('watch_default_interval', 6 * 3600)
+        
+    def get_watch_min_interval(self):
+        """关注的修改器最短的检查间隔（秒）"""
+        return self.config.get('watch_min_interval', 30 * 60)
+        
+    def get_watch_max_interval(self):
+        """关注的修改器最长的检查间隔（秒），长期不更新的游戏也至少按这个间隔检查"""
+        return self.config.get('watch_max_interval', 7 * 24 * 3600)
+        
+    def get_watch_auto_download(self):
+        """新关注的修改器发现新版本时是否自动下载"""
+        return self.config.get('watch_auto_download', False)
+        
+    def set_watch_auto_download(self, enabled):
+        self.config['watch_auto_download'] = enabled
+        self.save_config()
+        
+    def get_startup_warmup(self):
+        """是否在程序启动时在后台预先建立到修改器网站的连接"""
+        return self.config.get('startup_warmup', True)
+        
+    def set_startup_warmup(self, enabled):
+        self.config['startup_warmup'] = enabled
+        self.save_config()
+        
+    def get_warmup_connections(self):
+        """启动预热时为每个主机建立的连接数（与搜索结果分页的并发数相当即可）"""
+        return self.config.get('warmup_connections', 3)
+        
+    def get_service_allowed_hosts(self):
+        """
+        服务模式下允许客户端通过 url 参数访问的主机（修改器网站本身总是允许）；
+        修改器文件放在其他下载主机上时在这里添加，防止服务被当作任意地址的代理
+        """
+        return self.config.get('service_allowed_hosts', ['flingtrainer.com', 'www.flingtrainer.com'])
\ No newline at end of file
@@ -0,0 +1,16 @@
+import re
+from datetime import datetime
+
+# 网站列表页和修改器页面中出现过的日期格式
+_DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%d %b %Y", "%d %B %Y", "%b %d, %Y", "%B %d, %Y", "%d.%m.%Y")
+
+
+def parse_date(text):
+    """解析网站中的日期（如 “12 Mar 2024”、“2024-03-12”），返回 datetime，无法识别时返回 None"""
+    text = re.sub(r'\s+', ' ', text or '').strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None